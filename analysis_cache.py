@@ -0,0 +1,82 @@
+import functools
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+
+
+class AnalysisResultCache:
+    """
+    기업 분석 화면의 결과를 (기업 이름, 데이터 버전) 키로 최근 사용 순(LRU) 최대 max_size개까지 보관하는 캐시입니다.
+    데이터나 인덱스를 교체하는 코드는 updating() 안에서 실행합니다. 시작할 때 보관한 결과를 비우고, 교체가 끝날 때까지는
+    새 결과를 보관하지 않으며, 끝나면 (도중에 실패해도) 버전을 올려 교체 중에 시작된 계산 결과도 버립니다.
+    따라서 일부만 교체된 데이터로 만든 결과나 이전 데이터로 만든 결과가 캐시에 남지 않습니다.
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = int(max_size)
+        self.version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+        self._updating = 0
+
+    def get(self, company_name, compute):
+        """보관된 결과를 반환합니다. 없으면 compute(company_name)로 계산해 현재 버전으로 보관합니다."""
+        with self._lock:
+            key = (company_name, self.version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+            self._stats['misses'] += 1
+        result = compute(company_name)
+        with self._lock:
+            if key[1] == self.version and not self._updating and self.max_size > 0:
+                self._entries[key] = result
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self):
+        """데이터 버전을 올리고 보관한 결과를 모두 버립니다. 새 버전 번호를 반환합니다."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            return self.version
+
+    @contextmanager
+    def updating(self):
+        """데이터를 교체하는 동안 사용합니다. 중첩할 수 있으며, 가장 바깥쪽이 끝날 때까지 결과를 보관하지 않습니다."""
+        with self._lock:
+            self._updating += 1
+            self.version += 1
+            self._entries.clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._updating -= 1
+                self.version += 1
+                self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries), 'version': self.version}
+
+
+def replaces_analysis_data(method):
+    """ReviewAnalyzer의 데이터/인덱스 교체 메서드를 self.analysis_cache.updating() 안에서 실행하도록 감쌉니다."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.analysis_cache.updating():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def holds_data_lock(method):
+    """ReviewAnalyzer의 데이터 교체와 파생 인덱스 생성이 서로 겹쳐 실행되지 않도록 self.data_lock(RLock)을 잡고 실행합니다."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.data_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,95 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_backend import load_sentence_encoder, load_text_classifier, load_shared_backbone
+
+
+def _measure(run_batch, texts, batch_size, repeats):
+    """배치 단위 지연시간(ms)과 전체 처리량(리뷰/초)을 측정합니다. 첫 배치는 워밍업으로 제외합니다."""
+    run_batch(texts[:batch_size])
+    latencies = []
+    for _ in range(repeats):
+        for i in range(0, len(texts), batch_size):
+            start = time.perf_counter()
+            run_batch(texts[i:i + batch_size])
+            latencies.append(time.perf_counter() - start)
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'throughput': len(texts) * repeats / (latencies_ms.sum() / 1000),
+    }
+
+
+def _print_row(name, stats):
+    print(f"  {name:<22} p50 {stats['p50_ms']:8.1f} ms | p95 {stats['p95_ms']:8.1f} ms | {stats['throughput']:8.1f} 리뷰/초")
+
+
+def benchmark_inference():
+    """
+    같은 리뷰 집합에 대해 PyTorch 경로와 ONNX Runtime 경로의 SBERT 인코딩/리뷰 분류
+    지연시간과 처리량을 비교하고, 임베딩 유사도와 라벨 일치율을 함께 출력합니다.
+    공유 본체 모드(모델 1개로 임베딩+분류)와 개별 모델 2개의 처리 시간/파라미터 수도 비교합니다.
+    """
+    CSV_FILE_PATH = 'combined_training_data.csv'
+    SBERT_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+    CLASSIFIER_PATH = './my_review_classifier'
+    ARTIFACT_DIR = os.path.join('cache', 'models')
+    SAMPLE_SIZE = 200
+    BATCH_SIZE = 16
+    REPEATS = 3
+
+    if not os.path.exists(CSV_FILE_PATH):
+        print(f"오류: '{CSV_FILE_PATH}' 파일을 찾을 수 없습니다.")
+        return
+
+    df = pd.read_csv(CSV_FILE_PATH).dropna(subset=['text'])
+    texts = df['text'].astype(str).head(SAMPLE_SIZE).tolist()
+    print(f"--- 벤치마크 리뷰 {len(texts)}개 로드 (batch_size={BATCH_SIZE}, 반복 {REPEATS}회) ---")
+
+    # --- 1. SBERT 인코더 ---
+    print("\n--- 1. SBERT 인코딩 ---")
+    encoders = {'torch': load_sentence_encoder(SBERT_MODEL_NAME, backend='torch'),
+                'onnx': load_sentence_encoder(SBERT_MODEL_NAME, backend='onnx', artifact_dir=ARTIFACT_DIR)}
+    embeddings = {}
+    for name, encoder in encoders.items():
+        _print_row(name, _measure(lambda batch, e=encoder: e.encode(batch, batch_size=BATCH_SIZE), texts, BATCH_SIZE, REPEATS))
+        embeddings[name] = np.asarray(encoder.encode(texts, batch_size=BATCH_SIZE, normalize_embeddings=True))
+    cosine = (embeddings['torch'] * embeddings['onnx']).sum(axis=1)
+    print(f"  임베딩 코사인 유사도 (torch vs onnx): 평균 {cosine.mean():.6f}, 최소 {cosine.min():.6f}")
+
+    # --- 2. 리뷰 분류기 ---
+    if not os.path.exists(CLASSIFIER_PATH):
+        print(f"\n경고: 분류 모델 폴더 '{CLASSIFIER_PATH}'가 없어 분류기 벤치마크를 건너뜁니다.")
+        return
+    print("\n--- 2. 리뷰 분류 ---")
+    classifiers = {'torch': load_text_classifier(CLASSIFIER_PATH, backend='torch'),
+                   'onnx': load_text_classifier(CLASSIFIER_PATH, backend='onnx', artifact_dir=ARTIFACT_DIR)}
+    labels = {}
+    for name, classifier in classifiers.items():
+        run = lambda batch, c=classifier: c(batch, batch_size=BATCH_SIZE, truncation=True, max_length=256)
+        _print_row(name, _measure(run, texts, BATCH_SIZE, REPEATS))
+        labels[name] = [p['label'] for p in run(texts)]
+    agreement = np.mean([a == b for a, b in zip(labels['torch'], labels['onnx'])]) * 100
+    print(f"  라벨 일치율 (torch vs onnx): {agreement:.1f}%")
+
+    # --- 3. 공유 본체 (임베딩 + 분류 1회 순전파) vs 모델 2개 ---
+    print("\n--- 3. 공유 본체 vs 개별 모델 (임베딩 + 분류) ---")
+    shared = load_shared_backbone(CLASSIFIER_PATH)
+    separate = lambda batch: (encoders['torch'].encode(batch, batch_size=BATCH_SIZE),
+                              classifiers['torch'](batch, batch_size=BATCH_SIZE, truncation=True, max_length=256))
+    _print_row('separate (2 models)', _measure(separate, texts, BATCH_SIZE, REPEATS))
+    _print_row('shared (1 pass)', _measure(lambda batch: shared.embed_and_classify(batch, batch_size=BATCH_SIZE), texts, BATCH_SIZE, REPEATS))
+    separate_params = sum(p.numel() for p in encoders['torch'].parameters()) + sum(p.numel() for p in classifiers['torch'].model.parameters())
+    shared_params = sum(p.numel() for p in shared.model.parameters())
+    print(f"  파라미터 수: 개별 {separate_params / 1e6:.1f}M / 공유 {shared_params / 1e6:.1f}M")
+    shared_labels = [p['label'] for p in shared.embed_and_classify(texts, batch_size=BATCH_SIZE)[1]]
+    agreement = np.mean([a == b for a, b in zip(labels['torch'], shared_labels)]) * 100
+    print(f"  라벨 일치율 (pipeline vs shared): {agreement:.1f}%")
+
+
+if __name__ == '__main__':
+    benchmark_inference()
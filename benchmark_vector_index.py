@@ -0,0 +1,63 @@
+import os
+import time
+
+import numpy as np
+
+from category_scorer import l2_normalize
+from vector_index import FlatIndex, IVFIndex
+
+
+def _load_base_vectors(cache_file, dim, rng):
+    """캐시된 실제 기업 임베딩이 있으면 사용하고, 없으면 군집 구조가 있는 합성 벡터를 만듭니다."""
+    if os.path.exists(cache_file):
+        with np.load(cache_file, allow_pickle=False) as data:
+            vectors = data['vectors']
+        if len(vectors):
+            print(f"--- 실제 기업 임베딩 {len(vectors)}개를 기반으로 사용합니다. ('{cache_file}') ---")
+            return vectors.astype(np.float32)
+    print("--- 캐시된 기업 임베딩이 없어 합성 벡터를 사용합니다. ---")
+    centers = rng.normal(size=(200, dim)).astype(np.float32)
+    return centers[rng.integers(0, len(centers), 2000)] + 0.3 * rng.normal(size=(2000, dim)).astype(np.float32)
+
+
+def benchmark_vector_index():
+    """
+    전국 단위 기업 수(10만 개 이상)를 가정해 정확(flat) 인덱스와 IVF 근사 인덱스의
+    생성 시간, 질의 지연시간, 정확 인덱스 대비 recall@k를 비교합니다.
+    """
+    CACHE_FILE = os.path.join('cache', 'company_embeddings.npz')
+    TARGET_SIZE = 100000
+    DIM = 768
+    N_QUERIES = 200
+    TOP_K = 10
+    N_PROBES = [1, 4, 8, 16, 32]
+
+    rng = np.random.default_rng(42)
+    base = _load_base_vectors(CACHE_FILE, DIM, rng)
+    # 기반 벡터를 잡음과 함께 복제하여 목표 규모의 코퍼스를 만듭니다.
+    repeats = int(np.ceil(TARGET_SIZE / len(base)))
+    corpus = np.tile(base, (repeats, 1))[:TARGET_SIZE]
+    corpus = l2_normalize(corpus + 0.05 * corpus.std() * rng.normal(size=corpus.shape).astype(np.float32))
+    queries = l2_normalize(corpus[rng.choice(len(corpus), N_QUERIES, replace=False)]
+                           + 0.1 * corpus.std() * rng.normal(size=(N_QUERIES, corpus.shape[1])).astype(np.float32))
+    print(f"--- 코퍼스 {len(corpus)}개 x {corpus.shape[1]}차원, 질의 {N_QUERIES}개, top-{TOP_K} ---")
+
+    flat = FlatIndex(corpus)
+    start = time.perf_counter()
+    exact = [flat.search(q, TOP_K)[0] for q in queries]
+    flat_ms = (time.perf_counter() - start) / N_QUERIES * 1000
+    print(f"  {'flat (정확)':<18} 질의당 {flat_ms:8.2f} ms | recall@{TOP_K} 1.000")
+
+    start = time.perf_counter()
+    ivf = IVFIndex.build(corpus)
+    print(f"  IVF 인덱스 생성: {time.perf_counter() - start:.1f} 초 ({len(ivf.centroids)}개 군집)")
+    for n_probe in N_PROBES:
+        start = time.perf_counter()
+        approx = [ivf.search(q, TOP_K, n_probe=n_probe)[0] for q in queries]
+        ivf_ms = (time.perf_counter() - start) / N_QUERIES * 1000
+        recall = np.mean([len(set(a) & set(e)) / TOP_K for a, e in zip(approx, exact)])
+        print(f"  {f'ivf (n_probe={n_probe})':<18} 질의당 {ivf_ms:8.2f} ms | recall@{TOP_K} {recall:.3f} | {flat_ms / ivf_ms:5.1f}배")
+
+
+if __name__ == '__main__':
+    benchmark_vector_index()
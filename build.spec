@@ -10,7 +10,8 @@ a = Analysis(
         ('config.ini', '.'),
         ('serene-exchange-438319-r7-1dc9aac8b9cf.json', '.')
     ],
-    hiddenimports=[],
+    # main_app.py는 아래 라이브러리를 첫 사용 시점에 이름(문자열)으로 불러오므로(lazy_import.py) 직접 명시합니다.
+    hiddenimports=['pandas', 'gspread', 'oauth2client.service_account', 'serpapi', 'requests'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from category_scorer import l2_normalize
+
+
+def group_centroids(embeddings, group_codes, n_groups):
+    """
+    group_codes(각 행의 그룹 번호, 제외할 행은 -1)에 따라 임베딩을 그룹별로 합산한 뒤 정규화한
+    (n_groups, D) 대표 벡터 행렬과, 행이 하나라도 있는 그룹 표시(bool 배열)를 반환합니다.
+    """
+    group_codes = np.asarray(group_codes, dtype=np.int64)
+    valid = group_codes >= 0
+    sums = np.zeros((n_groups, embeddings.shape[1]), dtype=np.float32)
+    np.add.at(sums, group_codes[valid], embeddings[valid])
+    has_rows = np.bincount(group_codes[valid], minlength=n_groups) > 0
+    return l2_normalize(sums), has_rows
+
+
+def add_declared_category_scores(raw_scores, company_codes, declared_categories, category_index, weight):
+    """프로필에 선언된 분류(1~3순위)에 해당하는 (기업, 카테고리) 칸에 가중치를 더합니다."""
+    category_codes = category_index.get_indexer(pd.Series(declared_categories, dtype=object))
+    valid = (company_codes >= 0) & (category_codes >= 0)
+    np.add.at(raw_scores, (company_codes[valid], category_codes[valid]), weight)
+
+
+class CategoryDistributionTable:
+    """
+    (기업 x 연도 x 카테고리) 분포를 하나의 float32 배열로 보관합니다.
+    데이터가 없는 (기업, 연도) 칸은 NaN이며, 기업 상세 그래프는 이 배열의 조회만으로 그려집니다.
+    """
+
+    def __init__(self, companies, years, categories, distribution):
+        self.companies = pd.Index(companies)
+        self.years = list(years)
+        self.categories = list(categories)
+        self.distribution = np.asarray(distribution, dtype=np.float32)
+
+    @classmethod
+    def from_raw_scores(cls, companies, years, categories, raw_scores, present):
+        """원점수 배열을 (기업, 연도)별 합으로 나눠 비율로 만들고, 데이터가 없거나 합이 0인 칸은 NaN으로 둡니다."""
+        totals = raw_scores.sum(axis=2, keepdims=True)
+        valid = present[..., None] & (totals > 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            distribution = np.where(valid, raw_scores / np.where(totals > 0, totals, 1.0), np.nan)
+        return cls(companies, years, categories, distribution)
+
+    def lookup(self, company_name):
+        """get_yearly_category_distribution과 같은 {연도: {카테고리: 비율}} 형태로 반환합니다."""
+        pos = self.companies.get_indexer([company_name])[0]
+        if pos < 0: return {}
+        result = {}
+        for year_pos, year_key in enumerate(self.years):
+            row = self.distribution[pos, year_pos]
+            if np.isnan(row).any(): continue
+            result[year_key] = dict(zip(self.categories, row.astype(float)))
+        return result
+
+    def to_frame(self):
+        """일괄 내보내기/기업 간 비교용으로 (기업, 연도, 카테고리, 비율) 형태의 데이터프레임을 반환합니다."""
+        n_companies, n_years, n_categories = self.distribution.shape
+        frame = pd.DataFrame({
+            '기업명': np.repeat(self.companies.to_numpy(), n_years * n_categories),
+            'year': np.tile(np.repeat(np.array(self.years, dtype=object), n_categories), n_companies),
+            'category': np.tile(np.array(self.categories, dtype=object), n_companies * n_years),
+            'share': self.distribution.reshape(-1),
+        })
+        return frame.dropna(subset=['share']).reset_index(drop=True)
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def to_numpy(embeddings):
+    """torch 텐서/리스트/ndarray 형태의 임베딩을 float32 numpy 배열로 변환합니다."""
+    if hasattr(embeddings, 'detach'):
+        embeddings = embeddings.detach().cpu().numpy()
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def l2_normalize(matrix):
+    """행 단위로 L2 정규화합니다. 길이가 0인 행은 그대로 둡니다."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def centroid(embeddings):
+    """여러 임베딩을 정규화한 뒤 평균 내고 다시 정규화한 대표 벡터(1, D)를 반환합니다."""
+    return l2_normalize(l2_normalize(np.atleast_2d(to_numpy(embeddings))).mean(axis=0, keepdims=True))
+
+
+class CategoryScorer:
+    """
+    카테고리별 프로토타입 임베딩(카테고리 이름 또는 키워드 목록)을 하나의 정규화 행렬로 쌓아 두고,
+    여러 텍스트 임베딩을 행렬곱 한 번과 카테고리별 최댓값(segment max)으로 한꺼번에 채점합니다.
+    """
+
+    def __init__(self, category_embeddings):
+        self.categories = list(category_embeddings.keys())
+        prototypes = [np.atleast_2d(to_numpy(category_embeddings[cat])) for cat in self.categories]
+        self.max_prototypes = max((p.shape[0] for p in prototypes), default=0)
+        dim = prototypes[0].shape[1] if prototypes else 0
+
+        # 키워드 수가 다른 카테고리를 (카테고리 수 x 최대 키워드 수) 형태로 채우고, 빈 칸은 마스크로 표시합니다.
+        padded = np.zeros((len(self.categories), self.max_prototypes, dim), dtype=np.float32)
+        self.mask = np.zeros((len(self.categories), self.max_prototypes), dtype=bool)
+        for i, proto in enumerate(prototypes):
+            padded[i, :proto.shape[0]] = l2_normalize(proto)
+            self.mask[i, :proto.shape[0]] = True
+        self.prototype_matrix = padded.reshape(-1, dim)
+
+    def score(self, embeddings):
+        """(N, D) 임베딩에 대해 카테고리별 최대 코사인 유사도 (N, C) 행렬을 반환합니다."""
+        emb = l2_normalize(np.atleast_2d(to_numpy(embeddings)))
+        if emb.shape[0] == 0 or not self.categories:
+            return np.zeros((emb.shape[0], len(self.categories)), dtype=np.float32)
+        sims = (emb @ self.prototype_matrix.T).reshape(emb.shape[0], len(self.categories), self.max_prototypes)
+        return np.where(self.mask, sims, -np.inf).max(axis=2)
+
+    def classify(self, embeddings, threshold=None, fallback='기타'):
+        """
+        각 임베딩의 최고 점수 카테고리를 배열로 반환합니다.
+        threshold가 주어지면 최고 점수가 그보다 낮은 항목은 fallback 라벨로 처리합니다.
+        반환값: (라벨 배열, 최고 점수 배열, 전체 점수 행렬)
+        """
+        scores = self.score(embeddings)
+        if scores.shape[1] == 0:
+            return np.full(scores.shape[0], fallback, dtype=object), np.zeros(scores.shape[0], dtype=np.float32), scores
+        best_idx = scores.argmax(axis=1)
+        best_scores = scores[np.arange(scores.shape[0]), best_idx]
+        labels = np.array(self.categories, dtype=object)[best_idx]
+        if threshold is not None:
+            labels[best_scores < threshold] = fallback
+        return labels, best_scores, scores
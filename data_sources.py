@@ -0,0 +1,206 @@
+import os
+import csv
+import json
+import time
+import sqlite3
+import hashlib
+from abc import ABC, abstractmethod
+
+from sheet_snapshot import load_sheet_values, remote_revision, FULL_RESYNC_SECONDS
+
+
+SUPPORTED_SOURCES = ('sheets', 'csv', 'parquet', 'sqlite')
+
+
+def normalize_source_type(source_type):
+    """설정값을 지원하는 데이터 소스 종류로 정리합니다. 알 수 없는 값이면 'sheets'를 사용합니다."""
+    source_type = str(source_type or 'sheets').strip().lower()
+    if source_type not in SUPPORTED_SOURCES:
+        print(f"경고: 알 수 없는 데이터 소스 '{source_type}'. 'sheets'를 사용합니다.")
+        return 'sheets'
+    return source_type
+
+
+def _cell(value):
+    """시트 값(get_all_values 결과)과 같게 모든 칸을 문자열로 맞춥니다. 빈 값은 ''입니다."""
+    if value is None: return ''
+    if isinstance(value, float):
+        if value != value: return ''
+        if value.is_integer(): return str(int(value))
+    return str(value)
+
+
+def _check_missing(values, optional):
+    missing = [name for name, v in values.items() if v is None and name not in optional]
+    if missing: raise ValueError(f"필수 시트를 찾을 수 없습니다: {', '.join(missing)}")
+
+
+class DataSource(ABC):
+    """
+    기업/리뷰/선호분야 데이터를 시트 이름별 값 목록(머리글 행 + 데이터 행, 모든 칸은 문자열)으로 제공하는 공통 인터페이스입니다.
+    ReviewAnalyzer.load_and_unify_data_sources는 어떤 소스든 같은 방식으로 값을 받아 처리합니다.
+    하위 클래스는 load와 revision을 모두 구현해야 하며, 빠뜨리면 객체를 만들 때 TypeError가 발생합니다.
+    """
+
+    name = 'base'
+
+    def __init__(self, optional=()):
+        self.optional = tuple(optional)
+
+    @abstractmethod
+    def load(self, sheet_names, snapshot_first=False, append_only=None):
+        """
+        ({시트 이름: 값 목록 또는 None}, 리비전, 최신 확인 여부, 새 행만 반환한 시트 집합)을 반환합니다.
+        append_only={시트 이름: 이미 반영한 행 수(머리글 포함)}: 지원하는 소스는 그 뒤의 새 행만 반환합니다.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def revision(self):
+        """현재 원본 데이터의 리비전을 반환합니다. 확인할 수 없으면 None입니다."""
+        raise NotImplementedError
+
+    def changed(self, revision):
+        """원본 데이터가 주어진 리비전 이후 바뀌었는지 확인합니다. (확인할 수 없으면 True)"""
+        current = self.revision()
+        return current is None or current != revision
+
+
+class GoogleSheetsSource(DataSource):
+    """Google Sheets (서비스 계정) 소스입니다. 로컬 스냅샷과 증분 동기화는 load_sheet_values가 맡습니다."""
+
+    name = 'sheets'
+
+    def __init__(self, store, spreadsheet_key, open_spreadsheet, download_values, optional=()):
+        super().__init__(optional)
+        self.store, self.spreadsheet_key = store, spreadsheet_key
+        self.open_spreadsheet, self.download_values = open_spreadsheet, download_values
+
+    def load(self, sheet_names, snapshot_first=False, append_only=None):
+        if not self.spreadsheet_key: raise ValueError("config.ini [PATHS]에 스프레드시트 키가 없습니다.")
+        return load_sheet_values(self.store, self.spreadsheet_key, sheet_names, self.open_spreadsheet, self.download_values,
+                                 snapshot_first, append_only)
+
+    def revision(self):
+        return remote_revision(self.open_spreadsheet())
+
+
+class FileSource(DataSource):
+    """
+    폴더 안의 시트별 파일(<시트 이름>.csv 또는 <시트 이름>.parquet) 소스입니다. 오프라인 실행과 대용량 데이터 시험용입니다.
+    첫 행은 머리글이며, 리비전은 파일들의 수정 시각과 크기로 정합니다.
+    """
+
+    def __init__(self, directory, file_format='csv', optional=()):
+        super().__init__(optional)
+        self.directory, self.file_format, self.name = directory, file_format, file_format
+        self._sheet_names = []
+
+    def _path(self, sheet_name):
+        return os.path.join(self.directory, f"{sheet_name}.{self.file_format}")
+
+    def _read(self, path):
+        if self.file_format == 'csv':
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                return [[_cell(v) for v in row] for row in csv.reader(f)]
+        import pandas as pd
+        df = pd.read_parquet(path)
+        return [list(map(str, df.columns))] + [[_cell(v) for v in row] for row in df.itertuples(index=False, name=None)]
+
+    def _revision(self, sheet_names):
+        stats = []
+        for name in sheet_names:
+            path = self._path(name)
+            stats.append([name, os.stat(path).st_mtime_ns, os.path.getsize(path)] if os.path.exists(path) else [name, None, None])
+        return hashlib.sha1(json.dumps(stats, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def load(self, sheet_names, snapshot_first=False, append_only=None):
+        values = {name: self._read(self._path(name)) if os.path.exists(self._path(name)) else None for name in sheet_names}
+        _check_missing(values, self.optional)
+        self._sheet_names = list(sheet_names)
+        print(f"--- 로컬 {self.file_format.upper()} 데이터 로드: '{self.directory}' ({sum(v is not None for v in values.values())}개 시트) ---")
+        return values, self._revision(sheet_names), True, set()
+
+    def revision(self):
+        return self._revision(self._sheet_names)
+
+
+class SQLiteSource(DataSource):
+    """
+    SQLite 파일 소스입니다. 시트마다 같은 이름의 테이블을 사용하며, 열 이름이 머리글이 되고 행은 rowid 순서입니다.
+    append_only로 지정한 테이블은 이미 반영한 행 이후만 읽습니다. 마지막으로 읽은 행 하나만 겹쳐 읽어 비교하므로,
+    그보다 앞의 행이 수정/삭제된 것은 다음 전체 읽기 때 반영됩니다. (마지막 전체 읽기가 FULL_RESYNC_SECONDS보다 오래되면 전체를 다시 읽음)
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, db_file, optional=()):
+        super().__init__(optional)
+        self.db_file = db_file
+        self._last_rows = {}  # 테이블별 마지막으로 읽은 행 (증분 읽기 시 겹쳐 읽은 행과 비교)
+        self._full_read_at = {}  # 테이블별 마지막 전체 읽기 시각
+
+    def _connect(self):
+        if not os.path.exists(self.db_file): raise FileNotFoundError(f"SQLite 데이터 파일을 찾을 수 없습니다: {self.db_file}")
+        return sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True, timeout=30)
+
+    @staticmethod
+    def _rows(conn, table, offset=0):
+        cursor = conn.execute(f'SELECT * FROM "{table.replace(chr(34), chr(34) * 2)}" ORDER BY rowid LIMIT -1 OFFSET ?', (offset,))
+        return [column[0] for column in cursor.description], [[_cell(v) for v in row] for row in cursor]
+
+    def _revision(self):
+        # 데이터베이스 파일(과 WAL 파일)의 수정 시각과 크기로 변경을 감지합니다.
+        stats = [[os.stat(path).st_mtime_ns, os.path.getsize(path)] for path in (self.db_file, f"{self.db_file}-wal") if os.path.exists(path)]
+        return hashlib.sha1(json.dumps(stats).encode('utf-8')).hexdigest()
+
+    def load(self, sheet_names, snapshot_first=False, append_only=None):
+        conn = self._connect()
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            values, appended = {}, set()
+            for name in sheet_names:
+                if name not in tables:
+                    values[name] = None
+                    continue
+                known_rows = (append_only or {}).get(name)
+                if known_rows and known_rows > 1 and time.time() - self._full_read_at.get(name, 0) < FULL_RESYNC_SECONDS:
+                    # known_rows는 머리글을 포함하므로 마지막으로 알려진 데이터 행의 위치는 known_rows - 2입니다.
+                    header, rows = self._rows(conn, name, known_rows - 2)
+                    if rows and self._last_rows.get(name) == rows[0]:
+                        values[name] = rows[1:]
+                        appended.add(name)
+                        continue
+                header, rows = self._rows(conn, name)
+                values[name] = [header] + rows
+                self._full_read_at[name] = time.time()
+            revision = self._revision()
+        finally:
+            conn.close()
+        _check_missing(values, self.optional)
+        for name, v in values.items():
+            if name not in appended: self._last_rows[name] = v[-1] if v and len(v) > 1 else None
+            elif v: self._last_rows[name] = v[-1]
+        for name in appended: print(f"--- SQLite '{name}' 새 행 {len(values[name])}개만 읽음 ---")
+        print(f"--- 로컬 SQLite 데이터 로드: '{self.db_file}' ---")
+        return values, revision, True, appended
+
+    def revision(self):
+        try:
+            return self._revision()
+        except OSError as e:
+            print(f"경고: SQLite 데이터 리비전을 확인할 수 없습니다: {e}")
+            return None
+
+
+def create_data_source(paths, store, spreadsheet_key, open_spreadsheet, download_values, optional=()):
+    """
+    config.ini [PATHS]의 data_source(sheets | csv | parquet | sqlite)와 data_path로 데이터 소스를 만듭니다.
+    csv/parquet는 시트별 파일이 있는 폴더, sqlite는 데이터베이스 파일 경로입니다.
+    """
+    source_type = normalize_source_type(paths.get('data_source'))
+    if source_type == 'sheets':
+        return GoogleSheetsSource(store, spreadsheet_key, open_spreadsheet, download_values, optional)
+    data_path = os.path.abspath(paths.get('data_path') or ('data.sqlite' if source_type == 'sqlite' else 'data'))
+    if source_type == 'sqlite': return SQLiteSource(data_path, optional)
+    return FileSource(data_path, source_type, optional)
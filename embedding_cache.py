@@ -0,0 +1,79 @@
+import os
+import hashlib
+import threading
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    텍스트 내용 해시(모델 식별자 포함)를 키로 임베딩 벡터를 디스크에 보관하는 캐시입니다.
+    캐시에 없는 텍스트만 모델로 인코딩하므로, 내용이 바뀐 항목만 다시 계산됩니다.
+    """
+
+    def __init__(self, cache_file, model_name):
+        self.cache_file = cache_file
+        self.model_name = model_name
+        self._vectors = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def make_key(self, text):
+        """모델 이름과 텍스트 내용을 함께 해시하여 캐시 키를 만듭니다."""
+        return hashlib.sha1(f"{self.model_name}\n{text}".encode('utf-8')).hexdigest()
+
+    def load(self):
+        """디스크의 캐시 파일을 읽어옵니다. 파일이 없거나 손상되었으면 빈 캐시로 시작합니다."""
+        if not os.path.exists(self.cache_file): return 0
+        try:
+            with np.load(self.cache_file, allow_pickle=False) as data:
+                if str(data['model']) != self.model_name: return 0
+                keys, vectors = data['keys'], data['vectors']
+            with self._lock:
+                self._vectors = {str(k): v for k, v in zip(keys, vectors)}
+                self._dirty = False
+            return len(self._vectors)
+        except Exception as e:
+            print(f"경고: 임베딩 캐시 '{self.cache_file}' 로드 실패, 새로 생성합니다: {e}")
+            return 0
+
+    def save(self):
+        """변경된 내용이 있을 때만 캐시를 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        with self._lock:
+            if not self._dirty: return
+            keys = list(self._vectors.keys())
+            vectors = np.vstack([self._vectors[k] for k in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp.npz"
+            np.savez(tmp_file, model=np.array(self.model_name), keys=np.array(keys, dtype=str), vectors=vectors)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"경고: 임베딩 캐시 '{self.cache_file}' 저장 실패: {e}")
+
+    def get_embeddings(self, texts, encode_fn):
+        """
+        텍스트 목록의 임베딩 행렬을 입력 순서대로 반환합니다.
+        encode_fn은 텍스트 리스트를 받아 (N, D) float32 행렬을 돌려주는 함수여야 합니다.
+        """
+        keys = [self.make_key(t) for t in texts]
+        with self._lock:
+            missing = {k: t for k, t in zip(keys, texts) if k not in self._vectors}
+        if missing:
+            encoded = np.asarray(encode_fn(list(missing.values())), dtype=np.float32)
+            with self._lock:
+                self._vectors.update(zip(missing.keys(), encoded))
+                self._dirty = True
+        with self._lock:
+            if not keys: return np.zeros((0, 0), dtype=np.float32), len(missing)
+            return np.vstack([self._vectors[k] for k in keys]), len(missing)
+
+    def prune(self, keep_texts):
+        """현재 사용 중인 텍스트에 해당하지 않는 항목을 캐시에서 제거합니다."""
+        keep_keys = {self.make_key(t) for t in keep_texts}
+        with self._lock:
+            stale = [k for k in self._vectors if k not in keep_keys]
+            for k in stale: del self._vectors[k]
+            if stale: self._dirty = True
+        return len(stale)
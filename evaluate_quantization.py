@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from model_backend import load_sentence_encoder, load_text_classifier
+
+
+def _load_validation_set(csv_file_path):
+    """train_model.py와 같은 정제/분할 규칙으로 학습에 쓰이지 않은 검증 데이터(20%)를 돌려줍니다."""
+    df = pd.read_csv(csv_file_path)
+    df = df[['text', 'sentiment']].copy()
+    df.dropna(subset=['text', 'sentiment'], inplace=True)
+    df = df[df['text'].str.strip() != '']
+    df = df[df['sentiment'].str.strip() != '']
+    _, valid_df = train_test_split(df, test_size=0.2, random_state=42, stratify=df['sentiment'])
+    return valid_df['text'].astype(str).tolist(), valid_df['sentiment'].tolist()
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def evaluate_quantization():
+    """
+    fp32 모델과 int8 동적 양자화 모델을 같은 검증 데이터로 비교합니다.
+    - 리뷰 분류기: 정답 대비 정확도, 두 모델의 라벨 일치율, 처리 시간
+    - SBERT 인코더: 임베딩 코사인 유사도, 처리 시간
+    정확도 하락이 MAX_ACCURACY_DROP(%p)를 넘으면 종료 코드 1을 반환합니다.
+    """
+    CSV_FILE_PATH = 'combined_training_data.csv'
+    SBERT_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+    CLASSIFIER_PATH = './my_review_classifier'
+    ARTIFACT_DIR = os.path.join('cache', 'models')
+    BACKEND = 'torch'
+    BATCH_SIZE = 16
+    MAX_ACCURACY_DROP = 1.0
+
+    if not os.path.exists(CSV_FILE_PATH):
+        print(f"오류: '{CSV_FILE_PATH}' 파일을 찾을 수 없습니다.")
+        return 1
+
+    texts, answers = _load_validation_set(CSV_FILE_PATH)
+    print(f"--- 검증 리뷰 {len(texts)}개 로드 (backend={BACKEND}, batch_size={BATCH_SIZE}) ---")
+
+    # --- 1. SBERT 인코더 ---
+    print("\n--- 1. SBERT 인코딩 (fp32 vs int8) ---")
+    embeddings = {}
+    for mode in ('none', 'int8'):
+        encoder = load_sentence_encoder(SBERT_MODEL_NAME, backend=BACKEND, artifact_dir=ARTIFACT_DIR, quantization=mode)
+        embeddings[mode], elapsed = _timed(lambda: np.asarray(encoder.encode(texts, batch_size=BATCH_SIZE, normalize_embeddings=True)))
+        print(f"  {mode:<6} {elapsed:8.2f} 초 ({len(texts) / elapsed:8.1f} 리뷰/초)")
+    cosine = (embeddings['none'] * embeddings['int8']).sum(axis=1)
+    print(f"  임베딩 코사인 유사도: 평균 {cosine.mean():.4f}, 최소 {cosine.min():.4f}")
+
+    # --- 2. 리뷰 분류기 ---
+    if not os.path.exists(CLASSIFIER_PATH):
+        print(f"\n경고: 분류 모델 폴더 '{CLASSIFIER_PATH}'가 없어 분류기 정확도 검사를 건너뜁니다.")
+        return 0
+    print("\n--- 2. 리뷰 분류 정확도 (fp32 vs int8) ---")
+    labels, accuracy = {}, {}
+    for mode in ('none', 'int8'):
+        classifier = load_text_classifier(CLASSIFIER_PATH, backend=BACKEND, artifact_dir=ARTIFACT_DIR, quantization=mode)
+        predictions, elapsed = _timed(lambda: classifier(texts, batch_size=BATCH_SIZE, truncation=True, max_length=256))
+        labels[mode] = [p['label'] for p in predictions]
+        accuracy[mode] = np.mean([p == a for p, a in zip(labels[mode], answers)]) * 100
+        print(f"  {mode:<6} 정확도 {accuracy[mode]:6.2f}% | {elapsed:8.2f} 초 ({len(texts) / elapsed:8.1f} 리뷰/초)")
+    agreement = np.mean([a == b for a, b in zip(labels['none'], labels['int8'])]) * 100
+    drop = accuracy['none'] - accuracy['int8']
+    print(f"  라벨 일치율 (fp32 vs int8): {agreement:.1f}% | 정확도 변화: {-drop:+.2f}%p")
+
+    if drop > MAX_ACCURACY_DROP:
+        print(f"\n실패: int8 양자화로 정확도가 {drop:.2f}%p 하락했습니다. (허용 {MAX_ACCURACY_DROP}%p)")
+        return 1
+    print(f"\n통과: 정확도 하락이 허용 범위({MAX_ACCURACY_DROP}%p) 이내입니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(evaluate_quantization())
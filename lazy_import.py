@@ -0,0 +1,31 @@
+import importlib
+
+
+class LazyModule:
+    """
+    처음 속성에 접근할 때 실제로 import 하는 모듈 대리 객체입니다.
+    pandas, gspread 같은 무거운 라이브러리를 프로그램 시작 시 바로 불러오지 않고,
+    해당 기능이 처음 쓰일 때(대개 백그라운드 로딩 스레드에서) 불러와 첫 화면이 빨리 뜨도록 합니다.
+
+    PyInstaller는 문자열로 지정한 모듈을 찾지 못하므로, 여기에 쓰는 모듈은 build.spec의 hiddenimports에도 적어야 합니다.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        # import 자체가 스레드 안전하므로 여러 스레드가 동시에 접근해도 모듈은 한 번만 초기화됩니다.
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<LazyModule '{self._name}' ({'loaded' if self.is_loaded else 'not loaded'})>"
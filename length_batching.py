@@ -0,0 +1,135 @@
+import threading
+
+import numpy as np
+
+
+def plan_batches(lengths, max_tokens=4096, max_batch_size=64):
+    """
+    토큰 길이 목록을 길이순(내림차순)으로 정렬한 뒤, (배치 크기 x 배치 내 최대 길이)가
+    max_tokens를 넘지 않도록 묶은 인덱스 배치 목록을 반환합니다.
+    비슷한 길이끼리 묶이므로 짧은 리뷰가 긴 리뷰 길이만큼 패딩되는 낭비가 줄어듭니다.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    order = np.argsort(-lengths, kind='stable')
+    batches, current, current_max = [], [], 0
+    for idx in order:
+        length = max(int(lengths[idx]), 1)
+        batch_max = max(current_max, length)
+        if current and (len(current) >= max_batch_size or batch_max * (len(current) + 1) > max_tokens):
+            batches.append(np.array(current, dtype=np.int64))
+            current, batch_max = [], length
+        current.append(idx)
+        current_max = batch_max
+    if current: batches.append(np.array(current, dtype=np.int64))
+    return batches
+
+
+def _padded_tokens(lengths, batches):
+    return sum(int(lengths[b].max()) * len(b) for b in batches if len(b))
+
+
+def padding_waste(lengths, batches):
+    """배치별로 최대 길이까지 패딩했을 때, 전체 패딩 토큰 중 실제 토큰이 아닌 비율을 반환합니다."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    padded = _padded_tokens(lengths, batches)
+    return 0.0 if padded == 0 else 1.0 - lengths.sum() / padded
+
+
+class LengthBucketedBatcher:
+    """
+    입력을 토큰 길이순으로 정렬해 토큰 예산(max_tokens) 안에서 배치를 만들고,
+    배치별 결과를 원래 입력 순서로 되돌려 주는 공용 배치 계층입니다.
+    마지막 호출과 누적 패딩 낭비율(기존 도착 순서 배치 대비)을 함께 기록합니다.
+    """
+
+    def __init__(self, max_tokens=4096, max_batch_size=64, arrival_batch_size=32):
+        self.max_tokens = int(max_tokens)
+        self.max_batch_size = int(max_batch_size)
+        self.arrival_batch_size = int(arrival_batch_size)
+        self.last_stats = None
+        self._totals = {'calls': 0, 'tokens': 0, 'padded_tokens': 0, 'arrival_padded_tokens': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def token_lengths(texts, tokenizer=None, max_length=None):
+        """토크나이저로 특수 토큰을 포함한 길이를 구합니다. 토크나이저가 없으면 글자 수로 근사합니다."""
+        if tokenizer is not None:
+            kwargs = {'truncation': True, 'max_length': max_length} if max_length else {}
+            return np.array([len(ids) for ids in tokenizer(list(texts), **kwargs)['input_ids']], dtype=np.int64)
+        lengths = np.array([len(t) // 2 + 2 for t in texts], dtype=np.int64)
+        return np.minimum(lengths, max_length) if max_length else lengths
+
+    def _record(self, lengths, batches):
+        arrival = [np.arange(i, min(i + self.arrival_batch_size, len(lengths))) for i in range(0, len(lengths), self.arrival_batch_size)]
+        tokens = int(lengths.sum())
+        padded = _padded_tokens(lengths, batches)
+        arrival_padded = _padded_tokens(lengths, arrival)
+        stats = {'texts': len(lengths), 'batches': len(batches), 'tokens': tokens, 'padded_tokens': padded,
+                 'waste_ratio': 1.0 - tokens / padded, 'arrival_waste_ratio': 1.0 - tokens / arrival_padded}
+        with self._lock:
+            self.last_stats = stats
+            self._totals['calls'] += 1
+            self._totals['tokens'] += tokens
+            self._totals['padded_tokens'] += padded
+            self._totals['arrival_padded_tokens'] += arrival_padded
+        return stats
+
+    def summary(self):
+        """지금까지의 누적 패딩 낭비율을 반환합니다."""
+        with self._lock:
+            totals = dict(self._totals)
+        if not totals['padded_tokens']: return {**totals, 'waste_ratio': 0.0, 'arrival_waste_ratio': 0.0}
+        return {**totals, 'waste_ratio': 1.0 - totals['tokens'] / totals['padded_tokens'],
+                'arrival_waste_ratio': 1.0 - totals['tokens'] / totals['arrival_padded_tokens']}
+
+    def run(self, texts, run_batch, tokenizer=None, max_length=None, label='encode'):
+        """
+        texts를 길이 기반 배치로 나눠 run_batch(배치 텍스트 리스트)를 호출하고,
+        결과 항목들을 원래 순서의 리스트로 반환합니다.
+        run_batch는 배치 길이와 같은 개수의 결과(리스트 또는 배열)를 돌려줘야 합니다.
+        """
+        texts = list(texts)
+        if not texts: return []
+        lengths = self.token_lengths(texts, tokenizer, max_length)
+        batches = plan_batches(lengths, self.max_tokens, self.max_batch_size)
+        results = [None] * len(texts)
+        for batch in batches:
+            outputs = run_batch([texts[i] for i in batch])
+            for i, output in zip(batch, outputs):
+                results[i] = output
+        stats = self._record(lengths, batches)
+        if len(batches) > 1:
+            print(f"--- [{label}] {stats['texts']}개 텍스트, {stats['batches']}개 배치, "
+                  f"패딩 낭비율 {stats['waste_ratio']:.1%} (도착 순서 배치 {stats['arrival_waste_ratio']:.1%}) ---")
+        return results
+
+
+class LengthBucketedEncoder:
+    """
+    SBERT 인코더(SentenceTransformer, ONNX, 공유 본체)를 감싸 encode 호출을 길이 기반 배치로 처리합니다.
+    encode 이외의 속성은 감싼 모델로 그대로 전달합니다.
+    """
+
+    def __init__(self, model, batcher):
+        self.model = model
+        self.batcher = batcher
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, convert_to_tensor=False,
+               normalize_embeddings=False, **kwargs):
+        if isinstance(sentences, str) or len(sentences) <= 1:
+            return self.model.encode(sentences, batch_size=batch_size, convert_to_numpy=convert_to_numpy,
+                                     convert_to_tensor=convert_to_tensor, normalize_embeddings=normalize_embeddings, **kwargs)
+
+        def run_batch(batch):
+            return np.asarray(self.model.encode(batch, batch_size=len(batch), convert_to_numpy=True,
+                                                normalize_embeddings=normalize_embeddings, **kwargs), dtype=np.float32)
+        rows = self.batcher.run(sentences, run_batch, tokenizer=getattr(self.model, 'tokenizer', None),
+                                max_length=getattr(self.model, 'max_seq_length', None), label='encode')
+        embeddings = np.vstack(rows)
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
@@ -6,6 +6,7 @@
 import sys
 import os
 import configparser
+import importlib.util
 import threading
 import warnings
 from collections import Counter
@@ -15,26 +16,47 @@ import tkinter as tk
 from tkinter import ttk, messagebox, font, filedialog
 
 # --- 3. Third-Party Data & Web Libraries ---
+# 무거운 라이브러리(pandas, gspread, matplotlib 등)는 첫 창을 띄운 뒤 실제로 필요해질 때 불러옵니다.
+# 설치 여부만 시작 시 확인합니다. (import 시간 측정: python profile_startup.py)
+REQUIRED_MODULES = ['numpy', 'pandas', 'gspread', 'oauth2client', 'serpapi', 'matplotlib', 'requests']
+_missing = next((name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None), None)
 try:
-    import pandas as pd
-    import gspread
-    from oauth2client.service_account import ServiceAccountCredentials
-    from serpapi import GoogleSearch
-    import matplotlib
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import requests
-
-    matplotlib.use('TkAgg')
+    if _missing: raise ModuleNotFoundError(f"No module named '{_missing}'", name=_missing)
+    import numpy as np
+
+    from lazy_import import LazyModule
+    from embedding_cache import EmbeddingCache
+    from category_scorer import CategoryScorer, centroid
+    from length_batching import LengthBucketedBatcher, LengthBucketedEncoder
+    from vector_index import normalize_index_type, load_or_build_index
+    from query_cache import QueryEmbeddingCache
+    from prototype_store import PrototypeStore
+    from readiness import ReadinessManager
+    from sheet_snapshot import SheetSnapshotStore
+    from data_sources import create_data_source
+    from review_index import ReviewRowIndex
+    from review_stats import ReviewStatsTable, mean_rating
+    from review_display import build_display_rows
+    from review_keywords import ReviewKeywordIndex
+    from analysis_cache import AnalysisResultCache, replaces_analysis_data, holds_data_lock
+    from review_schema import normalize_reviews, normalize_profiles, normalize_preferences, append_reviews, memory_usage
+    from sheets_fetch import with_backoff, batch_get_sheet_values
+    from model_backend import normalize_backend, normalize_quantization, encoder_identity, encoder_fingerprint, load_sentence_encoder, loaded_encoder_identity
 except ImportError as e:
     root = tk.Tk()
     root.withdraw()
     messagebox.showerror("라이브러리 오류", f"필수 라이브러리가 설치되지 않았습니다: {e.name}\n'pip install {e.name}' 명령으로 설치해주세요.")
     sys.exit(1)
 
+pd = LazyModule('pandas')
+gspread = LazyModule('gspread')
+oauth2_service_account = LazyModule('oauth2client.service_account')
+serpapi = LazyModule('serpapi')
+requests = LazyModule('requests')
+
 
 # --- 4. Global Configurations & Utility Functions ---
-def setup_fonts():
+def setup_fonts(matplotlib):
     """OS 환경에 맞춰 Matplotlib의 기본 한글 폰트를 설정합니다."""
     if sys.platform == "win32":
         font_family = "Malgun Gothic"
@@ -43,12 +65,28 @@ def setup_fonts():
     else:
         font_family = "NanumGothic"
     try:
-        plt.rc('font', family=font_family)
-        plt.rc('axes', unicode_minus=False)
+        matplotlib.rc('font', family=font_family)
+        matplotlib.rc('axes', unicode_minus=False)
     except Exception:
         print(f"경고: '{font_family}' 폰트를 설정할 수 없습니다. 그래프의 한글이 깨질 수 있습니다.")
 
 
+_figure_backend = None
+
+
+def load_figure_backend():
+    """그래프가 처음 필요할 때 matplotlib을 불러와 TkAgg 백엔드와 한글 폰트를 설정하고 (Figure, FigureCanvasTkAgg)를 반환합니다."""
+    global _figure_backend
+    if _figure_backend is None:
+        import matplotlib
+        matplotlib.use('TkAgg')
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        setup_fonts(matplotlib)
+        _figure_backend = (Figure, FigureCanvasTkAgg)
+    return _figure_backend
+
+
 def setup_warnings():
     """불필요한 경고 메시지를 숨겨 콘솔을 깨끗하게 유지합니다."""
     warnings.filterwarnings("ignore", category=UserWarning)
@@ -64,8 +102,17 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def is_empty(df):
+    """시트 데이터가 아직 로드되지 않았거나(None) 비어 있으면 True를 반환합니다."""
+    return df is None or df.empty
+
+
+def cache_path(paths, file_name):
+    """ 임베딩 등 계산 결과를 보관할 캐시 파일 경로를 반환합니다. (config.ini의 cache_dir, 기본값 'cache') """
+    return os.path.join(os.path.abspath(paths.get('cache_dir', 'cache')), file_name)
+
+
 # --- 5. Initial Setup Execution ---
-setup_fonts()
 setup_warnings()
 
 
@@ -82,35 +129,166 @@ class ReviewAnalyzer:
     TOURIST_SPOT_CATEGORIES = {'K-문화': ['K팝', 'K드라마', '영화 촬영지'], '해양': ['바다', '해변', '요트'], '웰니스': ['힐링', '휴식', '스파'],
                                '뷰티': ['미용', '헤어', '피부'], 'e스포츠': ['e스포츠', '게임', 'PC방'], '미식': ['맛집', '음식', '레스토랑']}
 
-    def __init__(self, api_keys, paths):
+    SBERT_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+    DISTRIBUTION_RANK_WEIGHTS = {1: 50, 2: 30, 3: 20}  # 연도별 분포: 1~3순위 분류 가중치
+    DISTRIBUTION_REVIEW_WEIGHT = 10  # 연도별 분포: 리뷰 유사도 가중치
+    SHEET_NAMES = ["기업리뷰_데이터", "기업목록", "기업목록_데이터", "선호분야"]
+    REVIEW_SHEET = "기업리뷰_데이터"  # 행이 추가만 되는 시트 (증분 동기화 대상)
+
+    def __init__(self, api_keys, paths, model_settings=None):
         self.KOREA_TOUR_API_KEY = api_keys.get('korea_tour_api_key')
         self.TRIPADVISOR_API_KEY = api_keys.get('tripadvisor_api_key')
         self.SERPAPI_API_KEY = api_keys.get('serpapi_api_key')
         self.KOREA_TOUR_API_URL = "http://apis.data.go.kr/B551011/KorService2/areaBasedList2"
         self.TRIPADVISOR_API_URL = "https://api.content.tripadvisor.com/api/v1"
         self.paths = paths
-        self.unified_profiles, self.company_review_df, self.preference_df = {}, pd.DataFrame(), pd.DataFrame()
+        self.model_settings = model_settings or {}
+        self.inference_backend = normalize_backend(self.model_settings.get('inference_backend'))
+        self.quantization = normalize_quantization(self.model_settings.get('quantization'))
+        self.batcher = LengthBucketedBatcher(max_tokens=self.model_settings.get('batch_token_budget', 4096),
+                                             max_batch_size=self.model_settings.get('batch_max_size', 64))
+        self.search_index_type = normalize_index_type(self.model_settings.get('search_index'))
+        self.search_index_nprobe = int(self.model_settings.get('search_index_nprobe', 8))
+        self.query_cache = None
+        self.unified_profiles, self.company_review_df, self.preference_df = {}, None, None  # 시트 로드 전에는 None
         self.sbert_model, self.tourist_category_embeddings, self.enterprise_category_embeddings = None, None, None
-
-    def _load_sbert_model(self):
-        """AI SBERT 모델과 카테고리 임베딩을 로드합니다."""
+        self.tourist_category_scorer, self.enterprise_category_scorer = None, None
+        self.embedding_cache = EmbeddingCache(cache_path(paths, 'company_embeddings.npz'), encoder_identity(self.SBERT_MODEL_NAME, self.inference_backend, self.quantization))
+        self.company_search_index = None
+        self.review_embedding_cache = EmbeddingCache(cache_path(paths, 'review_embeddings.npz'), encoder_identity(self.SBERT_MODEL_NAME, self.inference_backend, self.quantization))
+        self.review_embeddings, self.review_has_text = None, None
+        self.category_distribution = None
+        self.sheet_snapshots = SheetSnapshotStore(cache_path(paths, 'sheet_snapshots.sqlite'))
+        # 데이터 소스: config.ini [PATHS] data_source (sheets | csv | parquet | sqlite)
+        self.data_source = create_data_source(paths, self.sheet_snapshots, paths.get('spreadsheet_name'), self._open_spreadsheet,
+                                              self._download_sheet_values)
+        self.data_revision, self.data_verified = None, False
+        # 증분 동기화 상태: 리뷰 시트의 머리글 행, 반영한 원본 행 수(머리글 포함), 이번에 덧붙인 리뷰의 시작 위치
+        self._review_sheet_head, self._review_sheet_rows, self._review_append_start = None, 0, None
+        self.review_row_index = None  # 대상기업별 / (대상기업, 연도)별 리뷰 행 위치 색인
+        self.review_stats = None  # 기업별 리뷰/협업 선호도 통계표 (로딩 시 계산)
+        self.review_keywords = None  # 기업별 리뷰 단어 빈도 TF-IDF 키워드 색인
+        # 기업 분석 화면 결과 LRU 캐시 ((기업, 데이터 버전) 키, 데이터를 다시 불러오면 비움)
+        self.analysis_cache = AnalysisResultCache(int(self.model_settings.get('analysis_cache_size', 32)))
+        # 시트 데이터 교체와 검색 인덱스 생성은 같은 데이터를 읽고 쓰므로 한 번에 하나만 실행합니다. (새로고침과 인덱스 생성이 겹치는 경우)
+        self.data_lock = threading.RLock()
+
+    @replaces_analysis_data
+    def _load_sbert_model(self, build_indexes=True):
+        """AI SBERT 모델과 카테고리 임베딩을 로드합니다. build_indexes=False이면 데이터 기반 인덱스 생성은 호출자가 맡습니다."""
         try:
-            from sentence_transformers import SentenceTransformer
             import torch
             model_path = resource_path('jhgan/ko-sroberta-multitask')
             device = 'cuda' if torch.cuda.is_available() else 'cpu'
-            self.sbert_model = SentenceTransformer('jhgan/ko-sroberta-multitask', device=device)
-            self.enterprise_category_embeddings = {cat: self.sbert_model.encode(cat, convert_to_tensor=True) for cat in self.ENTERPRISE_CATEGORIES}
-            self.tourist_category_embeddings = {cat: self.sbert_model.encode(kw, convert_to_tensor=True) for cat, kw in self.TOURIST_SPOT_CATEGORIES.items()}
+            encoder = load_sentence_encoder(self.SBERT_MODEL_NAME, backend=self.inference_backend, artifact_dir=cache_path(self.paths, 'models'), device=device, quantization=self.quantization)
+            self.sbert_model = LengthBucketedEncoder(encoder, self.batcher)
+            # 임베딩 캐시와 프로토타입은 설정값이 아니라 실제로 로드된 백엔드/양자화 기준으로 구분합니다. (ONNX -> PyTorch 전환 등)
+            identity = loaded_encoder_identity(self.SBERT_MODEL_NAME, encoder)
+            self.embedding_cache = EmbeddingCache(cache_path(self.paths, 'company_embeddings.npz'), identity)
+            self.review_embedding_cache = EmbeddingCache(cache_path(self.paths, 'review_embeddings.npz'), identity)
+            self._load_category_prototypes(self.SBERT_MODEL_NAME, identity)
+            self.enterprise_category_scorer = CategoryScorer(self.enterprise_category_embeddings)
+            self.tourist_category_scorer = CategoryScorer(self.tourist_category_embeddings)
+            # 반복되는 카테고리 검색(관광지 추천 등)은 모델 추론 없이 처리되도록 카테고리 이름을 미리 인코딩해 둡니다.
+            self.query_cache = QueryEmbeddingCache(self._encode_normalized, int(self.model_settings.get('query_cache_size', 512)))
+            self.query_cache.seed(self.ENTERPRISE_CATEGORIES + list(self.TOURIST_SPOT_CATEGORIES))
+            self.embedding_cache.load()
+            self.review_embedding_cache.load()
+            if build_indexes and self.unified_profiles: self.build_derived_indexes()
         except Exception as e:
             raise RuntimeError(f"AI 모델 로딩 실패: {e}")
 
-    def load_and_unify_data_sources(self):
-        """각 시트의 데이터를 먼저 정제한 후 통합하여 'Reindexing' 오류를 방지합니다."""
-        def robust_get_dataframe(worksheet):
+    def _load_category_prototypes(self, model_source, identity):
+        """카테고리 프로토타입 임베딩을 디스크에서 불러옵니다. 모델이나 카테고리 정의가 바뀐 경우에만 한 번에 다시 인코딩합니다."""
+        store = PrototypeStore(os.path.join(cache_path(self.paths, 'models'), 'category_prototypes.npz'), encoder_fingerprint(model_source, identity))
+        prototypes = store.get({'enterprise': {cat: [cat] for cat in self.ENTERPRISE_CATEGORIES}, 'tourist': self.TOURIST_SPOT_CATEGORIES}, self._encode_normalized)
+        self.enterprise_category_embeddings, self.tourist_category_embeddings = prototypes['enterprise'], prototypes['tourist']
+
+    def _encode_normalized(self, texts):
+        """텍스트 리스트를 L2 정규화된 numpy 임베딩 행렬로 인코딩합니다."""
+        return self.sbert_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    def _get_query_embedding(self, query):
+        """검색어 임베딩을 LRU 캐시에서 가져옵니다. 같은 검색어의 동시 요청은 한 번만 인코딩됩니다."""
+        if self.query_cache is None: return self._encode_normalized([query])[0]
+        return self.query_cache.get(query)
+
+    @holds_data_lock
+    @replaces_analysis_data
+    def build_derived_indexes(self):
+        """모델과 시트 데이터가 모두 준비된 뒤 만드는 검색 인덱스, 리뷰 임베딩, 카테고리 분포를 생성합니다."""
+        self._build_company_search_index()
+        self._build_review_embeddings()
+        self._materialize_category_distributions()
+
+    def _build_review_embeddings(self):
+        """
+        리뷰('평가내용')를 리뷰 단위로 임베딩해 저장소에 보관합니다. 저장소에 없는 리뷰만 새로 인코딩합니다.
+        증분 동기화로 리뷰가 덧붙여졌고 기존 행렬이 그 앞부분과 일치하면 새 리뷰만 인코딩해 이어 붙입니다.
+        """
+        append_start, self._review_append_start = self._review_append_start, None
+        previous, previous_has_text = self.review_embeddings, self.review_has_text
+        self.review_embeddings, self.review_has_text = None, None
+        if not self.sbert_model or is_empty(self.company_review_df) or '평가내용' not in self.company_review_df.columns: return
+        incremental = previous is not None and previous.shape[1] > 0 and append_start == len(previous)
+        texts = self.company_review_df['평가내용'].iloc[append_start if incremental else 0:].fillna('').astype(str).str.strip()
+        has_text = (texts != '').to_numpy()
+        embeddings, _ = self.review_embedding_cache.get_embeddings(texts[has_text].tolist(), self._encode_normalized)
+        if not incremental: self.review_embedding_cache.prune(texts[has_text].tolist())
+        self.review_embedding_cache.save()
+        dim = previous.shape[1] if incremental else (embeddings.shape[1] if has_text.any() else 0)
+        matrix = np.zeros((len(texts), dim), dtype=np.float32)
+        if has_text.any(): matrix[has_text] = embeddings
+        if incremental: matrix, has_text = np.vstack([previous, matrix]), np.concatenate([previous_has_text, has_text])
+        self.review_embeddings, self.review_has_text = matrix, has_text
+
+    def _build_company_search_index(self):
+        """검색 대상 기업 코퍼스의 임베딩을 캐시에서 가져오고, 내용이 바뀐 기업만 새로 인코딩합니다."""
+        if not self.sbert_model: return
+        profile_df = self.unified_profiles.get('2025', pd.DataFrame()).reset_index()
+        if profile_df.empty:
+            self.company_search_index = None
+            return
+        corpus = (profile_df['사업내용'].fillna('') + ' ' + profile_df['키워드'].fillna('')).tolist()
+        embeddings, encoded_count = self.embedding_cache.get_embeddings(corpus, self._encode_normalized)
+        self.embedding_cache.prune(corpus)
+        self.embedding_cache.save()
+        no_rank = np.full(len(profile_df), None, dtype=object)
+        self.company_search_index = {
+            'names': profile_df['기업명'].tolist(),
+            'embeddings': embeddings,
+            'rank1': profile_df['1순위 분류'].to_numpy(dtype=object) if '1순위 분류' in profile_df.columns else no_rank,
+            'rank2': profile_df['2순위 분류'].to_numpy(dtype=object) if '2순위 분류' in profile_df.columns else no_rank,
+            'vectors': load_or_build_index(embeddings, cache_path(self.paths, 'company_index.npz'), self.search_index_type, self.search_index_nprobe),
+        }
+        print(f"--- 기업 검색 임베딩 준비 완료: {len(corpus)}개 기업 (신규 인코딩 {encoded_count}개) ---")
+
+    def _open_spreadsheet(self):
+        creds = oauth2_service_account.ServiceAccountCredentials.from_json_keyfile_name(resource_path(self.paths['google_sheet_key_path']), ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive'])
+        return with_backoff(lambda: gspread.authorize(creds).open(self.paths['spreadsheet_name']))
+
+    def _download_sheet_values(self, spreadsheet, sheet_names, tails=None):
+        """모든 시트의 값을 values.batchGet 한 번의 요청으로 내려받습니다. (일시 오류는 백오프 후 재시도, tails는 증분 동기화용)"""
+        values, _ = batch_get_sheet_values(spreadsheet, sheet_names, tails=tails)
+        return values
+
+    def sheets_changed(self):
+        """데이터 소스(원격 스프레드시트 또는 로컬 파일)가 현재 불러온 데이터 이후 수정되었는지 확인합니다. (확인할 수 없으면 True)"""
+        return self.data_source.changed(self.data_revision)
+
+    @holds_data_lock
+    @replaces_analysis_data
+    def load_and_unify_data_sources(self, build_indexes=True, snapshot_first=False):
+        """
+        각 시트의 데이터를 먼저 정제한 후 통합하여 'Reindexing' 오류를 방지합니다.
+        값은 config.ini [PATHS] data_source로 고른 소스(Google Sheets, CSV/Parquet 폴더, SQLite)에서 같은 형식으로 받습니다.
+        Google Sheets는 로컬 스냅샷(cache/sheet_snapshots.sqlite)을 거치며, 원격 시트가 바뀐 경우에만 다시 내려받습니다.
+        snapshot_first=True이면 스냅샷이 있을 때 원격 확인 없이 바로 사용합니다. (이후 sheets_changed()로 확인)
+        리뷰 시트(REVIEW_SHEET)는 행이 추가만 되므로, 이미 불러온 뒤에는 새 행만 받아 파싱해 company_review_df에 덧붙입니다.
+        """
+        def robust_get_dataframe(all_values, title):
             """시트의 헤더가 비정상적이거나 중복되어도 안전하게 DataFrame을 생성합니다."""
             try:
-                all_values = worksheet.get_all_values()
                 if not all_values: return pd.DataFrame()
                 header_row_idx = 0
                 for i, row in enumerate(all_values):
@@ -130,22 +308,45 @@ class ReviewAnalyzer:
                 if '' in df.columns: df = df.drop(columns=[''])
                 return df.dropna(how='all')
             except Exception as e:
-                print(f"경고: '{worksheet.title}' 시트 처리 중 오류: {e}")
+                print(f"경고: '{title}' 시트 처리 중 오류: {e}")
                 return pd.DataFrame()
 
+        def parse_reviews(all_values):
+            """
+            리뷰 시트 값(머리글 포함)을 DataFrame으로 만들고 열 형식을 정리합니다. 새 행만 파싱할 때도 사용합니다.
+            정리 전 메모리 사용량을 함께 반환합니다.
+            """
+            review_df = robust_get_dataframe(all_values, self.REVIEW_SHEET)
+            raw_bytes = memory_usage(review_df)
+            return normalize_reviews(review_df), raw_bytes
+
         try:
-            creds = ServiceAccountCredentials.from_json_keyfile_name(resource_path(self.paths['google_sheet_key_path']), ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive'])
-            gc = gspread.authorize(creds)
-            spreadsheet = gc.open(self.paths['spreadsheet_name'])
-            self.company_review_df = robust_get_dataframe(spreadsheet.worksheet("기업리뷰_데이터"))
-            if not self.company_review_df.empty and '타임스탬프' in self.company_review_df.columns:
-                series = self.company_review_df['타임스탬프'].astype(str).str.replace('오전', 'AM').str.replace('오후', 'PM')
-                self.company_review_df['year'] = pd.to_datetime(series, errors='coerce').dt.year
-                self.company_review_df.dropna(subset=['year'], inplace=True)
-                self.company_review_df['year'] = self.company_review_df['year'].astype(int)
-
-            base_df = robust_get_dataframe(spreadsheet.worksheet("기업목록"))
-            new_df = robust_get_dataframe(spreadsheet.worksheet("기업목록_데이터"))
+            append_only = {self.REVIEW_SHEET: self._review_sheet_rows} if self._review_sheet_head and self.company_review_df is not None else None
+            values, revision, verified, appended = self.data_source.load(self.SHEET_NAMES, snapshot_first, append_only)
+            sheets = {name: robust_get_dataframe(values[name], name) for name in self.SHEET_NAMES if name != self.REVIEW_SHEET}
+
+            review_values = values[self.REVIEW_SHEET] or []
+            if self.REVIEW_SHEET in appended:
+                # 새 행만 같은 머리글로 파싱하고, 전체를 다시 읽었을 때와 같은 행 번호를 인덱스로 붙여 덧붙입니다.
+                new_reviews, _ = parse_reviews(self._review_sheet_head + review_values)
+                new_reviews.index += self._review_sheet_rows - len(self._review_sheet_head)
+                self._review_append_start = len(self.company_review_df)
+                self.company_review_df = append_reviews(self.company_review_df, new_reviews)
+                if self.review_row_index is not None and self.review_row_index.row_count == self._review_append_start:
+                    self.review_row_index.extend(new_reviews, self._review_append_start)
+                else:
+                    self.review_row_index = ReviewRowIndex.build(self.company_review_df)
+                memory_before = memory_usage(self.company_review_df)
+                self._review_sheet_rows += len(review_values)
+                print(f"--- 리뷰 {len(new_reviews)}개 추가 (전체 {len(self.company_review_df)}개) ---")
+            else:
+                head_end = next((i for i, row in enumerate(review_values) if any(str(field).strip() for field in row)), 0)
+                self.company_review_df, memory_before = parse_reviews(review_values)
+                self.review_row_index = ReviewRowIndex.build(self.company_review_df)
+                self._review_sheet_head, self._review_sheet_rows, self._review_append_start = review_values[:head_end + 1], len(review_values), None
+
+            base_df = sheets["기업목록"]
+            new_df = sheets["기업목록_데이터"]
             processed_dfs = []
             if not base_df.empty and '기업ID' in base_df.columns:
                 base_df.dropna(subset=['기업ID'], inplace=True)
@@ -195,42 +396,108 @@ class ReviewAnalyzer:
                         else:
                             self.unified_profiles[str(int(year))] = group_deduped.set_index('기업명')
 
-            self.preference_df = robust_get_dataframe(spreadsheet.worksheet("선호분야"))
+            self.preference_df = sheets["선호분야"]
+            # 기업명/평가기관은 category, 평점은 float32, 연도는 int16으로 정리해 메모리를 줄이고 이후 통계 계산의 형 변환을 없앱니다.
+            memory_before += memory_usage(self.preference_df, *self.unified_profiles.values())
+            normalize_profiles(self.unified_profiles)
+            normalize_preferences(self.preference_df)
+            memory_after = memory_usage(self.company_review_df, self.preference_df, *self.unified_profiles.values())
+            print(f"--- 데이터 형식 정리: 메모리 {memory_before / 2 ** 20:.1f} MB -> {memory_after / 2 ** 20:.1f} MB ---")
+            self.review_stats = ReviewStatsTable.build(self.company_review_df, self.get_all_company_names(), self.preference_df)
+            self._update_review_keywords()
+            self.data_revision, self.data_verified = revision, verified
+            if build_indexes and self.sbert_model: self.build_derived_indexes()
         except Exception as e:
             import traceback
             traceback.print_exc()
-            raise RuntimeError(f"Google Sheets 데이터 처리 실패: {e}")
+            raise RuntimeError(f"데이터 소스({self.data_source.name}) 처리 실패: {e}")
+
+    def _materialize_category_distributions(self):
+        """모든 기업 x 연도의 카테고리 분포를 get_yearly_category_distribution과 같은 규칙으로 한 번에 계산해 둡니다."""
+        from category_distribution import CategoryDistributionTable, group_centroids, add_declared_category_scores
+        self.category_distribution = None
+        if not self.enterprise_category_scorer: return
+        year_keys = sorted([k for k in self.unified_profiles.keys() if k.isdigit()], key=int)
+        if not year_keys: return
+        profiles = {k: self.unified_profiles[k][~self.unified_profiles[k].index.duplicated(keep='first')] for k in year_keys}
+        companies = pd.Index(sorted(set().union(*[df.index for df in profiles.values()])))
+        categories = pd.Index(self.enterprise_category_scorer.categories)
+        raw_scores = np.zeros((len(companies), len(year_keys), len(categories)), dtype=np.float32)
+        present = np.zeros((len(companies), len(year_keys)), dtype=bool)
+        review_df = self.company_review_df
+        use_reviews = self.review_embeddings is not None and review_df is not None and len(self.review_embeddings) == len(review_df) and '대상기업' in review_df.columns
+        if use_reviews: review_company = np.where(self.review_has_text, companies.get_indexer(review_df['대상기업']), -1)
+        for y, year_key in enumerate(year_keys):
+            profile_df = profiles[year_key]
+            codes = companies.get_indexer(profile_df.index)
+            present[codes, y] = True
+            for rank, weight in self.DISTRIBUTION_RANK_WEIGHTS.items():
+                if f'{rank}순위 분류' in profile_df.columns:
+                    add_declared_category_scores(raw_scores[:, y], codes, profile_df[f'{rank}순위 분류'].to_numpy(), categories, weight)
+            if use_reviews:
+                year_rows = np.where((review_df['year'] == int(year_key)).to_numpy(), review_company, -1)
+                vectors, has_reviews = group_centroids(self.review_embeddings, year_rows, len(companies))
+                if has_reviews.any():
+                    bonus = np.zeros((len(companies), len(categories)), dtype=np.float32)
+                    bonus[has_reviews] = self.enterprise_category_scorer.score(vectors[has_reviews]) * self.DISTRIBUTION_REVIEW_WEIGHT
+                    raw_scores[codes, y] += bonus[codes]
+        self.category_distribution = CategoryDistributionTable.from_raw_scores(companies, year_keys, list(categories), raw_scores, present)
 
     def get_yearly_category_distribution(self, company_name):
-        from sentence_transformers import util
         if not self.sbert_model: return {}
-        yearly_distribution = {}
+        if self.category_distribution is not None: return self.category_distribution.lookup(company_name)
+        yearly_distribution, yearly_scores, review_vectors = {}, {}, {}
         profile_keys = sorted([k for k in self.unified_profiles.keys() if k.isdigit()], key=int)
         for year_key in profile_keys:
             profile_df = self.unified_profiles.get(year_key)
             if profile_df is None or company_name not in profile_df.index: continue
             company_profile = profile_df.loc[company_name]
             base_scores = {cat: 0.0 for cat in self.ENTERPRISE_CATEGORIES}
-            weights = {1: 50, 2: 30, 3: 20}
-            for rank, weight in weights.items():
+            for rank, weight in self.DISTRIBUTION_RANK_WEIGHTS.items():
                 cat_name = company_profile.get(f'{rank}순위 분류')
                 if cat_name and isinstance(cat_name, str) and cat_name in base_scores:
                     base_scores[cat_name] += weight
-            adjustment_scores = {cat: 0.0 for cat in self.ENTERPRISE_CATEGORIES}
-            if not self.company_review_df.empty and '대상기업' in self.company_review_df.columns:
-                year_to_filter = int(year_key)
-                reviews_df = self.company_review_df[(self.company_review_df['대상기업'] == company_name) & (self.company_review_df['year'] == year_to_filter)]
-                reviews_text = ' '.join(reviews_df['평가내용'].dropna().astype(str))
-                if reviews_text.strip():
-                    corpus_embedding = self.sbert_model.encode(reviews_text, convert_to_tensor=True)
-                    for cat, cat_emb in self.enterprise_category_embeddings.items():
-                        adjustment_scores[cat] += util.cos_sim(corpus_embedding, cat_emb).item() * 10
-            final_scores = {cat: base_scores[cat] + adjustment_scores[cat] for cat in self.ENTERPRISE_CATEGORIES}
+            yearly_scores[year_key] = base_scores
+            if self.review_embeddings is not None and len(self.review_embeddings) == len(self.company_review_df) and '대상기업' in self.company_review_df.columns:
+                rows = self._company_review_rows(company_name, int(year_key))
+                rows = rows[self.review_has_text[rows]]
+                if len(rows): review_vectors[year_key] = centroid(self.review_embeddings[rows])
+
+        # 저장된 리뷰별 임베딩의 연도별 평균 벡터로 카테고리 유사도를 행렬 연산 한 번에 계산합니다. (재인코딩 없음)
+        if review_vectors:
+            similarity = self.enterprise_category_scorer.score(np.vstack(list(review_vectors.values())))
+            for year_key, sims in zip(review_vectors, similarity):
+                for cat, sim in zip(self.enterprise_category_scorer.categories, sims):
+                    yearly_scores[year_key][cat] += float(sim) * self.DISTRIBUTION_REVIEW_WEIGHT
+
+        for year_key, final_scores in yearly_scores.items():
             total_score = sum(final_scores.values())
             if total_score > 0:
                 yearly_distribution[year_key] = {cat: score / total_score for cat, score in final_scores.items()}
         return yearly_distribution
 
+    def _company_review_rows(self, company_name, year=None):
+        """company_review_df에서 해당 기업(year가 주어지면 그 연도)의 리뷰 행 위치를 반환합니다. 색인이 맞으면 전체 열을 훑지 않습니다."""
+        df = self.company_review_df
+        if is_empty(df) or '대상기업' not in df.columns: return ReviewRowIndex.EMPTY
+        if self.review_row_index is not None and self.review_row_index.matches(df): return self.review_row_index.rows(company_name, year)
+        mask = df['대상기업'] == company_name
+        if year is not None: mask &= df['year'] == year
+        return np.flatnonzero(mask.to_numpy())
+
+    def _update_review_keywords(self):
+        """리뷰 키워드 색인을 갱신합니다. 증분 동기화로 리뷰가 덧붙기만 했으면 새 행만 반영합니다."""
+        df, start = self.company_review_df, self._review_append_start
+        if is_empty(df): self.review_keywords = None
+        elif start is not None and self.review_keywords is not None and self.review_keywords.row_count == start:
+            self.review_keywords.extend(df.iloc[start:], start)
+        else:
+            self.review_keywords = ReviewKeywordIndex.build(df)
+
+    def _company_reviews(self, company_name):
+        """해당 기업의 리뷰 행만 잘라 반환합니다."""
+        return self.company_review_df.iloc[self._company_review_rows(company_name)]
+
     def get_all_company_names(self):
         all_names = set()
         for profile in self.unified_profiles.values():
@@ -251,60 +518,49 @@ class ReviewAnalyzer:
                     return str(description)
         return "등록된 사업 내용이 없습니다."
 
+    def get_company_analysis(self, company_name):
+        """
+        기업 분석 화면에 필요한 (카테고리 분포, 사업 내용, 리뷰 목록, 외부 평가 요약, 동료 평가 요약, 협업 선호도, 키워드 요약)을 반환합니다.
+        같은 데이터 버전에서 다시 연 기업은 캐시된 결과를 그대로 사용합니다.
+        """
+        return self.analysis_cache.get(company_name, self._analyze_company)
+
+    def _analyze_company(self, company_name):
+        ext_summary, peer_summary = self.get_review_statistics(company_name)
+        return (self.get_yearly_category_distribution(company_name), self.get_business_description(company_name),
+                self.get_reviews_for_display(company_name), ext_summary, peer_summary,
+                self.get_preference_summary(company_name), self.get_keyword_summary_from_reviews(company_name))
+
     def get_reviews_for_display(self, company_name):
-        if self.company_review_df.empty: return []
-        reviews = self.company_review_df[self.company_review_df['대상기업'] == company_name].copy()
-        if reviews.empty: return []
-        all_companies = self.get_all_company_names()
-        peer_map = {name: f"동료기업 {i + 1}" for i, name in enumerate(reviews[reviews['평가기관'].isin(all_companies)]['평가기관'].unique())}
-        display_list = []
-        for _, row in reviews.iterrows():
-            source = peer_map.get(row.get('평가기관'), f"외부: {row.get('평가기관', '정보 없음')}")
-            rating = pd.to_numeric(row.get('평점'), errors='coerce')
-            display_list.append({'year': str(row.get('year', '미상')).replace('.0', ''), 'source': source, 'rating': f"{rating:.1f}" if pd.notna(rating) else "N/A", 'sentiment': self.judge_sentiment_by_rating(rating), 'review': row.get('평가내용', '')})
-        return sorted(display_list, key=lambda x: (x['year'].isdigit() and int(x['year']), x['year']), reverse=True)
+        """상세 리뷰 목록용 (year, source, rating, sentiment, review) 튜플 목록입니다. (연도 내림차순, 동료기업은 익명화)"""
+        if is_empty(self.company_review_df): return []
+        peer_names = self.review_stats.peer_names if self.review_stats is not None else self.get_all_company_names()
+        return build_display_rows(self._company_reviews(company_name), peer_names, newest_first=True)
 
     def get_review_statistics(self, company_name):
-        if self.company_review_df.empty: return [], []
-        reviews = self.company_review_df[self.company_review_df['대상기업'] == company_name].copy()
-        reviews['평점'] = pd.to_numeric(reviews['평점'], errors='coerce')
-        all_companies = self.get_all_company_names()
-        ext_reviews = reviews[~reviews['평가기관'].isin(all_companies)]
-        peer_reviews = reviews[reviews['평가기관'].isin(all_companies)]
-        def summarize(df, r_type):
-            if df.empty: return []
-            summary_lines = []
-            if r_type == '외부':
-                for evaluator, group in df.groupby('평가기관'):
-                    pos, total = len(group[group['평점'] >= 4]), len(group)
-                    ratio = (pos / total * 100) if total > 0 else 0
-                    summary_lines.append(f"• '{evaluator}': {ratio:.0f}% 긍정 (평균 {group['평점'].mean():.1f}점)")
-            else:
-                pos, total = len(df[df['평점'] >= 4]), len(df)
-                ratio = (pos / total * 100) if total > 0 else 0
-                summary_lines.append(f"• 동료 기업 전체: {ratio:.0f}% 긍정 (평균 {df['평점'].mean():.1f}점)")
-            return summary_lines
-        return summarize(ext_reviews, '외부'), summarize(peer_reviews, '동료')
+        """외부 평가기관별, 동료 기업 전체의 긍정 비율과 평균 평점을 로딩 시 계산해 둔 통계표에서 조회해 요약합니다."""
+        if is_empty(self.company_review_df) or self.review_stats is None: return [], []
+        ext_summary = [f"• '{row.평가기관}': {row.positive / row.count * 100:.0f}% 긍정 (평균 {mean_rating(row._asdict()):.1f}점)"
+                       for row in self.review_stats.evaluators(company_name, peer=False).itertuples(index=False)]
+        peer = self.review_stats.source(company_name, peer=True)
+        peer_summary = [f"• 동료 기업 전체: {peer['positive'] / peer['count'] * 100:.0f}% 긍정 (평균 {mean_rating(peer):.1f}점)"] if peer['count'] else []
+        return ext_summary, peer_summary
 
     def get_preference_summary(self, company_name):
-        if self.preference_df.empty: return ["협업 선호도 데이터 없음"]
-        prefs = self.preference_df[self.preference_df['평가기업명'] == company_name]
-        if prefs.empty: return ["협업 선호도 평가 기록 없음"]
-        summary = []
-        for target, group in prefs.groupby('평가대상기관'):
-            ratings = pd.to_numeric(group['평점'], errors='coerce').dropna()
-            ratio = (len(ratings[ratings >= 4]) / len(ratings) * 100) if not ratings.empty else 0
-            summary.append(f"• '{target}'과(와)의 협업 선호도: {ratio:.0f}% 긍정")
-        return summary
+        if is_empty(self.preference_df) or self.review_stats is None: return ["협업 선호도 데이터 없음"]
+        if not self.review_stats.preference_count(company_name): return ["협업 선호도 평가 기록 없음"]
+        return [f"• '{row.평가대상기관}'과(와)의 협업 선호도: {(row.positive / row.rated * 100) if row.rated else 0:.0f}% 긍정"
+                for row in self.review_stats.preference_targets(company_name).itertuples(index=False)]
 
     def get_keyword_summary_from_reviews(self, company_name, top_n=5):
-        if self.company_review_df.empty: return "리뷰 데이터 없음"
-        reviews = self.company_review_df[self.company_review_df['대상기업'] == company_name]
-        text = ' '.join(reviews['평가내용'].dropna().astype(str))
-        if not text.strip(): return "리뷰 내용 없음"
-        words = [word for word in text.split() if len(word) >= 2]
-        if not words: return "키워드 추출 불가"
-        return "자주 언급된 키워드: " + ", ".join([f"{k}({c}회)" for k, c in Counter(words).most_common(top_n)])
+        """로딩 시 만든 TF-IDF 키워드 색인에서 해당 기업 리뷰의 특징 키워드를 조회합니다."""
+        if is_empty(self.company_review_df): return "리뷰 데이터 없음"
+        if self.review_keywords is None or not self.review_keywords.matches(self.company_review_df): self._update_review_keywords()
+        keywords = self.review_keywords.top_keywords(company_name, top_n)
+        if not keywords:
+            texts = self._company_reviews(company_name).get('평가내용')
+            return "리뷰 내용 없음" if texts is None or not texts.dropna().astype(str).str.strip().any() else "키워드 추출 불가"
+        return "특징 키워드: " + ", ".join([f"{k}({c}회)" for k, c in keywords])
 
     def judge_sentiment_by_rating(self, rating):
         if pd.isna(rating): return "N/A"
@@ -314,39 +570,26 @@ class ReviewAnalyzer:
             return "N/A"
 
     def search_companies_by_keyword(self, keyword, category=None, top_n=10):
-        from sentence_transformers import util
         if not self.sbert_model: return []
-
-        profile_df = self.unified_profiles.get('2025', pd.DataFrame()).reset_index()
-        if profile_df.empty: return []
-
-        profile_df['corpus'] = profile_df['사업내용'].fillna('') + ' ' + profile_df['키워드'].fillna('')
-
-        keyword_embedding = self.sbert_model.encode(keyword, convert_to_tensor=True)
-        corpus_embeddings = self.sbert_model.encode(profile_df['corpus'].tolist(), convert_to_tensor=True)
-
-        # 1. AI 모델이 계산한 기본 유사도 점수
-        base_scores = util.cos_sim(keyword_embedding, corpus_embeddings)[0].cpu().tolist()
-
-        final_results = []
-        for i, base_score in enumerate(base_scores):
-            company_data = profile_df.iloc[i]
-            final_score = base_score
-
-            # 2. 사용자가 선택한 카테고리에 따라 가중치 부여
-            if category and category != "전체":
-                if '1순위 분류' in company_data and company_data['1순위 분류'] == category:
-                    final_score += self.CATEGORY_WEIGHT_1ST
-                elif '2순위 분류' in company_data and company_data['2순위 분류'] == category:
-                    final_score += self.CATEGORY_WEIGHT_2ND
-
-            final_results.append({
-                "company": company_data['기업명'],
-                "score": final_score
-            })
+        if self.company_search_index is None: self._build_company_search_index()
+        index = self.company_search_index
+        if not index: return []
+
+        # 1. 벡터 인덱스에서 검색어와 코사인 유사도가 높은 후보 상위 top_n개를 찾습니다.
+        keyword_embedding = self._get_query_embedding(keyword)
+        candidate_ids, final_scores = index['vectors'].search(keyword_embedding, top_n)
+
+        # 2. 사용자가 선택한 카테고리에 따라 가중치 부여 (가산점 대상 기업은 유사도 순위와 관계없이 후보에 포함)
+        if category and category != "전체":
+            bonus_ids = np.flatnonzero((index['rank1'] == category) | (index['rank2'] == category))
+            candidate_ids = np.union1d(candidate_ids, bonus_ids)
+            final_scores = index['vectors'].scores_for(keyword_embedding, candidate_ids) + np.where(
+                index['rank1'][candidate_ids] == category, self.CATEGORY_WEIGHT_1ST,
+                np.where(index['rank2'][candidate_ids] == category, self.CATEGORY_WEIGHT_2ND, 0.0))
 
         # 3. 최종 점수를 기준으로 정렬하여 반환
-        return sorted(final_results, key=lambda x: x['score'], reverse=True)[:top_n]
+        order = np.lexsort((candidate_ids, -final_scores))[:top_n]
+        return [{"company": index['names'][i], "score": float(final_scores[j])} for i, j in zip(candidate_ids[order], order)]
 
     def get_tourist_spots_in_busan(self):
         all_spots, seen_titles = [], set()
@@ -386,7 +629,7 @@ class ReviewAnalyzer:
                 "api_key": self.SERPAPI_API_KEY,
                 "hl": "ko"
             }
-            search = GoogleSearch(params)
+            search = serpapi.GoogleSearch(params)
             results = search.get_dict()
 
             if "place_results" in results and results["place_results"].get("place_id"):
@@ -416,7 +659,7 @@ class ReviewAnalyzer:
 
         all_reviews_data = []
         params = {"engine": "google_maps_reviews", "place_id": place_id, "hl": "ko", "api_key": self.SERPAPI_API_KEY}
-        search = GoogleSearch(params)
+        search = serpapi.GoogleSearch(params)
 
         while True:
             try:
@@ -472,20 +715,15 @@ class ReviewAnalyzer:
         return []
 
     def classify_tourist_reviews(self, all_reviews):
-        from sentence_transformers import util
-        if not self.sbert_model or not self.tourist_category_embeddings: return []
-        review_texts = [r.get('text', '') for r in all_reviews if r.get('text', '').strip()]
-        if not review_texts: return []
-        review_embeddings = self.sbert_model.encode(review_texts, convert_to_tensor=True)
-        classified = []
-        for i, review_data in enumerate(filter(lambda r: r.get('text', '').strip(), all_reviews)):
-            scores = {cat: util.cos_sim(review_embeddings[i], emb).max().item() for cat, emb in self.tourist_category_embeddings.items()}
-            best_cat = max(scores, key=scores.get) if scores and max(scores.values()) >= 0.4 else '기타'
-            classified.append({'review': review_data['text'], 'source': review_data['source'], 'category': best_cat})
-        return classified
+        if not self.sbert_model or not self.tourist_category_scorer: return []
+        valid_reviews = [r for r in all_reviews if r.get('text', '').strip()]
+        if not valid_reviews: return []
+        review_embeddings = self.sbert_model.encode([r['text'] for r in valid_reviews], convert_to_numpy=True)
+        labels, _, _ = self.tourist_category_scorer.classify(review_embeddings, threshold=0.4, fallback='기타')
+        return [{'review': r['text'], 'source': r['source'], 'category': label} for r, label in zip(valid_reviews, labels)]
 
     def recommend_companies_for_tourist_spot(self, category, top_n=5):
-        return self.search_companies_by_keyword(category, top_n)
+        return self.search_companies_by_keyword(category, top_n=top_n)
 
 
 # ===================================================================
@@ -560,17 +798,30 @@ class AutocompleteEntry(tk.Frame):
 
 
 class MainPage(tk.Frame):
+    RESOURCE_LABELS = {'spots': "관광지 목록", 'model': "AI 모델", 'data': "시트 데이터", 'search_index': "검색 인덱스"}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.main_content_frame = tk.Frame(self)
         tk.Label(self.main_content_frame, text="K- 콘텐츠 아카이빙 프로그램", font=("Helvetica", 22, "bold")).pack(pady=50)
-        tk.Button(self.main_content_frame, text="기업 분석", font=("Helvetica", 16), width=20, height=3, command=lambda: controller.show_frame("CompanySearchPage")).pack(pady=15)
-        tk.Button(self.main_content_frame, text="관광지 분석", font=("Helvetica", 16), width=20, height=3, command=lambda: controller.show_frame("TouristSearchPage")).pack(pady=15)
-        tk.Button(self.main_content_frame, text="키워드 검색", font=("Helvetica", 16), width=20, height=3, command=lambda: controller.show_frame("KeywordSearchPage")).pack(pady=15)
+        # 각 버튼은 해당 기능에 필요한 리소스가 준비되면 활성화됩니다.
+        self.feature_buttons = {}
+        for feature, text, page_name in [('company', "기업 분석", "CompanySearchPage"), ('tourist', "관광지 분석", "TouristSearchPage"), ('keyword', "키워드 검색", "KeywordSearchPage")]:
+            button = tk.Button(self.main_content_frame, text=text, font=("Helvetica", 16), width=20, height=3, state='disabled', command=lambda p=page_name: controller.show_frame(p))
+            button.pack(pady=15)
+            self.feature_buttons[feature] = button
+        self.status_label = tk.Label(self.main_content_frame, text="", font=("Helvetica", 10), fg='gray')
+        self.status_label.pack(pady=10)
 
     def show_main_content(self):
         self.main_content_frame.pack(expand=True, fill='both')
 
+    def update_readiness(self, readiness, feature_requirements):
+        """리소스 준비 상태에 따라 기능 버튼을 활성화하고, 로딩 현황을 표시합니다."""
+        for feature, button in self.feature_buttons.items():
+            button.config(state='normal' if readiness.is_ready(*feature_requirements[feature]) else 'disabled')
+        self.status_label.config(text="  |  ".join(f"{label}: {readiness.state(name)}" for name, label in self.RESOURCE_LABELS.items()))
+
 
 class CompanySearchPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -591,10 +842,8 @@ class CompanySearchPage(tk.Frame):
 
         graph_frame = ttk.LabelFrame(pane, text="연도별 카테고리 변화", padding=5)
         pane.add(graph_frame, weight=3)
-        self.fig = plt.Figure(figsize=(5, 3), dpi=100)
-        self.ax = self.fig.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=graph_frame)
-        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        # 그래프 영역(matplotlib)은 처음 그릴 때 만듭니다.
+        self.graph_frame, self.fig, self.ax, self.canvas = graph_frame, None, None, None
 
         middle_container = tk.Frame(pane)
         pane.add(middle_container, weight=2)
@@ -644,7 +893,7 @@ class CompanySearchPage(tk.Frame):
         else: self.result_back_button.pack_forget()
 
     def refresh_data(self):
-        self.controller.show_loading_popup_and_start_work()
+        self.controller.refresh_data()
 
     def update_company_list(self):
         self.company_entry.set_completion_list(self.controller.analyzer.get_all_company_names())
@@ -656,14 +905,7 @@ class CompanySearchPage(tk.Frame):
 
     def _analysis_thread(self, company):
         try:
-            analyzer = self.controller.analyzer
-            graph_data = analyzer.get_yearly_category_distribution(company)
-            description = analyzer.get_business_description(company)
-            reviews = analyzer.get_reviews_for_display(company)
-            ext_summary, peer_summary = analyzer.get_review_statistics(company)
-            pref_summary = analyzer.get_preference_summary(company)
-            keyword_summary = analyzer.get_keyword_summary_from_reviews(company)
-            self.after(0, self._update_ui, company, graph_data, description, reviews, ext_summary, peer_summary, pref_summary, keyword_summary)
+            self.after(0, self._update_ui, company, *self.controller.analyzer.get_company_analysis(company))
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -683,9 +925,15 @@ class CompanySearchPage(tk.Frame):
         self._update_text_widget(self.stats_text, stats_content)
         self._update_text_widget(self.keyword_text, keyword_content)
         self.tree.delete(*self.tree.get_children())
-        for r in reviews: self.tree.insert('', 'end', values=[r.get(c, '') for c in self.tree['columns']])
+        for r in reviews: self.tree.insert('', 'end', values=r)
 
     def _update_graph(self, company_name, yearly_data):
+        if self.canvas is None:
+            Figure, FigureCanvasTkAgg = load_figure_backend()
+            self.fig = Figure(figsize=(5, 3), dpi=100)
+            self.ax = self.fig.add_subplot(111)
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
+            self.canvas.get_tk_widget().pack(fill='both', expand=True)
         self.ax.clear()
         if not yearly_data:
             self.ax.text(0.5, 0.5, "표시할 연도별 데이터가 없습니다.", ha='center', va='center')
@@ -804,6 +1052,12 @@ class TouristSearchPage(tk.Frame):
     def update_autocomplete_list(self, spot_list):
         self.spot_entry.set_completion_list(sorted([spot['title'] for spot in spot_list if 'title' in spot]))
 
+    def set_analysis_enabled(self, enabled):
+        """리뷰 분류와 기업 추천에 필요한 모델/검색 인덱스가 준비되었을 때만 분석 버튼을 활성화합니다."""
+        if self.progress_bar.winfo_ismapped(): return  # 분석 진행 중에는 버튼 상태를 그대로 둡니다.
+        self.analyze_button.config(state='normal' if enabled else 'disabled')
+        self.status_label.config(text="대기 중" if enabled else "AI 모델/검색 인덱스 준비 중...")
+
     def start_analysis(self):
         spot = self.spot_entry.get()
         if not spot: messagebox.showwarning("입력 오류", "분석할 관광지 이름을 입력해주세요."); return
@@ -929,13 +1183,26 @@ class DetailPage(tk.Frame):
 # 4. Main Application Controller
 # ===================================================================
 class TouristApp(tk.Tk):
-    def __init__(self, api_keys, paths):
+    # 기능별로 필요한 리소스 (MainPage 버튼 활성화 기준)
+    FEATURE_REQUIREMENTS = {'company': ('data',), 'tourist': ('spots',), 'keyword': ('search_index',)}
+
+    def __init__(self, api_keys, paths, model_settings=None):
         super().__init__()
         self.withdraw()
         self.title("K-콘텐츠 아카이빙 프로그램")
         self.geometry("1200x900")
-        self.analyzer = ReviewAnalyzer(api_keys, paths)
+        self.analyzer = ReviewAnalyzer(api_keys, paths, model_settings)
         self.analysis_result = {}
+
+        # 리소스는 스레드 풀에서 동시에 로드되며, 검색 인덱스는 모델과 시트 데이터가 모두 준비된 뒤 만들어집니다.
+        # (모든 작업이 끝나면 단계별 소요 시간이 콘솔에 출력됩니다)
+        self.readiness = ReadinessManager(dispatch=lambda fn, *args: self.after(0, fn, *args), max_workers=4)
+        self.readiness.register('spots', self.analyzer.get_tourist_spots_in_busan)
+        self.readiness.register('model', lambda: self.analyzer._load_sbert_model(build_indexes=False))
+        self._data_loaded_once = False
+        self.readiness.register('data', self._load_data)
+        self.readiness.register('search_index', self.analyzer.build_derived_indexes, requires=('model', 'data'))
+
         container = tk.Frame(self)
         container.pack(fill="both", expand=True)
         container.grid_rowconfigure(0, weight=1)
@@ -943,8 +1210,9 @@ class TouristApp(tk.Tk):
         self.frames = {F.__name__: F(container, self) for F in (MainPage, CompanySearchPage, TouristSearchPage, KeywordSearchPage, ResultPage, DetailPage)}
         for frame in self.frames.values():
             frame.grid(row=0, column=0, sticky="nsew")
+        self.frames["KeywordSearchPage"].update_category_list(self.analyzer.ENTERPRISE_CATEGORIES)
         self.show_frame("MainPage")
-        self.after(100, self.show_loading_popup_and_start_work)
+        self.after_idle(self.start_background_loading)
 
     def show_frame(self, page_name):
         frame = self.frames[page_name]
@@ -952,77 +1220,54 @@ class TouristApp(tk.Tk):
         if page_name == "ResultPage":
             frame.update_results()
 
-    def show_loading_popup_and_start_work(self):
-        self.create_loading_popup()
-        threading.Thread(target=self._load_resources_thread, daemon=True).start()
-
-    def create_loading_popup(self):
-        self.loading_popup = tk.Toplevel(self)
-        self.loading_popup.title("로딩 중")
-        self.loading_popup.resizable(False, False)
-        self.loading_popup.protocol("WM_DELETE_WINDOW", lambda: None)
-        self.loading_popup.transient(self)
-        self.loading_popup.grab_set()
-        w, h = 400, 150
-        x, y = (self.winfo_screenwidth() // 2) - (w // 2), (self.winfo_screenheight() // 2) - (h // 2)
-        self.loading_popup.geometry(f'{w}x{h}+{x}+{y}')
-        tk.Label(self.loading_popup, text="프로그램을 준비하고 있습니다...", font=("Helvetica", 14, "bold")).pack(pady=20)
-        self.loading_status_label = tk.Label(self.loading_popup, text="초기화 중...", font=("Helvetica", 10))
-        self.loading_status_label.pack(pady=5)
-        self.loading_progress = ttk.Progressbar(self.loading_popup, length=300, mode='determinate')
-        self.loading_progress.pack(pady=10)
-        self.loading_popup.update_idletasks()
-
-    def _load_resources_thread(self):
-        def update_status(value, message):
-            self.loading_progress['value'] = value
-            self.loading_status_label.config(text=message)
-
-        try:
-            self.after(0, update_status, 20, "AI 분석 모델 로딩 중...")
-            self.analyzer._load_sbert_model()
-            self.after(0, update_status, 50, "Google Sheets 데이터 로딩 및 통합 중...")
-            self.analyzer.load_and_unify_data_sources()
-            self.after(0, update_status, 80, "자동완성용 관광지 목록 로딩 중...")
-            spots = self.analyzer.get_tourist_spots_in_busan()
-
-            # [수정] 로딩 완료 함수 호출 시, 기업 카테고리 목록을 함께 전달합니다.
-            self.after(0, self._on_load_complete, spots, self.analyzer.ENTERPRISE_CATEGORIES)
-
-            self.after(0, update_status, 100, "준비 완료!")
-            self.after(500, self.close_loading_popup_and_show_main)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.after(0, self.show_error_and_exit, f"초기화 오류 발생:\n\n{e}")
-
-    def _on_load_complete(self, spots, enterprise_categories):
-        # [수정] enterprise_categories 인자를 받도록 변경합니다.
-
-        # 기존 UI 업데이트
-        self.frames["CompanySearchPage"].update_company_list()
-        self.frames["TouristSearchPage"].update_autocomplete_list(spots)
-
-        # [추가] KeywordSearchPage의 드롭다운 목록을 채우도록 함수를 호출합니다.
-        self.frames["KeywordSearchPage"].update_category_list(enterprise_categories)
-
+    def start_background_loading(self):
+        """로딩 팝업 없이 창을 바로 띄우고, 리소스를 동시에 로드하면서 준비된 기능부터 활성화합니다."""
+        self.readiness.add_listener(self._on_resource_state)
+        self.readiness.when_ready(('spots',), lambda: self.frames["TouristSearchPage"].update_autocomplete_list(self.readiness.result('spots') or []))
+        self.readiness.when_ready(('data',), self.frames["CompanySearchPage"].update_company_list)
+        self.readiness.when_ready(('data',), self._check_sheet_updates)
         self.frames["MainPage"].show_main_content()
-
-    def close_loading_popup_and_show_main(self):
-        if hasattr(self, 'loading_popup') and self.loading_popup.winfo_exists():
-            self.loading_popup.grab_release()
-            self.loading_popup.destroy()
+        self._on_resource_state(None, None, None)
         self.deiconify()
         self.lift()
         self.focus_force()
+        self.readiness.start()
+        if os.environ.get('STARTUP_PROBE'): self.after_idle(self._report_first_window)
 
-    def show_error_and_exit(self, message):
-        if hasattr(self, 'loading_popup') and self.loading_popup.winfo_exists():
-            self.loading_popup.destroy()
-        self.deiconify()
-        messagebox.showerror("심각한 오류", message)
+    def _report_first_window(self):
+        """시작 시간 측정(profile_startup.py)용: 첫 창이 화면에 표시되면 표시를 출력하고 종료합니다."""
+        self.wait_visibility()
+        print("FIRST_WINDOW", flush=True)
         self.destroy()
 
+    def _on_resource_state(self, name, state, error):
+        self.frames["MainPage"].update_readiness(self.readiness, self.FEATURE_REQUIREMENTS)
+        self.frames["TouristSearchPage"].set_analysis_enabled(self.readiness.is_ready('model', 'search_index'))
+        if state == ReadinessManager.FAILED and name in ('spots', 'model', 'data'):
+            label = MainPage.RESOURCE_LABELS.get(name, name)
+            messagebox.showwarning("로딩 오류", f"'{label}' 로딩에 실패했습니다. 이 리소스가 필요한 기능은 비활성화됩니다.\n\n오류: {error}")
+
+    def _load_data(self):
+        # 첫 로딩만 로컬 시트 스냅샷을 바로 사용하고, 원격 변경 여부는 준비된 뒤 따로 확인합니다.
+        first_load, self._data_loaded_once = not self._data_loaded_once, True
+        self.analyzer.load_and_unify_data_sources(build_indexes=False, snapshot_first=first_load)
+
+    def _check_sheet_updates(self):
+        """스냅샷으로 시작했다면 원격 시트가 그 뒤 수정되었는지 백그라운드에서 확인하고, 바뀌었으면 다시 불러옵니다."""
+        if self.analyzer.data_verified: return
+        def check():
+            try:
+                if self.analyzer.sheets_changed():
+                    print("--- 원격 시트가 변경되어 데이터를 다시 불러옵니다. ---")
+                    self.after(0, self.refresh_data)
+            except Exception as e:
+                print(f"경고: 원격 시트 변경 확인 실패 (스냅샷 데이터를 계속 사용합니다): {e}")
+        threading.Thread(target=check, daemon=True).start()
+
+    def refresh_data(self):
+        """시트 데이터를 다시 불러오고, 이에 의존하는 검색 인덱스도 다시 만듭니다."""
+        self.readiness.reload('data')
+
     def navigate_to_company_page(self, company_name, from_result_page=False):
         page = self.frames["CompanySearchPage"]
         page.toggle_back_button(show=from_result_page)
@@ -1077,12 +1322,16 @@ if __name__ == "__main__":
         config.read(resource_path('config.ini'), encoding='utf-8')
         api_keys = dict(config.items('API_KEYS'))
         paths = dict(config.items('PATHS'))
+        model_settings = dict(config.items('MODEL')) if config.has_section('MODEL') else {}
     except Exception as e:
         root = tk.Tk()
         root.withdraw()
         messagebox.showerror("설정 오류", f"config.ini 파일 로드 실패: {e}")
         sys.exit()
 
-    app = TouristApp(api_keys, paths)
+    app = TouristApp(api_keys, paths, model_settings)
     app.mainloop()
+    # 로딩 작업은 스레드 풀에서 실행되므로, 창을 닫으면 남은 로딩을 기다리지 않고 바로 종료합니다.
+    sys.stdout.flush()
+    os._exit(0)
 
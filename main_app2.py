@@ -6,6 +6,7 @@
 import sys
 import os
 import configparser
+import importlib.util
 import threading
 import warnings
 import json
@@ -19,32 +20,46 @@ import tkinter as tk
 from tkinter import ttk, messagebox, font, filedialog
 
 # --- 3. Third-Party Data & Web Libraries ---
+# 무거운 라이브러리(pandas, gspread, matplotlib 등)는 첫 창을 띄운 뒤 실제로 필요해질 때 불러옵니다.
+# (설치 여부는 프로그램 시작점에서 확인합니다. import 시간 측정: python profile_startup.py main_app2)
 try:
-    import pandas as pd
-    import gspread
-    from oauth2client.service_account import ServiceAccountCredentials
-    from serpapi import GoogleSearch
-    import matplotlib
-    import matplotlib.pyplot as plt
-    import matplotlib.ticker
-
-    # ▼▼▼▼▼ [수정된 부분] ▼▼▼▼▼
-    # API 호출에 필수적인 requests 라이브러리를 추가합니다.
-    import requests
-
-    # ▲▲▲▲▲ [수정된 부분 끝] ▲▲▲▲▲
-
-    matplotlib.use('TkAgg')
+    import numpy as np
+
+    from lazy_import import LazyModule
+    from embedding_cache import EmbeddingCache
+    from category_scorer import CategoryScorer, centroid
+    from length_batching import LengthBucketedBatcher, LengthBucketedEncoder
+    from vector_index import normalize_index_type, load_or_build_index
+    from query_cache import QueryEmbeddingCache
+    from prototype_store import PrototypeStore
+    from readiness import ReadinessManager
+    from review_classifier import ReviewClassifier
+    from sheet_snapshot import SheetSnapshotStore
+    from data_sources import create_data_source
+    from review_index import ReviewRowIndex
+    from review_stats import ReviewStatsTable, mean_rating
+    from review_display import build_display_rows
+    from review_keywords import ReviewKeywordIndex
+    from analysis_cache import AnalysisResultCache, replaces_analysis_data, holds_data_lock
+    from review_schema import normalize_reviews, normalize_profiles, normalize_preferences, append_reviews, memory_usage
+    from sheets_fetch import with_backoff, batch_get_sheet_values
+    from model_backend import normalize_backend, normalize_quantization, encoder_identity, encoder_fingerprint, load_sentence_encoder, load_shared_backbone, loaded_encoder_identity
 
 except ImportError as e:
     error_message = f"CRITICAL ERROR: A required library is missing: '{e.name}'.\nPlease install it by running: pip install {e.name}"
     print(error_message)
     sys.exit(1)
 
+pd = LazyModule('pandas')
+gspread = LazyModule('gspread')
+oauth2_service_account = LazyModule('oauth2client.service_account')
+serpapi = LazyModule('serpapi')
+requests = LazyModule('requests')
+
 
 # --- 4. Global Configurations & Utility Functions ---
 
-def setup_fonts():
+def setup_fonts(matplotlib):
     """OS 환경에 맞춰 Matplotlib의 기본 한글 폰트를 설정합니다."""
     # (이하 함수 내용은 기존과 동일)
     if sys.platform == "win32":
@@ -67,7 +82,28 @@ def setup_warnings():
     # (이하 함수 내용은 기존과 동일)
     warnings.filterwarnings("ignore", category=UserWarning, message=".*pkg_resources is deprecated.*")
     warnings.filterwarnings('ignore', message='Unverified HTTPS request')
-    warnings.filterwarnings('ignore', category=matplotlib.MatplotlibDeprecationWarning)
+
+
+_figure_backend = None
+
+
+def load_figure_backend():
+    """그래프가 처음 필요할 때 matplotlib을 불러와 TkAgg 백엔드와 한글 폰트를 설정하고 (Figure, FigureCanvasTkAgg)를 반환합니다."""
+    global _figure_backend
+    if _figure_backend is None:
+        import matplotlib
+        matplotlib.use('TkAgg')
+        warnings.filterwarnings('ignore', category=matplotlib.MatplotlibDeprecationWarning)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        setup_fonts(matplotlib)
+        _figure_backend = (Figure, FigureCanvasTkAgg)
+    return _figure_backend
+
+
+def is_empty(df):
+    """시트 데이터가 아직 로드되지 않았거나(None) 비어 있으면 True를 반환합니다."""
+    return df is None or df.empty
 
 
 def resource_path(relative_path):
@@ -80,8 +116,12 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def cache_path(paths, file_name):
+    """ 임베딩 등 계산 결과를 보관할 캐시 파일 경로를 반환합니다. (config.ini의 cache_dir, 기본값 'cache') """
+    return os.path.join(os.path.abspath(paths.get('cache_dir', 'cache')), file_name)
+
+
 # --- 5. Initial Setup Execution ---
-setup_fonts()
 setup_warnings()
 
 
@@ -106,8 +146,19 @@ class ReviewAnalyzer:
         "지역특화콘텐츠", "관광딥테크", "관광기념품·캐릭터", "미디어마케팅"
     ]
     SEED_BONUS_MULTIPLIERS = {1: 1.5, 2: 1.2, 3: 1.1}
+    SBERT_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+
+    # 연도별 카테고리 분포 계산 가중치
+    DISTRIBUTION_CAT_WEIGHTS = {'1순위 분류': 1.5, '2순위 분류': 1.2, '3순위 분류': 1.0}
+    DISTRIBUTION_KEYWORD_WEIGHT = 0.5
+    DISTRIBUTION_REVIEW_WEIGHT = 1.0
+
+    # 불러오는 시트 (리뷰/선호분야 시트는 없어도 됩니다)
+    SHEET_NAMES = ["기업리뷰_데이터", "기업목록_데이터", "기업목록", "선호분야"]
+    REVIEW_SHEET = "기업리뷰_데이터"  # 행이 추가만 되는 시트 (증분 동기화 대상)
+    OPTIONAL_SHEETS = ("기업리뷰_데이터", "선호분야")
 
-    def __init__(self, api_keys, paths):
+    def __init__(self, api_keys, paths, model_settings=None):
         # --- 인스턴스 변수 초기화 ---
         self.KOREA_TOUR_API_KEY = api_keys.get('korea_tour_api_key')
         self.TRIPADVISOR_API_KEY = api_keys.get('tripadvisor_api_key')
@@ -115,34 +166,100 @@ class ReviewAnalyzer:
         self.KOREA_TOUR_API_URL = "http://apis.data.go.kr/B551011/KorService2/areaBasedList2"
         self.TRIPADVISOR_API_URL = "https://api.content.tripadvisor.com/api/v1"
         self.paths = paths
+        self.model_settings = model_settings or {}
+        self.inference_backend = normalize_backend(self.model_settings.get('inference_backend'))
+        self.quantization = normalize_quantization(self.model_settings.get('quantization'))
+        self.batcher = LengthBucketedBatcher(max_tokens=self.model_settings.get('batch_token_budget', 4096),
+                                             max_batch_size=self.model_settings.get('batch_max_size', 64))
+        self.search_index_type = normalize_index_type(self.model_settings.get('search_index'))
+        self.search_index_nprobe = int(self.model_settings.get('search_index_nprobe', 8))
+        self.query_cache = None
+        self.use_shared_backbone = str(self.model_settings.get('shared_backbone', 'false')).strip().lower() in ('1', 'true', 'yes', 'on')
 
         # 데이터프레임 및 AI 모델 변수 선언
         self.unified_profiles = {}
-        self.company_review_df = pd.DataFrame()
-        self.company_df_for_recommendation = pd.DataFrame()
+        self.company_review_df = None  # 시트 로드 전에는 None
+        self.company_df_for_recommendation = None
         self.sbert_model = None
         self.tourist_category_embeddings = None
         self.enterprise_category_embeddings = None
-
-    def _load_sbert_model(self):
-        """SBERT 모델과 카테고리 임베딩을 로드합니다."""
+        self.tourist_category_scorer = None
+        self.enterprise_category_scorer = None
+        self.embedding_cache = EmbeddingCache(cache_path(paths, 'company_embeddings.npz'),
+                                              encoder_identity(self.SBERT_MODEL_NAME, self.inference_backend, self.quantization))
+        self.company_search_index = None
+        self.review_embedding_cache = EmbeddingCache(cache_path(paths, 'review_embeddings.npz'),
+                                                     encoder_identity(self.SBERT_MODEL_NAME, self.inference_backend, self.quantization))
+        self.review_embeddings, self.review_has_text = None, None
+        self.category_distribution = None
+        self.review_classifier = ReviewClassifier(
+            resource_path('my_review_classifier'),
+            batch_size=self.model_settings.get('classifier_batch_size', 16),
+            max_length=self.model_settings.get('classifier_max_length', 256),
+            backend=self.inference_backend, quantization=self.quantization, artifact_dir=cache_path(paths, 'models'),
+            batcher=self.batcher)
+        self.sheet_snapshots = SheetSnapshotStore(cache_path(paths, 'sheet_snapshots.sqlite'))
+        # 데이터 소스: config.ini [PATHS] data_source (sheets | csv | parquet | sqlite)
+        self.data_source = create_data_source(paths, self.sheet_snapshots, paths.get('spreadsheet_id'), self._open_spreadsheet,
+                                              self._download_sheet_values, optional=self.OPTIONAL_SHEETS)
+        self.data_revision, self.data_verified = None, False
+        # 증분 동기화 상태: 리뷰 시트의 머리글 행, 반영한 원본 행 수(머리글 포함), 이번에 덧붙인 리뷰의 시작 위치
+        self._review_sheet_head, self._review_sheet_rows, self._review_append_start = None, 0, None
+        self.review_row_index = None  # 대상기업별 / (대상기업, 연도)별 리뷰 행 위치 색인
+        self.review_stats = None  # 기업별 리뷰/협업 선호도 통계표 (로딩 시 계산)
+        self.review_keywords = None  # 기업별 리뷰 단어 빈도 TF-IDF 키워드 색인
+        # 기업 분석 화면 결과 LRU 캐시 ((기업, 데이터 버전) 키, 데이터를 다시 불러오면 비움)
+        self.analysis_cache = AnalysisResultCache(int(self.model_settings.get('analysis_cache_size', 32)))
+        # 시트 데이터 교체와 검색 인덱스 생성은 같은 데이터를 읽고 쓰므로 한 번에 하나만 실행합니다. (새로고침과 인덱스 생성이 겹치는 경우)
+        self.data_lock = threading.RLock()
+
+    @replaces_analysis_data
+    def _load_sbert_model(self, build_indexes=True):
+        """SBERT 모델과 카테고리 임베딩을 로드합니다. build_indexes=False이면 데이터 기반 인덱스 생성은 호출자가 맡습니다."""
         try:
-            from sentence_transformers import SentenceTransformer
             import torch
 
-            print("--- AI SBERT 모델 로딩 시작 ---")
+            print(f"--- AI SBERT 모델 로딩 시작 (백엔드: {self.inference_backend}, 양자화: {self.quantization}) ---")
             device = 'cuda' if torch.cuda.is_available() else 'cpu'
             print(f"--- 실행 장치(Device)가 '{device}'로 설정되었습니다. ---")
 
-            model_name = 'jhgan/ko-sroberta-multitask'
-            self.sbert_model = SentenceTransformer(model_name, device=device)
-
-            print("--- 카테고리 임베딩 생성 시작 ---")
-            self.enterprise_category_embeddings = {
-                cat: self.sbert_model.encode(cat, convert_to_tensor=True) for cat in self.ENTERPRISE_CATEGORIES
-            }
+            if self.use_shared_backbone and self.review_classifier.is_available():
+                # 분류 모델 하나로 임베딩과 분류를 함께 처리하여 같은 본체를 두 번 올리지 않습니다.
+                encoder = load_shared_backbone(self.review_classifier.model_path, backend=self.inference_backend,
+                                               artifact_dir=cache_path(self.paths, 'models'), device=device,
+                                               quantization=self.quantization)
+                self.review_classifier.attach(encoder)
+                model_source = self.review_classifier.model_path
+                shared_identity = encoder_identity(model_source, 'shared', encoder.quantization)
+                self.embedding_cache = EmbeddingCache(cache_path(self.paths, 'company_embeddings.npz'), shared_identity)
+                self.review_embedding_cache = EmbeddingCache(cache_path(self.paths, 'review_embeddings.npz'), shared_identity)
+                print("--- 공유 본체 모드: 리뷰 분류 모델로 임베딩과 분류를 함께 처리합니다. ---")
+            else:
+                encoder = load_sentence_encoder(self.SBERT_MODEL_NAME, backend=self.inference_backend,
+                                                artifact_dir=cache_path(self.paths, 'models'), device=device,
+                                                quantization=self.quantization)
+                model_source = self.SBERT_MODEL_NAME
+                # 임베딩 캐시는 설정값이 아니라 실제로 로드된 백엔드/양자화 기준으로 구분합니다. (ONNX -> PyTorch 전환 등)
+                identity = loaded_encoder_identity(model_source, encoder)
+                self.embedding_cache = EmbeddingCache(cache_path(self.paths, 'company_embeddings.npz'), identity)
+                self.review_embedding_cache = EmbeddingCache(cache_path(self.paths, 'review_embeddings.npz'), identity)
+            # 모든 encode 호출이 길이 기반 배치(토큰 예산)를 거치도록 감쌉니다.
+            self.sbert_model = LengthBucketedEncoder(encoder, self.batcher)
+
+            print("--- 카테고리 임베딩 로드 시작 ---")
+            self._load_category_prototypes(model_source, self.embedding_cache.model_name)
+            # 카테고리 프로토타입을 하나의 행렬로 쌓아 리뷰 전체를 한 번에 채점할 수 있도록 준비합니다.
+            self.enterprise_category_scorer = CategoryScorer(self.enterprise_category_embeddings)
+            self.tourist_category_scorer = CategoryScorer(self.tourist_category_embeddings)
+            # 카테고리 이름 검색은 모델 추론 없이 처리되도록 검색어 캐시에 미리 넣어 둡니다.
+            self.query_cache = QueryEmbeddingCache(self._encode_normalized, int(self.model_settings.get('query_cache_size', 512)))
+            self.query_cache.seed(self.ENTERPRISE_CATEGORIES + list(self.TOURIST_SPOT_CATEGORIES))
             print("--- AI SBERT 모델 및 모든 카테고리 임베딩 로딩 완료 ---")
 
+            print(f"--- 기업 임베딩 캐시 로드: {self.embedding_cache.load()}개 항목 ---")
+            print(f"--- 리뷰 임베딩 저장소 로드: {self.review_embedding_cache.load()}개 항목 ---")
+            if build_indexes: self.build_derived_indexes()
+
         except ImportError:
             messagebox.showerror("라이브러리 오류", "AI 모델 로딩에 필요한 'sentence-transformers' 또는 'torch' 라이브러리가 없습니다.")
             self.sbert_model = None
@@ -150,25 +267,239 @@ class ReviewAnalyzer:
             messagebox.showerror("모델 로딩 오류", f"AI 모델 로딩 중 오류가 발생했습니다: {e}")
             self.sbert_model = None
 
-    def load_all_resources(self):
-        """애플리케이션 시작에 필요한 모든 리소스를 순서대로 로드하는 총괄 함수입니다."""
-        print("\n--- 모든 리소스 로딩을 시작합니다. ---")
-        self._load_sbert_model()
-        self.load_and_unify_data_sources()
-        print("--- 모든 리소스 로딩 완료. ---")
+    def _load_category_prototypes(self, model_source, identity):
+        """
+        카테고리 프로토타입 임베딩을 모델 옆(cache/models)에 저장된 파일에서 불러옵니다.
+        모델 해시나 카테고리 정의가 바뀐 경우에만 해당 카테고리 묶음을 한 번의 배치 인코딩으로 다시 만듭니다.
+        """
+        store = PrototypeStore(os.path.join(cache_path(self.paths, 'models'), 'category_prototypes.npz'),
+                               encoder_fingerprint(model_source, identity))
+        prototypes = store.get({'enterprise': {cat: [cat] for cat in self.ENTERPRISE_CATEGORIES},
+                                'tourist': self.TOURIST_SPOT_CATEGORIES}, self._encode_normalized)
+        self.enterprise_category_embeddings = prototypes['enterprise']
+        self.tourist_category_embeddings = prototypes['tourist']
+
+    def _load_review_classifier(self):
+        """파인튜닝된 리뷰 분류 모델을 미리 로드하고 워밍업하여, 분석 시에는 추론 비용만 들도록 합니다."""
+        if not self.review_classifier.is_available():
+            print(f"경고: 파인튜닝된 모델 폴더('{self.review_classifier.model_path}')가 없어 유사도 기반 분류를 사용합니다.")
+            return
+        try:
+            self.review_classifier.load(warmup=True)
+        except Exception as e:
+            print(f"경고: 리뷰 분류 모델 사전 로딩 실패 ({e}). 유사도 기반 분류를 사용합니다.")
+
+    def _encode_normalized(self, texts):
+        """텍스트 리스트를 L2 정규화된 numpy 임베딩 행렬로 인코딩합니다."""
+        return self.sbert_model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+    def _get_query_embedding(self, query):
+        """검색어 임베딩을 LRU 캐시에서 가져옵니다. 같은 검색어의 동시 요청은 한 번만 인코딩됩니다."""
+        if self.query_cache is None: return self._encode_normalized([query])[0]
+        return self.query_cache.get(query)
+
+    def _latest_profile_key(self):
+        """가장 최근 연도의 프로필 키를 반환합니다. 연도별 프로필이 없으면 'base'를 사용합니다."""
+        year_keys = [k for k in self.unified_profiles.keys() if str(k).isdigit()]
+        return max(year_keys, key=int) if year_keys else 'base'
+
+    @holds_data_lock
+    @replaces_analysis_data
+    def build_derived_indexes(self):
+        """모델과 시트 데이터가 모두 준비된 뒤 만드는 검색 인덱스, 리뷰 임베딩, 카테고리 분포를 생성합니다."""
+        self._build_company_search_index()
+        self._build_review_embeddings()
+        self._materialize_category_distributions()
+
+    def _build_company_search_index(self):
+        """
+        키워드 검색 대상 기업 코퍼스의 임베딩을 디스크 캐시에서 가져오고,
+        사업내용/키워드/분류가 바뀐 기업만 새로 인코딩합니다.
+        """
+        if not self.sbert_model: return
+        latest_year = self._latest_profile_key()
+        if latest_year not in self.unified_profiles:
+            self.company_search_index = None
+            return
+
+        latest_profiles = self.unified_profiles[latest_year].reset_index()
+        text_columns = ['사업내용', '키워드', '1순위 분류', '2순위 분류']
+        corpus = latest_profiles.reindex(columns=text_columns).fillna('').astype(str).agg(' '.join, axis=1).tolist()
+
+        embeddings, encoded_count = self.embedding_cache.get_embeddings(corpus, self._encode_normalized)
+        self.embedding_cache.prune(corpus)
+        self.embedding_cache.save()
+        vectors = load_or_build_index(embeddings, cache_path(self.paths, 'company_index.npz'),
+                                      self.search_index_type, self.search_index_nprobe)
+        self.company_search_index = {'names': latest_profiles['기업명'].tolist(), 'embeddings': embeddings, 'vectors': vectors}
+        print(f"--- 키워드 검색용 기업 임베딩 준비 완료: {len(corpus)}개 기업 (신규 인코딩 {encoded_count}개) ---")
+
+    def _build_review_embeddings(self):
+        """
+        기업 리뷰('평가내용')를 리뷰 단위로 임베딩하여 리뷰 해시 기반 저장소에 보관합니다.
+        저장소에 없는 리뷰(마지막 새로고침 이후 추가/수정된 리뷰)만 새로 인코딩합니다.
+        증분 동기화로 리뷰가 덧붙여졌고 기존 행렬이 그 앞부분과 일치하면, 새 리뷰만 인코딩해 기존 행렬 뒤에 이어 붙입니다.
+        """
+        append_start, self._review_append_start = self._review_append_start, None
+        previous, previous_has_text = self.review_embeddings, self.review_has_text
+        self.review_embeddings, self.review_has_text = None, None
+        if not self.sbert_model or is_empty(self.company_review_df) or '평가내용' not in self.company_review_df.columns: return
+
+        incremental = previous is not None and previous.shape[1] > 0 and append_start == len(previous)
+        texts = self.company_review_df['평가내용'].iloc[append_start if incremental else 0:].fillna('').astype(str).str.strip()
+        has_text = (texts != '').to_numpy()
+        embeddings, encoded_count = self.review_embedding_cache.get_embeddings(texts[has_text].tolist(), self._encode_normalized)
+        # 덧붙인 경우에는 기존 리뷰의 임베딩도 계속 사용하므로 저장소를 정리하지 않습니다.
+        if not incremental: self.review_embedding_cache.prune(texts[has_text].tolist())
+        self.review_embedding_cache.save()
+
+        # company_review_df의 행 순서와 같은 (리뷰 수 x 차원) 행렬로 보관합니다. 내용이 없는 행은 0 벡터입니다.
+        dim = previous.shape[1] if incremental else (embeddings.shape[1] if has_text.any() else 0)
+        matrix = np.zeros((len(texts), dim), dtype=np.float32)
+        if has_text.any(): matrix[has_text] = embeddings
+        if incremental: matrix, has_text = np.vstack([previous, matrix]), np.concatenate([previous_has_text, has_text])
+        self.review_embeddings, self.review_has_text = matrix, has_text
+        print(f"--- 리뷰 임베딩 준비 완료: {int(has_text.sum())}개 리뷰 (신규 인코딩 {encoded_count}개{', 증분' if incremental else ''}) ---")
+
+    def _aggregate_review_embedding(self, rows):
+        """선택된 리뷰들(행 위치)의 저장된 임베딩을 평균 내어 대표 벡터를 반환합니다. 해당 리뷰가 없으면 None입니다."""
+        if self.review_embeddings is None or len(self.review_embeddings) != len(self.company_review_df): return None
+        rows = rows[self.review_has_text[rows]]
+        return centroid(self.review_embeddings[rows]) if len(rows) else None
+
+    def _company_review_rows(self, company_name, year=None):
+        """company_review_df에서 해당 기업(year가 주어지면 그 연도)의 리뷰 행 위치를 반환합니다. 색인이 맞으면 전체 열을 훑지 않습니다."""
+        df = self.company_review_df
+        if is_empty(df) or '대상기업' not in df.columns: return ReviewRowIndex.EMPTY
+        if self.review_row_index is not None and self.review_row_index.matches(df): return self.review_row_index.rows(company_name, year)
+        mask = df['대상기업'] == company_name
+        if year is not None: mask &= df['year'] == year
+        return np.flatnonzero(mask.to_numpy())
+
+    def _update_review_keywords(self):
+        """리뷰 키워드 색인을 갱신합니다. 증분 동기화로 리뷰가 덧붙기만 했으면 새 행만 반영합니다."""
+        df, start = self.company_review_df, self._review_append_start
+        if is_empty(df): self.review_keywords = None
+        elif start is not None and self.review_keywords is not None and self.review_keywords.row_count == start:
+            self.review_keywords.extend(df.iloc[start:], start)
+        else:
+            self.review_keywords = ReviewKeywordIndex.build(df)
+
+    def _company_reviews(self, company_name):
+        """해당 기업의 리뷰 행만 잘라 반환합니다."""
+        return self.company_review_df.iloc[self._company_review_rows(company_name)]
+
+    def _distribution_year_keys(self):
+        """분포 계산 대상 프로필 키 (최신 연도부터, 'base'는 마지막)"""
+        year_keys = sorted([k for k in self.unified_profiles.keys() if str(k).isdigit()], key=int, reverse=True)
+        if 'base' in self.unified_profiles: year_keys.append('base')
+        return year_keys
+
+    def _review_category_bonus(self, group_codes, n_groups):
+        """그룹별 리뷰 대표 벡터의 카테고리 유사도 보너스 (n_groups, C)와 리뷰가 있는 그룹 표시를 반환합니다."""
+        from category_distribution import group_centroids
+        vectors, has_rows = group_centroids(self.review_embeddings, group_codes, n_groups)
+        bonus = np.zeros((n_groups, len(self.enterprise_category_scorer.categories)), dtype=np.float32)
+        if has_rows.any():
+            sims = self.enterprise_category_scorer.score(vectors[has_rows])
+            bonus[has_rows] = np.where(sims > 0.1, sims * self.DISTRIBUTION_REVIEW_WEIGHT, 0.0)
+        return bonus, has_rows
+
+    def _materialize_category_distributions(self):
+        """
+        모든 기업 x 연도의 카테고리 분포를 get_yearly_category_distribution과 같은 규칙
+        (프로필 분류 가중치 + 키워드 + 리뷰 유사도)으로 한 번에 계산해 배열로 보관합니다.
+        기업 상세 화면은 이후 이 배열을 조회만 합니다.
+        """
+        from category_distribution import CategoryDistributionTable, add_declared_category_scores
+        self.category_distribution = None
+        if not self.enterprise_category_scorer or not self.unified_profiles: return
+
+        year_keys = self._distribution_year_keys()
+        profiles = {key: self.unified_profiles[key] for key in year_keys}
+        profiles = {key: df[~df.index.duplicated(keep='first')] for key, df in profiles.items()}
+        companies = pd.Index(sorted(set().union(*[df.index for df in profiles.values()])))
+        categories = pd.Index(self.enterprise_category_scorer.categories)
+        raw_scores = np.zeros((len(companies), len(year_keys), len(categories)), dtype=np.float32)
+        present = np.zeros((len(companies), len(year_keys)), dtype=bool)
+
+        # 리뷰 임베딩을 (기업) 단위로 묶어 두고, 연도별 리뷰가 없을 때의 대체값으로 사용합니다.
+        review_df = self.company_review_df
+        use_reviews = (self.review_embeddings is not None and len(self.review_embeddings) == len(review_df)
+                       and '대상기업' in review_df.columns)
+        if use_reviews:
+            review_company = np.where(self.review_has_text, companies.get_indexer(review_df['대상기업']), -1)
+            company_bonus, company_has_reviews = self._review_category_bonus(review_company, len(companies))
+
+        for y, year_key in enumerate(year_keys):
+            profile_df = profiles[year_key]
+            codes = companies.get_indexer(profile_df.index)
+            present[codes, y] = True
+            year_scores = raw_scores[:, y]
+
+            for cat_level, weight in self.DISTRIBUTION_CAT_WEIGHTS.items():
+                if cat_level in profile_df.columns:
+                    add_declared_category_scores(year_scores, codes, profile_df[cat_level].to_numpy(), categories, weight)
+
+            if '키워드' in profile_df.columns:
+                keywords = profile_df['키워드'].where(profile_df['키워드'].map(type) == str, '')
+                for c, cat in enumerate(categories):
+                    year_scores[codes[keywords.str.contains(cat, regex=False).to_numpy()], c] += self.DISTRIBUTION_KEYWORD_WEIGHT
+
+            if use_reviews:
+                bonus = np.where(company_has_reviews[:, None], company_bonus, 0.0)
+                if str(year_key).isdigit() and 'year' in review_df.columns:
+                    year_rows = np.where((review_df['year'] == int(year_key)).to_numpy(), review_company, -1)
+                    year_bonus, year_has_reviews = self._review_category_bonus(year_rows, len(companies))
+                    bonus = np.where(year_has_reviews[:, None], year_bonus, bonus)
+                year_scores[codes] += bonus[codes]
+
+        self.category_distribution = CategoryDistributionTable.from_raw_scores(
+            companies, year_keys, list(categories), raw_scores, present)
+        print(f"--- 카테고리 분포 사전 계산 완료: {len(companies)}개 기업 x {len(year_keys)}개 연도 ---")
+
+    def _open_spreadsheet(self):
+        print("--- [진단] 스레드 내에서 Google Sheets 인증 및 접속을 시도합니다... ---")
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        key_path = resource_path(self.paths['google_sheet_key_path'])
+        creds = oauth2_service_account.ServiceAccountCredentials.from_json_keyfile_name(key_path, scope)
+        thread_local_gs = gspread.authorize(creds)
+        spreadsheet = with_backoff(lambda: thread_local_gs.open_by_key(self.paths['spreadsheet_id']))
+        print(f"--- 접근 성공! '{spreadsheet.title}' ---")
+        return spreadsheet
+
+    def _download_sheet_values(self, spreadsheet, sheet_names, tails=None):
+        """
+        모든 시트의 값을 values.batchGet 한 번의 요청으로 내려받습니다. (일시 오류는 백오프 후 재시도)
+        선택 시트(OPTIONAL_SHEETS)가 없으면 None, 필수 시트가 없으면 예외가 발생합니다.
+        tails가 주어지면 해당 시트는 지정한 행부터 끝까지만 내려받습니다. (증분 동기화)
+        """
+        values, _ = batch_get_sheet_values(spreadsheet, sheet_names, optional=self.OPTIONAL_SHEETS, tails=tails)
+        return values
 
-    def load_and_unify_data_sources(self):
+    def sheets_changed(self):
+        """데이터 소스(원격 스프레드시트 또는 로컬 파일)가 현재 불러온 데이터 이후 수정되었는지 확인합니다. (확인할 수 없으면 True)"""
+        return self.data_source.changed(self.data_revision)
+
+    @holds_data_lock
+    @replaces_analysis_data
+    def load_and_unify_data_sources(self, build_indexes=True, snapshot_first=False):
         """
         [최종 수정본] '기업목록_데이터'와 '기업목록' 시트를 우선순위에 따라 병합하고,
         '기업명'을 인덱스로 설정하여 연도별 프로필을 생성하는 최종 버전입니다.
+        값은 config.ini [PATHS] data_source로 고른 소스(Google Sheets, CSV/Parquet 폴더, SQLite)에서 같은 형식으로 받습니다.
+        Google Sheets는 로컬 스냅샷(cache/sheet_snapshots.sqlite)을 거치며, 원격 시트가 바뀐 경우에만 다시 내려받습니다.
+        snapshot_first=True이면 스냅샷이 있을 때 원격 확인 없이 바로 사용합니다. (이후 sheets_changed()로 확인)
+        리뷰 시트(REVIEW_SHEET)는 행이 추가만 되므로, 한 번 불러온 뒤에는 새 행만 받아 파싱해 company_review_df에 덧붙입니다.
+        (새로고침 비용이 시트 전체 크기가 아니라 새 리뷰 수에 비례합니다)
+        build_indexes=False이면 검색 인덱스 등 모델 기반 인덱스 생성은 호출자가 맡습니다.
         """
         MAX_RETRIES = 3
         RETRY_DELAY = 5
 
         # ... (safe_get_dataframe_legacy 함수는 기존과 동일하게 유지) ...
-        def safe_get_dataframe_legacy(worksheet):
+        def safe_get_dataframe_legacy(values, title):
             try:
-                values = worksheet.get_all_values()
                 if not values: return pd.DataFrame()
                 output = io.StringIO()
                 writer = csv.writer(output)
@@ -181,52 +512,61 @@ class ReviewAnalyzer:
                 return df
             except Exception as e:
                 if "No columns to parse from file" in str(e): return pd.DataFrame()
-                print(f"  - 경고 (Legacy): '{worksheet.title}' 시트 처리 중 오류: {e}")
+                print(f"  - 경고 (Legacy): '{title}' 시트 처리 중 오류: {e}")
                 return pd.DataFrame()
 
+        def parse_reviews(values):
+            """
+            리뷰 시트 값(머리글 포함)을 DataFrame으로 만들고 열 형식을 정리합니다. 새 행만 파싱할 때도 사용합니다.
+            (타임스탬프 -> datetime64, year -> int16, 평점 -> float32, 대상기업/평가기관 -> category) 정리 전 메모리 사용량을 함께 반환합니다.
+            """
+            review_df = safe_get_dataframe_legacy(values, self.REVIEW_SHEET)
+            raw_bytes = memory_usage(review_df)
+            return normalize_reviews(review_df), raw_bytes
+
         for attempt in range(MAX_RETRIES):
             try:
-                # ... (Google Sheets 인증 및 접속 로직은 기존과 동일) ...
-                print("--- [진단] 스레드 내에서 Google Sheets 인증 및 접속을 시도합니다... ---")
-                scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-                key_path = resource_path(self.paths['google_sheet_key_path'])
-                creds = ServiceAccountCredentials.from_json_keyfile_name(key_path, scope)
-                thread_local_gs = gspread.authorize(creds)
-                spreadsheet_id = self.paths.get('spreadsheet_id')
-                if not spreadsheet_id:
+                if self.data_source.name == 'sheets' and not self.paths.get('spreadsheet_id'):
                     print("!!! 치명적 오류: config.ini 파일에 'spreadsheet_id'가 없습니다.");
                     return
-                spreadsheet = thread_local_gs.open_by_key(spreadsheet_id)
-                all_worksheets = spreadsheet.worksheets()
-                all_sheet_names = [ws.title for ws in all_worksheets]
-                print(f"--- 접근 성공! '{spreadsheet.title}' 시트 목록: {all_sheet_names} ---")
+                append_only = ({self.REVIEW_SHEET: self._review_sheet_rows}
+                               if self._review_sheet_head and self.company_review_df is not None else None)
+                values, revision, verified, appended = self.data_source.load(self.SHEET_NAMES, snapshot_first, append_only)
 
                 # 1. 리뷰 데이터 로딩
-                review_sheet_name = "기업리뷰_데이터"
-                if review_sheet_name in all_sheet_names:
-                    worksheet = spreadsheet.worksheet(review_sheet_name)
-                    self.company_review_df = safe_get_dataframe_legacy(worksheet)
+                review_sheet_name = self.REVIEW_SHEET
+                review_values = values[review_sheet_name]
+                if review_sheet_name in appended:
+                    # 새 행만 기존 머리글로 파싱하고, 전체를 다시 읽었을 때와 같은 행 번호를 인덱스로 붙여 덧붙입니다.
+                    new_reviews, _ = parse_reviews(self._review_sheet_head + review_values)
+                    new_reviews.index += self._review_sheet_rows - len(self._review_sheet_head)
+                    self._review_append_start = len(self.company_review_df)
+                    self.company_review_df = append_reviews(self.company_review_df, new_reviews)
+                    if self.review_row_index is not None and self.review_row_index.row_count == self._review_append_start:
+                        self.review_row_index.extend(new_reviews, self._review_append_start)
+                    else:
+                        self.review_row_index = ReviewRowIndex.build(self.company_review_df)
+                    memory_before = memory_usage(self.company_review_df)
+                    self._review_sheet_rows += len(review_values)
+                    print(f"--- '{review_sheet_name}' 증분 동기화: 새 리뷰 {len(new_reviews)}개 추가 ---")
+                elif review_values is not None:
+                    self.company_review_df, memory_before = parse_reviews(review_values)
+                    self.review_row_index = ReviewRowIndex.build(self.company_review_df)
+                    head_end = next((i for i, row in enumerate(review_values) if any(str(field).strip() for field in row)), 0)
+                    self._review_sheet_head, self._review_sheet_rows = review_values[:head_end + 1], len(review_values)
+                    self._review_append_start = None
                     print(f"--- '{review_sheet_name}' 로딩 시도: {len(self.company_review_df)}개 리뷰 로드 ---")
-
-                    # 타임스탬프 후처리
-                    if not self.company_review_df.empty and '타임스탬프' in self.company_review_df.columns:
-                        timestamps_series = self.company_review_df['타임스탬프'].astype(str).str.replace('오전', 'AM',
-                                                                                                    regex=False).str.replace(
-                            '오후', 'PM', regex=False)
-                        timestamps = pd.to_datetime(timestamps_series, errors='coerce')
-                        self.company_review_df['year'] = timestamps.dt.year
-                        self.company_review_df.dropna(subset=['year'], inplace=True)
-                        if not self.company_review_df.empty:
-                            self.company_review_df['year'] = self.company_review_df['year'].astype(int)
                 else:
-                    self.company_review_df = pd.DataFrame()
+                    self.company_review_df, memory_before = pd.DataFrame(), 0
+                    self.review_row_index = None
+                    self._review_sheet_head, self._review_sheet_rows, self._review_append_start = None, 0, None
 
                 print(f"--- '{review_sheet_name}' 후처리 완료: {len(self.company_review_df)}개 리뷰 ---")
 
                 # 2. 기업 데이터 로딩 및 통합
                 print("--- 기업 데이터 통합 시작 ('기업목록_데이터' 우선) ---")
-                new_data_sheet = safe_get_dataframe_legacy(spreadsheet.worksheet("기업목록_데이터"))
-                base_data_sheet = safe_get_dataframe_legacy(spreadsheet.worksheet("기업목록"))
+                new_data_sheet = safe_get_dataframe_legacy(values["기업목록_데이터"], "기업목록_데이터")
+                base_data_sheet = safe_get_dataframe_legacy(values["기업목록"], "기업목록")
 
 
 
@@ -290,9 +630,8 @@ class ReviewAnalyzer:
 
                     # ▼▼▼ [신규 추가] 선호분야 데이터 로딩 ▼▼▼
                 preference_sheet_name = "선호분야"
-                if preference_sheet_name in all_sheet_names:
-                    worksheet = spreadsheet.worksheet(preference_sheet_name)
-                    self.preference_df = safe_get_dataframe_legacy(worksheet)
+                if values[preference_sheet_name] is not None:
+                    self.preference_df = safe_get_dataframe_legacy(values[preference_sheet_name], preference_sheet_name)
                     print(f"--- '{preference_sheet_name}' 로딩 완료: {len(self.preference_df)}개 데이터 ---")
                 else:
                     self.preference_df = pd.DataFrame()
@@ -300,64 +639,66 @@ class ReviewAnalyzer:
                     # ▲▲▲ [추가 완료] ▲▲▲
 
 
-                print("--- 모든 Google Sheets 데이터 로딩 및 통합 완료. ---")
+                # 기업명/평가기관은 category, 평점은 float32로 정리해 메모리를 줄이고 이후 통계 계산의 형 변환을 없앱니다.
+                memory_before += memory_usage(self.preference_df, *self.unified_profiles.values())
+                normalize_profiles(self.unified_profiles)
+                normalize_preferences(self.preference_df)
+                memory_after = memory_usage(self.company_review_df, self.preference_df, *self.unified_profiles.values())
+                print(f"--- 데이터 형식 정리: 메모리 {memory_before / 2 ** 20:.1f} MB -> {memory_after / 2 ** 20:.1f} MB ---")
+                # 모든 기업의 평가기관별/출처별 평점 통계와 협업 선호도를 한 번에 계산해 둡니다. ('base' 프로필 기업 = 동료기업)
+                base_profiles = self.unified_profiles.get('base')
+                self.review_stats = ReviewStatsTable.build(self.company_review_df, base_profiles.index if base_profiles is not None else [],
+                                                           self.preference_df)
+                self._update_review_keywords()
+
+                print(f"--- 모든 데이터 로딩 및 통합 완료 (소스: {self.data_source.name}). ---")
+                self.data_revision, self.data_verified = revision, verified
+                if build_indexes: self.build_derived_indexes()
                 return
 
             except Exception as e:
                 # ... (예외 처리 로직은 기존과 동일) ...
                 print(f"  - 예상치 못한 오류 발생 (시도 {attempt + 1}/{MAX_RETRIES}): {e}")
+                # API 일시 오류는 fetch 단계에서 이미 백오프로 재시도하므로, 여기서는 잠시 쉬었다가 전체를 다시 시도합니다.
+                if attempt + 1 < MAX_RETRIES: time.sleep(RETRY_DELAY)
+
+    def get_company_analysis(self, company_name):
+        """
+        기업 분석 화면에 필요한 (카테고리 분포, 리뷰 목록, 외부기관 요약, 동료기업 요약, 협업 선호도 요약, 키워드 요약)을 반환합니다.
+        같은 데이터 버전에서 다시 연 기업(결과 화면에서 돌아온 경우 포함)은 캐시된 결과를 그대로 사용합니다.
+        """
+        return self.analysis_cache.get(company_name, self._analyze_company)
+
+    def _analyze_company(self, company_name):
+        graph_data = self.get_yearly_category_distribution(company_name)
+
+        # 리뷰를 유형별로 분리해 통계 요약 생성
+        ext_reviews, peer_reviews = self.get_reviews_by_type(company_name)
+        ext_summary = self.summarize_reviews_statistics(ext_reviews, "외부기관", company_name)
+        peer_summary = self.summarize_reviews_statistics(peer_reviews, "동료기업", company_name)
+
+        # 협업 선호도, 키워드 요약과 상세 목록
+        return (graph_data, self.get_reviews_for_company(company_name), ext_summary, peer_summary,
+                self.get_preference_summary(company_name), self.summarize_reviews(company_name))
 
     def get_reviews_for_company(self, company_name):
         """
         [최종 강화본] 리뷰 출처를 '외부기관'과 고유하게 익명화된 '동료기업'으로
-        완벽하게 구분하고 상세 정보를 포함하여 반환합니다.
+        완벽하게 구분하고, 상세 목록에 바로 넣을 (year, source, rating, sentiment, review) 튜플 목록으로 반환합니다.
+        (외부기관 리뷰 다음에 동료기업 리뷰, 동료기업 목록은 로딩 시 정리해 둔 'base' 프로필 기업 목록을 사용)
         """
-        if self.company_review_df.empty or '대상기업' not in self.company_review_df.columns:
+        if is_empty(self.company_review_df) or '대상기업' not in self.company_review_df.columns:
             print("--- get_reviews_for_company: 리뷰 데이터가 없거나 '대상기업' 컬럼이 없습니다. ---")
             return []
 
-        target_reviews = self.company_review_df[self.company_review_df['대상기업'] == company_name].copy()
+        target_reviews = self._company_reviews(company_name)
         if target_reviews.empty:
             print(f"--- get_reviews_for_company: '{company_name}'에 대한 리뷰가 없습니다. ---")
             return []
 
-        # 전체 기업 목록을 한 번만 생성하여 효율적으로 사용합니다.
-        all_enterprise_names = set()
-        for profile in self.unified_profiles.values():
-            all_enterprise_names.update(profile.index.tolist())
-
-        display_reviews = []
-
-        # ▼▼▼▼▼ [핵심 수정: 동료기업 익명화 로직 추가] ▼▼▼▼▼
-        peer_anonymizer = {}  # 동료 기업의 실제 이름을 익명화된 이름에 매핑하는 딕셔너리
-        peer_counter = 1  # 익명화 번호 카운터
-
-        for _, row in target_reviews.iterrows():
-            # 'nan' 또는 빈 값을 '정보 없음'으로 처리
-            reviewer = row.get('평가기관')
-            if pd.isna(reviewer) or not str(reviewer).strip():
-                reviewer = '정보 없음'
-
-            if reviewer in all_enterprise_names:
-                # 동료 기업의 리뷰인 경우, 고유하게 익명화합니다.
-                if reviewer not in peer_anonymizer:
-                    # 처음 보는 동료 기업이면, 새로운 익명 ID를 부여합니다.
-                    peer_anonymizer[reviewer] = f"동료기업 {peer_counter}"
-                    peer_counter += 1
-                source_text = peer_anonymizer[reviewer]
-            else:
-                # 외부 기관의 리뷰
-                source_text = f"외부기관: {reviewer}"
-            # ▲▲▲▲▲ [수정 완료] ▲▲▲▲▲
-
-            review_data = {
-                'year': str(row.get('year', '미상')).replace('.0', ''),
-                'source': source_text,
-                'rating': row.get('평점', '정보 없음'),
-                'review': row.get('평가내용', '내용 없음')
-            }
-            display_reviews.append(review_data)
-
+        peer_names = self.review_stats.peer_names if self.review_stats is not None else []
+        display_reviews = build_display_rows(target_reviews, peer_names, external_prefix='외부기관: ', missing_rating='정보 없음',
+                                             missing_review='내용 없음', peers_last=True)
         print(f"--- get_reviews_for_company: '{company_name}'에 대한 {len(display_reviews)}개 리뷰 처리 완료 ---")
         return display_reviews
 
@@ -366,20 +707,18 @@ class ReviewAnalyzer:
         [오류 수정] '대상기업' 열이 없는 경우를 대비하여, 리뷰 분석을
         안전하게 건너뛰도록 수정한 최종 버전입니다.
         """
-        from sentence_transformers import util
-        import torch
-
-        if not self.sbert_model or not self.enterprise_category_embeddings:
+        if not self.sbert_model or not self.enterprise_category_scorer:
             print("오류: 기업 분석 모델이 로드되지 않았습니다.");
             return {}
+        if self.category_distribution is not None:
+            return self.category_distribution.lookup(company_name)
 
-        yearly_distribution = {}
-        CAT_WEIGHTS = {'1순위 분류': 1.5, '2순위 분류': 1.2, '3순위 분류': 1.0}
-        KEYWORD_WEIGHT = 0.5
-        REVIEW_WEIGHT = 1.0
+        yearly_distribution, yearly_raw_scores, review_vectors = {}, {}, {}
+        CAT_WEIGHTS = self.DISTRIBUTION_CAT_WEIGHTS
+        KEYWORD_WEIGHT = self.DISTRIBUTION_KEYWORD_WEIGHT
+        REVIEW_WEIGHT = self.DISTRIBUTION_REVIEW_WEIGHT
 
-        profile_keys = sorted([k for k in self.unified_profiles.keys() if str(k).isdigit()], key=int, reverse=True)
-        if 'base' in self.unified_profiles: profile_keys.append('base')
+        profile_keys = self._distribution_year_keys()
 
         for year_key in profile_keys:
             profile_df = self.unified_profiles.get(year_key)
@@ -402,106 +741,81 @@ class ReviewAnalyzer:
                 for cat in category_raw_scores:
                     if cat in keywords_text: category_raw_scores[cat] += KEYWORD_WEIGHT
 
-            # 3. 리뷰 기반 점수 계산 (오류 수정 적용)
-            reviews_for_analysis = pd.DataFrame()
-
-            # ▼▼▼▼▼ [핵심 오류 수정] ▼▼▼▼▼
+            # 3. 리뷰 기반 점수 계산 (저장된 리뷰별 임베딩을 평균 내어 사용하므로 다시 인코딩하지 않습니다)
             # '대상기업' 열이 있는지 먼저 확인하여 KeyError를 원천적으로 방지합니다.
             if '대상기업' in self.company_review_df.columns and '평가내용' in self.company_review_df.columns:
                 year_to_filter = int(year_key) if str(year_key).isdigit() else None
+                review_vector = None
 
                 if year_to_filter and 'year' in self.company_review_df.columns:
-                    reviews_for_analysis = self.company_review_df[
-                        (self.company_review_df['대상기업'] == company_name) &
-                        (self.company_review_df['year'] == year_to_filter)
-                        ]
+                    review_vector = self._aggregate_review_embedding(self._company_review_rows(company_name, year_to_filter))
 
-                if reviews_for_analysis.empty:
+                if review_vector is None:
                     print(f"  - '{year_for_display}'년도 특정 리뷰 없음. '{company_name}'의 전체 리뷰로 분석합니다.")
-                    reviews_for_analysis = self.company_review_df[self.company_review_df['대상기업'] == company_name]
+                    review_vector = self._aggregate_review_embedding(self._company_review_rows(company_name))
+                if review_vector is not None:
+                    review_vectors[year_key] = review_vector
             else:
                 print("  - 경고: '기업리뷰_데이터' 시트에 '대상기업' 또는 '평가내용' 컬럼이 없어 리뷰 분석을 건너뜁니다.")
-            # ▲▲▲▲▲ [수정 완료] ▲▲▲▲▲
-
-            review_text_corpus = ' '.join(
-                reviews_for_analysis['평가내용'].dropna()) if not reviews_for_analysis.empty else ""
-            if review_text_corpus.strip():
-                corpus_embedding = self.sbert_model.encode(review_text_corpus, convert_to_tensor=True)
-                review_sim_scores = {cat: util.cos_sim(corpus_embedding, cat_emb).item() for cat, cat_emb in
-                                     self.enterprise_category_embeddings.items()}
-                for cat, sim_score in review_sim_scores.items():
-                    if sim_score > 0.1:
-                        category_raw_scores[cat] += sim_score * REVIEW_WEIGHT
-
-            # 4. 최종 점수 정규화 (기존과 동일)
+            yearly_raw_scores[year_key] = category_raw_scores
+
+        # 연도별 리뷰 대표 벡터의 카테고리 유사도를 행렬 연산 한 번으로 계산합니다.
+        if review_vectors:
+            review_sim_scores = self.enterprise_category_scorer.score(np.vstack(list(review_vectors.values())))
+            review_bonus = np.where(review_sim_scores > 0.1, review_sim_scores * REVIEW_WEIGHT, 0.0)
+            for year_key, bonus_row in zip(review_vectors, review_bonus):
+                for cat, bonus in zip(self.enterprise_category_scorer.categories, bonus_row):
+                    yearly_raw_scores[year_key][cat] += float(bonus)
+
+        # 4. 최종 점수 정규화 (기존과 동일)
+        for year_key, category_raw_scores in yearly_raw_scores.items():
             total_raw_score = sum(category_raw_scores.values())
             if total_raw_score > 0:
                 yearly_distribution[year_key] = {cat: score / total_raw_score for cat, score in
                                                  category_raw_scores.items()}
-                print(f"  - 최종 분포 계산 완료.")
             else:
-                print(f"  - 분석할 데이터가 없어 건너뜁니다.")
+                print(f"  - '{year_key}' 분석할 데이터가 없어 건너뜁니다.")
+        print(f"  - 최종 분포 계산 완료: {len(yearly_distribution)}개 연도")
 
         return yearly_distribution
 
     def summarize_reviews(self, company_name, top_n=5):
         """
-        [신규 기능] 지정된 기업의 모든 리뷰를 요약하여 핵심 키워드를 반환합니다.
+        [신규 기능] 지정된 기업 리뷰의 특징 키워드를 반환합니다.
+        로딩 시 전체 리뷰로 만든 TF-IDF 키워드 색인(조사 제거, 기업별 단어 빈도)에서 해당 기업의 행만 조회하므로,
+        여러 기업 리뷰에 두루 나오는 단어보다 이 기업 리뷰에서 두드러지는 단어가 먼저 나옵니다.
         """
-        if self.company_review_df.empty or '대상기업' not in self.company_review_df.columns:
+        if is_empty(self.company_review_df) or '대상기업' not in self.company_review_df.columns:
             return "요약할 리뷰 데이터가 없습니다."
 
-        target_reviews = self.company_review_df[self.company_review_df['대상기업'] == company_name]
-        if target_reviews.empty:
+        if not len(self._company_review_rows(company_name)):
             return f"'{company_name}'에 대한 리뷰가 없어 요약할 수 없습니다."
 
-        # 리뷰 텍스트를 하나로 합침
-        full_text = ' '.join(target_reviews['평가내용'].dropna())
-        if not full_text.strip():
-            return "리뷰 내용은 있지만, 텍스트가 비어있어 요약할 수 없습니다."
-
-        # 간단한 키워드 추출 (2글자 이상 단어, 빈도수 기반)
-        # 실제 사용 시에는 형태소 분석기(e.g., konlpy)를 사용하면 품질이 향상됩니다.
-        words = [word for word in full_text.split() if len(word) >= 2]
-        if not words:
-            return "유의미한 키워드를 찾을 수 없습니다."
-
-        most_common_words = Counter(words).most_common(top_n)
-        keywords = [word for word, count in most_common_words]
-
+        if self.review_keywords is None or not self.review_keywords.matches(self.company_review_df):
+            self._update_review_keywords()
+        keywords = [word for word, count in self.review_keywords.top_keywords(company_name, top_n)]
         if not keywords:
-            return "핵심 키워드를 추출하지 못했습니다."
+            target_reviews = self._company_reviews(company_name)
+            if '평가내용' not in target_reviews.columns or not target_reviews['평가내용'].dropna().astype(str).str.strip().any():
+                return "리뷰 내용은 있지만, 텍스트가 비어있어 요약할 수 없습니다."
+            return "유의미한 키워드를 찾을 수 없습니다."
 
-        return f"리뷰에서 자주 언급된 키워드는 '{', '.join(keywords)}' 입니다."
+        return f"리뷰에서 두드러지는 키워드는 '{', '.join(keywords)}' 입니다."
 
     def search_companies_by_keyword(self, keyword, top_n=10):
         """ [최종 수정본] 키워드와 가장 관련성 높은 기업을 SBERT 유사도 기준으로 검색합니다. """
-        from sentence_transformers import util
-
         if not self.sbert_model: return []
 
-        latest_year = 'base'
-        if any(isinstance(k, int) for k in self.unified_profiles.keys()):
-            latest_year = max(k for k in self.unified_profiles.keys() if isinstance(k, int))
-
-        if latest_year not in self.unified_profiles:
+        if self.company_search_index is None: self._build_company_search_index()
+        index = self.company_search_index
+        if not index:
             print("--- 키워드 검색: 분석할 기업 프로필 데이터가 없습니다. ---")
             return []
 
-        latest_profiles = self.unified_profiles[latest_year].reset_index()
-        # ▼▼▼ [수정] 컬럼명을 실제 데이터와 일치시킴 ▼▼▼
-        latest_profiles['corpus'] = latest_profiles['사업내용'].fillna('') + ' ' + \
-                                    latest_profiles['키워드'].fillna('') + ' ' + \
-                                    latest_profiles['1순위 분류'].fillna('') + ' ' + \
-                                    latest_profiles['2순위 분류'].fillna('')
-
-        keyword_embedding = self.sbert_model.encode(keyword, convert_to_tensor=True)
-        corpus_embeddings = self.sbert_model.encode(latest_profiles['corpus'].tolist(), convert_to_tensor=True)
-        cos_scores = util.cos_sim(keyword_embedding, corpus_embeddings)[0]
-
-        results = [{"company": name, "score": score.item()} for name, score in
-                   zip(latest_profiles['company_name'], cos_scores)]
-        return sorted(results, key=lambda x: x['score'], reverse=True)[:top_n]
+        # 기업 임베딩은 캐시된 것을 쓰고, 검색어만 인코딩하여 벡터 인덱스(정확/근사)에서 상위 top_n개를 찾습니다.
+        keyword_embedding = self._get_query_embedding(keyword)
+        top_indices, cos_scores = index['vectors'].search(keyword_embedding, top_n)
+        return [{"company": index['names'][i], "score": float(score)} for i, score in zip(top_indices, cos_scores)]
 
     def get_location_id_from_tripadvisor(self, spot_name):
         """ 트립어드바이저 Location ID를 검색합니다. """
@@ -581,7 +895,7 @@ class ReviewAnalyzer:
         try:
             print("  - [1단계] Knowledge Panel에서 Place ID를 탐색합니다.")
             params = {"engine": "google", "q": precise_query, "api_key": self.SERPAPI_API_KEY, "hl": "ko"}
-            results = GoogleSearch(params).get_dict()
+            results = serpapi.GoogleSearch(params).get_dict()
             if "knowledge_graph" in results and results.get("knowledge_graph", {}).get("place_id"):
                 place_id = results["knowledge_graph"]["place_id"]
                 print(f"  - 성공 (Knowledge Panel): Place ID '{place_id}'를 찾았습니다.")
@@ -592,7 +906,7 @@ class ReviewAnalyzer:
         try:
             print("  - [2단계] Google Maps API에서 Place ID를 탐색합니다.")
             params = {"engine": "google_maps", "q": precise_query, "api_key": self.SERPAPI_API_KEY, "hl": "ko"}
-            results = GoogleSearch(params).get_dict()
+            results = serpapi.GoogleSearch(params).get_dict()
             if "local_results" in results and results["local_results"] and results["local_results"][0].get("place_id"):
                 place_id = results["local_results"][0]["place_id"]
                 print(f"  - 성공 (Maps Local): Place ID '{place_id}'를 찾았습니다.")
@@ -614,7 +928,7 @@ class ReviewAnalyzer:
 
         all_reviews_data = []
         params = {"engine": "google_maps_reviews", "place_id": place_id, "hl": "ko", "api_key": self.SERPAPI_API_KEY}
-        search = GoogleSearch(params)
+        search = serpapi.GoogleSearch(params)
 
         while True:
             try:
@@ -642,34 +956,23 @@ class ReviewAnalyzer:
 
     def _classify_reviews_by_similarity(self, all_reviews, threshold=0.4):
         """ 범용 SBERT 모델로 리뷰와 카테고리 간 유사도를 계산하여 분류합니다. """
-        from sentence_transformers import util
-        import torch
-
-        if not self.sbert_model or not self.tourist_category_embeddings:
+        if not self.sbert_model or not self.tourist_category_scorer:
             print("오류: 유사도 분석 모델이 로드되지 않았습니다.")
             return []
 
-        classified_results = []
-        review_texts = [review.get('text', '') for review in all_reviews if review.get('text', '').strip()]
-        if not review_texts: return []
+        valid_reviews = [review for review in all_reviews if review.get('text', '').strip()]
+        if not valid_reviews: return []
 
-        review_embeddings = self.sbert_model.encode(review_texts, convert_to_tensor=True)
-        for i, review_data in enumerate(filter(lambda r: r.get('text', '').strip(), all_reviews)):
-            review_embedding = review_embeddings[i]
-            scores = {cat: util.cos_sim(review_embedding, emb).max().item() for cat, emb in
-                      self.tourist_category_embeddings.items()}
-            best_category = max(scores, key=scores.get) if scores and max(scores.values()) >= threshold else '기타'
-            classified_results.append({'review': review_data.get('text'), 'source': review_data.get('source', '알 수 없음'),
-                                       'category': best_category})
-        return classified_results
+        # 모든 리뷰를 한 번에 인코딩하고, (리뷰 x 카테고리) 점수를 행렬 연산 한 번으로 계산합니다.
+        review_embeddings = self.sbert_model.encode([review['text'] for review in valid_reviews], convert_to_numpy=True)
+        categories, _, _ = self.tourist_category_scorer.classify(review_embeddings, threshold=threshold, fallback='기타')
+        return [{'review': review_data.get('text'), 'source': review_data.get('source', '알 수 없음'), 'category': category}
+                for review_data, category in zip(valid_reviews, categories)]
 
     def classify_reviews(self, all_reviews):
-        """ 파인튜닝된 AI 모델을 로드하여 리뷰를 분류합니다. """
-        from transformers import pipeline
-        import torch
-
-        model_path = resource_path('my_review_classifier')
-        if not os.path.exists(model_path):
+        """ 상주 중인 파인튜닝 AI 모델로 리뷰를 분류합니다. (모델은 최초 1회만 로드됩니다) """
+        model_path = self.review_classifier.model_path
+        if not self.review_classifier.is_available():
             print(f"경고: 파인튜닝된 모델 폴더('{model_path}')를 찾을 수 없습니다. 유사도 기반 분류로 전환합니다.")
             return self._classify_reviews_by_similarity(all_reviews)
 
@@ -678,9 +981,7 @@ class ReviewAnalyzer:
         if not review_texts: return []
 
         try:
-            device = 0 if torch.cuda.is_available() else -1
-            classifier = pipeline('text-classification', model=model_path, device=device)
-            predictions = classifier(review_texts, truncation=True)
+            predictions = self.review_classifier.predict(review_texts)
         except Exception as e:
             print(f"오류: AI 파이프라인 생성 또는 예측 중 오류 발생: {e}. 유사도 기반으로 전환합니다.")
             return self._classify_reviews_by_similarity(all_reviews)
@@ -699,8 +1000,6 @@ class ReviewAnalyzer:
 
     def classify_all_companies_for_tourist_spots(self):
         """ 모든 기업의 '사업내용'을 *관광지 카테고리*와 비교하여 미리 분류합니다. """
-        from sentence_transformers import util
-
         if self.unified_profiles and max(self.unified_profiles.keys()):
             latest_year = max(self.unified_profiles.keys())
             company_df = self.unified_profiles[latest_year].reset_index()
@@ -708,25 +1007,14 @@ class ReviewAnalyzer:
             return
 
         if company_df.empty or 'description' not in company_df.columns: return
-        if not self.sbert_model or not self.tourist_category_embeddings:
+        if not self.sbert_model or not self.tourist_category_scorer:
             print("경고: 기업-관광지 연계 분류에 필요한 AI 모델이 로드되지 않았습니다.");
             return
 
         print("\n--- 기업-관광지 연계 사전 분류 시작 ---")
         company_df['description'] = company_df['description'].fillna('')
-        business_embeddings = self.sbert_model.encode(company_df['description'].tolist(), convert_to_tensor=True)
-
-        categories, scores = [], []
-        for emb in business_embeddings:
-            sim_scores = {cat: util.cos_sim(emb, cat_emb).max().item() for cat, cat_emb in
-                          self.tourist_category_embeddings.items()}
-            if not sim_scores:
-                best_cat, best_score = '기타', 0
-            else:
-                best_cat, best_score = max(sim_scores, key=sim_scores.get), sim_scores[
-                    max(sim_scores, key=sim_scores.get)]
-            categories.append(best_cat)
-            scores.append(best_score)
+        business_embeddings = self.sbert_model.encode(company_df['description'].tolist(), convert_to_numpy=True)
+        categories, scores, _ = self.tourist_category_scorer.classify(business_embeddings)
 
         company_df['best_tourist_category'] = categories
         company_df['tourist_category_score'] = scores
@@ -737,17 +1025,13 @@ class ReviewAnalyzer:
         """
         [신규 기능] 선택된 기업에 대한 리뷰를 '외부기관'과 익명화된 '동료기업'으로 분리합니다.
         """
-        if self.company_review_df.empty or '평가기관' not in self.company_review_df.columns:
+        if is_empty(self.company_review_df) or '평가기관' not in self.company_review_df.columns:
             return pd.DataFrame(), pd.DataFrame()
 
-        # 'base' 프로필에 모든 기업 목록이 통합되어 있다는 가정
-        base_profiles = self.unified_profiles.get('base')
-        if base_profiles is None or base_profiles.empty:
-            all_internal_companies = []
-        else:
-            all_internal_companies = base_profiles.index.tolist()
+        # 'base' 프로필에 모든 기업 목록이 통합되어 있다는 가정 (로딩 시 통계표와 함께 정리해 둔 목록을 사용)
+        all_internal_companies = self.review_stats.peer_names if self.review_stats is not None else []
 
-        target_reviews = self.company_review_df[self.company_review_df['대상기업'] == company_name].copy()
+        target_reviews = self._company_reviews(company_name).copy()
         if target_reviews.empty:
             return pd.DataFrame(), pd.DataFrame()
 
@@ -771,43 +1055,37 @@ class ReviewAnalyzer:
         if not hasattr(self, 'preference_df') or self.preference_df.empty:
             return ["협업 선호도 데이터가 없습니다. ('선호분야' 시트 확인)"]
 
-        prefs_df = self.preference_df[self.preference_df['평가기업명'] == company_name]
-        if prefs_df.empty:
+        if self.review_stats is None or not self.review_stats.preference_count(company_name):
             return [f"'{company_name}'의 협업 선호도 평가 기록이 없습니다."]
 
+        # 로딩 시 계산해 둔 평가대상기관별 통계를 조회만 합니다.
         summary = []
-        for target, group in prefs_df.groupby('평가대상기관'):
-            total = len(group)
-            # '평점' 열이 문자열일 수 있으므로 숫자로 변환
-            pos = len(group[pd.to_numeric(group['평점'], errors='coerce') >= 4])
-            ratio = (pos / total) * 100 if total > 0 else 0
-            summary.append(f"🤝 '{target}'과의 협업을 {ratio:.0f}% 긍정적으로 평가했습니다.")
+        for row in self.review_stats.preference_targets(company_name).itertuples(index=False):
+            ratio = (row.positive / row.count) * 100 if row.count > 0 else 0
+            summary.append(f"🤝 '{row.평가대상기관}'과의 협업을 {ratio:.0f}% 긍정적으로 평가했습니다.")
         return summary
 
     def summarize_reviews_statistics(self, reviews_df, reviewer_type, target_company):
         """
-        [신규 기능] 주어진 리뷰 DF의 통계를 문장 리스트로 요약합니다.
+        [신규 기능] 주어진 리뷰 DF(get_reviews_by_type 결과)의 통계를 문장 리스트로 요약합니다.
+        통계는 로딩 시 모든 기업에 대해 계산해 둔 통계표(review_stats)에서 target_company의 행만 조회합니다.
         """
-        if reviews_df.empty:
+        if reviews_df.empty or self.review_stats is None:
             return []
 
         summary = []
-        # 평점 데이터 처리
-        reviews_df['평점'] = pd.to_numeric(reviews_df['평점'], errors='coerce')
-        valid_reviews = reviews_df.dropna(subset=['평점'])
-        if valid_reviews.empty:
+        source = self.review_stats.source(target_company, peer=(reviewer_type == '동료기업'))
+        if not source['rated']:
             return [f"'{reviewer_type}'의 유효한 평점 데이터가 없습니다."]
 
         if reviewer_type == '외부기관':
-            for evaluator, group in valid_reviews.groupby('평가기관'):
-                total, pos, avg_score = len(group), len(group[group['평점'] >= 4]), group['평점'].mean()
-                ratio = (pos / total) * 100 if total > 0 else 0
-                summary.append(f"🏢 '{evaluator}'의 {ratio:.0f}%가 긍정 평가 (평균 {avg_score:.1f}점).")
+            for row in self.review_stats.evaluators(target_company, peer=False).itertuples(index=False):
+                if not row.rated: continue
+                ratio = (row.positive / row.rated) * 100
+                summary.append(f"🏢 '{row.평가기관}'의 {ratio:.0f}%가 긍정 평가 (평균 {mean_rating(row._asdict()):.1f}점).")
         elif reviewer_type == '동료기업':
-            total, pos, avg_score = len(valid_reviews), len(valid_reviews[valid_reviews['평점'] >= 4]), valid_reviews[
-                '평점'].mean()
-            ratio = (pos / total) * 100 if total > 0 else 0
-            summary.append(f"👥 '동료기업'들의 {ratio:.0f}%가 긍정 평가 (평균 {avg_score:.1f}점).")
+            ratio = (source['positive'] / source['rated']) * 100
+            summary.append(f"👥 '동료기업'들의 {ratio:.0f}%가 긍정 평가 (평균 {mean_rating(source):.1f}점).")
         return summary
 
     def judge_sentiment_by_rating(self, rating):
@@ -982,37 +1260,41 @@ class AutocompleteEntry(tk.Frame):
 
 
 class MainPage(tk.Frame):
+    # 로딩 현황에 표시할 리소스 이름
+    RESOURCE_LABELS = {'spots': "관광지 목록", 'model': "AI 모델", 'data': "시트 데이터", 'search_index': "검색 인덱스"}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
 
-        # 로딩 상태를 표시할 레이블
-        self.loading_label = tk.Label(self, text="분석 데이터 로딩 중...", font=("Helvetica", 18, "bold"))
-        self.loading_label.pack(expand=True)
-
-        # 메인 컨텐츠를 담을 프레임 (초기에는 숨김)
+        # 메인 컨텐츠를 담을 프레임
         self.main_content_frame = tk.Frame(self)
 
         tk.Label(self.main_content_frame, text="리뷰 기반 관광-기업 분석기", font=("Helvetica", 22, "bold")).pack(pady=50)
 
-        # 페이지 이동 버튼들
-        tk.Button(self.main_content_frame, text="기업 검색", font=("Helvetica", 16), width=20, height=3,
-                  command=lambda: controller.show_company_search_page()).pack(pady=15)
-
-        tk.Button(self.main_content_frame, text="관광지 검색", font=("Helvetica", 16), width=20, height=3,
-                  command=lambda: controller.show_tourist_spot_page()).pack(pady=15)
-
-        tk.Button(self.main_content_frame, text="키워드 검색", font=("Helvetica", 16), width=20, height=3,
-                  command=lambda: controller.show_frame("KeywordSearchPage")).pack(pady=15)
+        # 페이지 이동 버튼들 (각 버튼은 해당 기능에 필요한 리소스가 준비되면 활성화됩니다)
+        self.feature_buttons = {}
+        for feature, text, command in [('company', "기업 검색", controller.show_company_search_page),
+                                       ('tourist', "관광지 검색", controller.show_tourist_spot_page),
+                                       ('keyword', "키워드 검색", lambda: controller.show_frame("KeywordSearchPage"))]:
+            button = tk.Button(self.main_content_frame, text=text, font=("Helvetica", 16), width=20, height=3,
+                               state='disabled', command=command)
+            button.pack(pady=15)
+            self.feature_buttons[feature] = button
 
-    def show_loading_screen(self):
-        self.loading_label.pack(expand=True)
-        self.main_content_frame.pack_forget()
+        # 리소스별 로딩 현황을 표시할 레이블
+        self.status_label = tk.Label(self.main_content_frame, text="", font=("Helvetica", 10), fg='gray')
+        self.status_label.pack(pady=10)
 
     def show_main_content(self):
-        self.loading_label.pack_forget()
         self.main_content_frame.pack(expand=True, fill='both')
 
+    def update_readiness(self, readiness, feature_requirements):
+        """리소스 준비 상태에 따라 기능 버튼을 활성화하고, 로딩 현황을 표시합니다."""
+        for feature, button in self.feature_buttons.items():
+            button.config(state='normal' if readiness.is_ready(*feature_requirements[feature]) else 'disabled')
+        self.status_label.config(text="  |  ".join(f"{label}: {readiness.state(name)}" for name, label in self.RESOURCE_LABELS.items()))
+
 
 class KeywordSearchPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -1096,12 +1378,6 @@ class CompanySearchPage(tk.Frame):
         super().__init__(parent)
         self.controller = controller
 
-        # 필요한 라이브러리를 클래스 생성 시점에 self에 할당
-        from matplotlib.figure import Figure
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        import numpy as np
-        self.Figure, self.FigureCanvasTkAgg, self.np = Figure, FigureCanvasTkAgg, np
-
         # --- 상단 컨트롤 프레임 ---
         top_frame = tk.Frame(self)
         top_frame.pack(pady=10, padx=20, fill='x')
@@ -1138,7 +1414,8 @@ class CompanySearchPage(tk.Frame):
         # 1. 상단: 그래프 영역
         graph_frame = ttk.LabelFrame(paned_window, text="연도별 사업 카테고리 변화", padding=10)
         paned_window.add(graph_frame, weight=3)
-        # ... (그래프 위젯 생성 코드는 기존과 동일) ...
+        # 그래프 위젯(matplotlib)은 처음 그릴 때 만듭니다.
+        self.graph_frame, self.fig, self.ax, self.canvas = graph_frame, None, None, None
 
         # 2. 중간-1: 리뷰 통계 요약 (신규 추가)
         stats_summary_frame = ttk.LabelFrame(paned_window, text="리뷰 통계 요약", padding=10)
@@ -1196,18 +1473,19 @@ class CompanySearchPage(tk.Frame):
 
     def refresh_data(self):
         self.status_label.config(text="상태: 구글 시트 정보 새로고침 중...")
-        threading.Thread(target=self._refresh_thread, daemon=True).start()
+        self.controller.refresh_data()
 
-    def _refresh_thread(self):
-        self.controller.analyzer.load_and_unify_data_sources()
-        self.after(0, self.update_company_list)
-        self.after(0, self.status_label.config, {"text": ""})
+    def on_data_ready(self):
+        """시트 데이터가 (다시) 준비되면 기업 목록을 갱신하고 새로고침 상태 표시를 지웁니다."""
+        self.update_company_list()
+        self.status_label.config(text="")
 
     def show_company_analysis(self, event=None):
         company_name = self.company_entry.get()
         if not company_name: return
 
         self.status_label.config(text=f"'{company_name}' 종합 분석 중...")
+        self._ensure_graph()
         self.ax.clear()
         self.ax.set_title(f"'{company_name}' 분석 데이터 로딩 중...")
         self.canvas.draw()
@@ -1220,48 +1498,15 @@ class CompanySearchPage(tk.Frame):
         threading.Thread(target=self._analysis_thread, args=(company_name,), daemon=True).start()
 
     def _analysis_thread(self, company_name):
-        """ 백그라운드 분석 스레드 (요약 기능 호출 추가) """
+        """ 백그라운드 분석 스레드 (같은 데이터 버전에서 이미 분석한 기업은 캐시된 결과 사용) """
         try:
-            analyzer = self.controller.analyzer
-            graph_data = analyzer.get_yearly_category_distribution(company_name)
-
-            # 리뷰를 유형별로 분리
-            ext_reviews, peer_reviews = analyzer.get_reviews_by_type(company_name)
-
-            # 통계 요약 생성
-            ext_summary = analyzer.summarize_reviews_statistics(ext_reviews, "외부기관", company_name)
-            peer_summary = analyzer.summarize_reviews_statistics(peer_reviews, "동료기업", company_name)
-
-            # 협업 선호도 요약 생성
-            pref_summary = analyzer.get_preference_summary(company_name)
-
-            # 키워드 요약 생성
-            keyword_summary = analyzer.summarize_reviews(company_name)  # 기존 summarize_reviews 함수
-
-            # 모든 리뷰를 합쳐서 목록에 표시
-            all_reviews_for_display = self._prepare_reviews_for_display(ext_reviews, peer_reviews)
-
-            self.after(0, self._update_ui, company_name, graph_data, all_reviews_for_display, ext_summary, peer_summary,
-                       pref_summary, keyword_summary)
+            results = self.controller.analyzer.get_company_analysis(company_name)
+            self.after(0, self._update_ui, company_name, *results)
         except Exception as e:
             import traceback
             traceback.print_exc()
             self.after(0, self.status_label.config, {"text": f"분석 오류: {e}"})
 
-    def _prepare_reviews_for_display(self, ext_df, peer_df):
-        """ 상세 목록에 표시할 리뷰 데이터 리스트를 준비합니다. """
-        reviews_list = []
-        analyzer = self.controller.analyzer
-        for _, row in pd.concat([ext_df, peer_df]).iterrows():
-            reviews_list.append({
-                'year': row.get('연도', '미상'),
-                'source': row.get('평가기관', '정보 없음'),
-                'rating': row.get('평점', '정보 없음'),
-                'sentiment': analyzer.judge_sentiment_by_rating(row.get('평점')),  # 감성 판단
-                'review': row.get('평가내용', '내용 없음')
-            })
-        return reviews_list
-
         # ▼▼▼ [수정] _update_ui 메서드의 인자 목록을 호출과 일치시킴 ▼▼▼
     def _update_ui(self, company_name, graph_data, review_data, ext_summary, peer_summary, pref_summary,
                        keyword_summary):
@@ -1292,11 +1537,18 @@ class CompanySearchPage(tk.Frame):
         """ 상세 리뷰 목록을 감성 정보 포함하여 업데이트합니다. """
         self.review_tree.delete(*self.review_tree.get_children())
         for review in review_data:
-            self.review_tree.insert('', 'end', values=(
-                review['year'], review['source'], review['rating'], review['sentiment'], review['review']
-            ))
+            self.review_tree.insert('', 'end', values=review)
+
+    def _ensure_graph(self):
+        if self.canvas is not None: return
+        Figure, FigureCanvasTkAgg = load_figure_backend()
+        self.fig = Figure(figsize=(5, 3), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
 
     def _update_graph(self, company_name, yearly_data):
+        self._ensure_graph()
         self.ax.clear()
         # ▼▼▼ [UI 개선] 데이터가 없을 경우의 처리 강화 ▼▼▼
         if not yearly_data:
@@ -1487,15 +1739,27 @@ class DetailPage(tk.Frame):
 # ------------------- 메인 애플리케이션 클래스 (컨트롤러) -------------------
 class TouristApp(tk.Tk):
     """애플리케이션의 메인 컨트롤러 역할을 하는 최상위 클래스입니다."""
-    def __init__(self, api_keys, paths):
+    # 기능별로 필요한 리소스 (MainPage 버튼 활성화 기준)
+    FEATURE_REQUIREMENTS = {'company': ('data',), 'tourist': ('spots',), 'keyword': ('search_index',)}
+
+    def __init__(self, api_keys, paths, model_settings=None):
         super().__init__()
         self.title("관광-기업 리뷰 분석기")
         self.geometry("1000x800")
 
         # Analyzer 인스턴스 생성
-        self.analyzer = ReviewAnalyzer(api_keys, paths)
+        self.analyzer = ReviewAnalyzer(api_keys, paths, model_settings)
         self.analysis_result = {} # 분석 결과를 저장할 변수
 
+        # 리소스는 스레드 풀에서 동시에 로드되며, 검색 인덱스는 모델과 시트 데이터가 모두 준비된 뒤 만들어집니다.
+        # (모든 작업이 끝나면 단계별 소요 시간이 콘솔에 출력됩니다)
+        self.readiness = ReadinessManager(dispatch=lambda fn, *args: self.after(0, fn, *args), max_workers=4)
+        self.readiness.register('spots', self.analyzer.get_tourist_spots_in_busan)
+        self.readiness.register('model', self._load_models)
+        self._data_loaded_once = False
+        self.readiness.register('data', self._load_data)
+        self.readiness.register('search_index', self.analyzer.build_derived_indexes, requires=('model', 'data'))
+
         # 프레임을 담을 컨테이너 생성
         container = tk.Frame(self)
         container.pack(side="top", fill="both", expand=True)
@@ -1510,41 +1774,65 @@ class TouristApp(tk.Tk):
             self.frames[page_name] = frame
             frame.grid(row=0, column=0, sticky="nsew")
 
-        # 초기 로딩 화면 표시
+        # 로딩 팝업 없이 창을 바로 띄우고, 백그라운드에서 리소스를 로드하면서 준비된 기능부터 활성화합니다.
         self.show_frame("MainPage")
-        self.frames["MainPage"].show_loading_screen()
-        # 백그라운드에서 리소스 로딩 시작
-        self._load_resources()
+        self.after_idle(self.start_background_loading)
+        if os.environ.get('STARTUP_PROBE'): self.after_idle(self._report_first_window)
+
+    def _report_first_window(self):
+        """시작 시간 측정(profile_startup.py)용: 첫 창이 화면에 표시되면 표시를 출력하고 종료합니다."""
+        self.wait_visibility()
+        print("FIRST_WINDOW", flush=True)
+        self.destroy()
 
     def show_frame(self, page_name):
         """지정된 이름의 프레임(페이지)을 맨 앞으로 가져옵니다."""
         frame = self.frames[page_name]
         frame.tkraise()
 
-    def _load_resources(self):
-        """리소스 로딩을 위한 별도의 스레드를 시작합니다."""
-        threading.Thread(target=self._load_resources_thread, daemon=True).start()
-
-    def _load_resources_thread(self):
-        """백그라운드에서 모든 데이터를 로딩하는 실제 작업을 수행합니다."""
-        try:
-            # ▼▼▼ [1차 원인 수정] spot_list 변수를 API 호출을 통해 정의합니다. ▼▼▼
-            spot_list = self.analyzer.get_tourist_spots_in_busan()
-            # ▲▲▲ [수정 완료] ▲▲▲
-
-            self.analyzer.load_all_resources()
-
-            # 로딩 완료 후 UI 업데이트는 메인 스레드에서 self.after를 통해 안전하게 호출
-            self.after(0, self.frames["MainPage"].show_main_content)
-            self.after(0, self.frames["CompanySearchPage"].update_company_list)
-            self.after(0, self.frames["TouristSpotPage"].update_autocomplete_list, spot_list)
+    def start_background_loading(self):
+        """리소스 로딩을 시작합니다. 준비 상태가 바뀔 때마다 UI 업데이트는 메인 스레드에서 self.after를 통해 호출됩니다."""
+        self.readiness.add_listener(self._on_resource_state)
+        self.readiness.when_ready(('spots',), lambda: self.frames["TouristSpotPage"].update_autocomplete_list(self.readiness.result('spots') or []))
+        self.readiness.when_ready(('data',), self.frames["CompanySearchPage"].on_data_ready)
+        self.readiness.when_ready(('data',), self._check_sheet_updates)
+        self.frames["MainPage"].show_main_content()
+        self._on_resource_state(None, None, None)
+        self.readiness.start()
+
+    def _on_resource_state(self, name, state, error):
+        self.frames["MainPage"].update_readiness(self.readiness, self.FEATURE_REQUIREMENTS)
+        if state == ReadinessManager.FAILED and name in ('spots', 'model', 'data'):
+            label = MainPage.RESOURCE_LABELS.get(name, name)
+            messagebox.showwarning("로딩 오류", f"'{label}' 로딩에 실패했습니다. 이 리소스가 필요한 기능은 비활성화됩니다.\n\n오류: {error}")
+
+    def _load_models(self):
+        """SBERT 모델과 리뷰 분류 모델을 로드합니다. 검색 인덱스는 시트 데이터가 준비된 뒤 'search_index' 작업에서 만듭니다."""
+        self.analyzer._load_sbert_model(build_indexes=False)
+        self.analyzer._load_review_classifier()
+        if not self.analyzer.sbert_model: raise RuntimeError("AI 모델을 불러오지 못했습니다.")
+
+    def _load_data(self):
+        # 첫 로딩만 로컬 시트 스냅샷을 바로 사용하고, 원격 변경 여부는 준비된 뒤 따로 확인합니다.
+        first_load, self._data_loaded_once = not self._data_loaded_once, True
+        self.analyzer.load_and_unify_data_sources(build_indexes=False, snapshot_first=first_load)
+        if self.analyzer.company_review_df is None: raise RuntimeError("시트 데이터를 불러오지 못했습니다.")
+
+    def _check_sheet_updates(self):
+        """스냅샷으로 시작했다면 원격 시트가 그 뒤 수정되었는지 백그라운드에서 확인하고, 바뀌었으면 데이터를 새로고침합니다."""
+        if self.analyzer.data_verified: return
+        def check():
+            try:
+                if self.analyzer.sheets_changed():
+                    print("--- 원격 시트가 변경되어 데이터를 다시 불러옵니다. ---")
+                    self.after(0, self.frames["CompanySearchPage"].refresh_data)
+            except Exception as e:
+                print(f"경고: 원격 시트 변경 확인 실패 (스냅샷 데이터를 계속 사용합니다): {e}")
+        threading.Thread(target=check, daemon=True).start()
 
-        except Exception as e:
-            # ▼▼▼ [2차 원인 수정] 오류 메시지는 반드시 self.after를 통해 호출해야 합니다. ▼▼▼
-            error_message = f"데이터 로딩 중 심각한 오류가 발생했습니다: {e}"
-            self.after(0, lambda: messagebox.showerror("초기화 오류", error_message))
-            self.after(0, self.destroy)
-            # ▲▲▲ [수정 완료] ▲▲▲
+    def refresh_data(self):
+        """시트 데이터를 다시 불러오고, 이에 의존하는 검색 인덱스도 다시 만듭니다."""
+        self.readiness.reload('data')
 
     def start_full_analysis(self, spot_name, review_count):
         # ▼▼▼ [수정] AI 모델은 self.analyzer에 있습니다. ▼▼▼
@@ -1579,9 +1867,9 @@ class TouristApp(tk.Tk):
     def navigate_to_company_details_from_result(self, company_name):
         page = self.frames["CompanySearchPage"]
         page.toggle_result_back_button(show=True)
-        page.company_var.set(company_name)
-        page.show_company_review()
         self.show_frame("CompanySearchPage")
+        page.company_entry.set(company_name)
+        page.show_company_analysis()
 
     def show_main_page(self):
         """메인 페이지로 돌아가는 함수입니다."""
@@ -1603,9 +1891,10 @@ class TouristApp(tk.Tk):
 
 # ------------------- 프로그램 시작점 -------------------
 if __name__ == "__main__":
-    # 라이브러리 존재 여부 최종 확인
+    # 라이브러리 존재 여부 최종 확인 (실제 import는 기능이 처음 쓰일 때 합니다)
     try:
-        import pandas, gspread, serpapi, oauth2client
+        for name in ('pandas', 'gspread', 'serpapi', 'oauth2client', 'matplotlib', 'requests'):
+            if importlib.util.find_spec(name) is None: raise ModuleNotFoundError(f"No module named '{name}'", name=name)
     except ImportError as e:
         # Tkinter는 기본 라이브러리이므로 이 시점에서 사용 가능
         root = tk.Tk()
@@ -1619,11 +1908,12 @@ if __name__ == "__main__":
         config.read(resource_path('config.ini'), encoding='utf-8')
         api_keys = dict(config.items('API_KEYS'))
         paths = dict(config.items('PATHS'))
+        model_settings = dict(config.items('MODEL')) if config.has_section('MODEL') else {}
     except Exception as e:
         root = tk.Tk()
         root.withdraw()
         messagebox.showerror("설정 오류", f"config.ini 파일 로드에 실패했습니다.\n파일이 실행파일과 같은 위치에 있는지 확인해주세요.\n\n오류: {e}")
         sys.exit()
 
-    app = TouristApp(api_keys, paths)
+    app = TouristApp(api_keys, paths, model_settings)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,390 @@
+import os
+import json
+import hashlib
+import threading
+
+import numpy as np
+
+
+# ===================================================================
+# 추론 백엔드 선택 (config.ini [MODEL] inference_backend = torch | onnx)
+# ===================================================================
+SUPPORTED_BACKENDS = ('torch', 'onnx')
+
+
+def normalize_backend(backend):
+    """설정값을 지원하는 백엔드 이름으로 정리합니다. 알 수 없는 값이면 'torch'를 사용합니다."""
+    backend = str(backend or 'torch').strip().lower()
+    if backend not in SUPPORTED_BACKENDS:
+        print(f"경고: 알 수 없는 추론 백엔드 '{backend}'. 'torch'를 사용합니다.")
+        return 'torch'
+    return backend
+
+
+# 양자화 모드 (config.ini [MODEL] quantization = none | int8)
+SUPPORTED_QUANTIZATION = ('none', 'int8')
+
+
+def normalize_quantization(mode):
+    """설정값을 지원하는 양자화 모드로 정리합니다. 알 수 없는 값이면 'none'을 사용합니다."""
+    mode = str(mode or 'none').strip().lower()
+    if mode not in SUPPORTED_QUANTIZATION:
+        print(f"경고: 알 수 없는 양자화 모드 '{mode}'. 'none'을 사용합니다.")
+        return 'none'
+    return mode
+
+
+def encoder_identity(model_name, backend, quantization='none'):
+    """임베딩 캐시 키에 쓰일 인코더 식별자입니다. 백엔드나 양자화 모드가 다르면 캐시도 분리됩니다."""
+    suffix = [part for part in (backend if backend != 'torch' else '', quantization if quantization != 'none' else '') if part]
+    return ':'.join([model_name] + suffix)
+
+
+def loaded_encoder_identity(model_name, encoder):
+    """
+    로드된 인코더가 실제로 사용하는 백엔드/양자화로 만든 식별자입니다.
+    (onnxruntime이 없어 PyTorch로 전환했거나 GPU라 양자화를 건너뛴 경우 설정값과 다릅니다)
+    """
+    return encoder_identity(model_name, getattr(encoder, 'inference_backend', 'torch'), getattr(encoder, 'quantization', 'none'))
+
+
+def _record_settings(encoder, backend, quantization):
+    """인코더 객체에 실제로 적용된 백엔드와 양자화 모드를 기록합니다."""
+    encoder.inference_backend, encoder.quantization = backend, quantization
+    return encoder
+
+
+def encoder_fingerprint(model_source, identity):
+    """인코더 식별자와 원본 가중치 서명으로 만든 모델 해시입니다. (카테고리 임베딩 캐시 키 등에 사용)"""
+    return hashlib.sha1(f"{identity}\n{_source_signature(model_source)}".encode('utf-8')).hexdigest()
+
+
+def load_sentence_encoder(model_name, backend='torch', artifact_dir=None, device='cpu', quantization='none'):
+    """
+    SBERT 인코더를 로드합니다. 'onnx' 백엔드는 변환된 모델이 없으면 최초 1회 내보낸 뒤
+    ONNX Runtime 세션으로 실행하며, onnxruntime이 없으면 PyTorch 경로로 되돌아갑니다.
+    quantization='int8'이면 선형 계층을 int8 동적 양자화한 모델을 디스크에 캐시해 두고 재사용합니다.
+    실제로 적용된 백엔드/양자화는 반환 객체의 inference_backend, quantization 속성에 기록됩니다.
+    (임베딩 캐시 식별자는 loaded_encoder_identity로 이 값에서 만들어야 합니다)
+    """
+    if quantization == 'int8' and device != 'cpu':
+        print("경고: int8 동적 양자화는 CPU 전용입니다. 양자화 없이 로드합니다.")
+        quantization = 'none'
+    if backend == 'onnx':
+        try:
+            return _record_settings(OnnxSentenceEncoder.load_or_export(model_name, os.path.join(artifact_dir, 'sbert'), quantization),
+                                    'onnx', quantization)
+        except ImportError as e:
+            print(f"경고: ONNX Runtime을 사용할 수 없어 PyTorch 백엔드로 전환합니다: {e}")
+    from sentence_transformers import SentenceTransformer
+    if quantization == 'int8':
+        def build_quantized():
+            st_model = SentenceTransformer(model_name, device='cpu')
+            st_model[0].auto_model = quantize_linear_int8(st_model[0].auto_model)
+            return st_model
+        return _record_settings(_load_or_build_torch_artifact(build_quantized, model_name, os.path.join(artifact_dir, 'sbert-int8')),
+                                'torch', 'int8')
+    return _record_settings(SentenceTransformer(model_name, device=device), 'torch', 'none')
+
+
+def load_text_classifier(model_path, backend='torch', artifact_dir=None, quantization='none'):
+    """
+    리뷰 분류기를 로드합니다. 반환 객체는 transformers 파이프라인과 같은 방식
+    (texts, batch_size=..., truncation=..., max_length=...)으로 호출할 수 있습니다.
+    """
+    from transformers import pipeline
+    import torch
+
+    if quantization == 'int8' and torch.cuda.is_available():
+        print("경고: int8 동적 양자화는 CPU 전용입니다. 양자화 없이 로드합니다.")
+        quantization = 'none'
+    if backend == 'onnx':
+        try:
+            return OnnxTextClassifier.load_or_export(model_path, os.path.join(artifact_dir, 'classifier'), quantization)
+        except ImportError as e:
+            print(f"경고: ONNX Runtime을 사용할 수 없어 PyTorch 백엔드로 전환합니다: {e}")
+    if quantization == 'int8':
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        def build_quantized():
+            return quantize_linear_int8(AutoModelForSequenceClassification.from_pretrained(model_path))
+        model = _load_or_build_torch_artifact(build_quantized, model_path, os.path.join(artifact_dir, 'classifier-int8'))
+        return pipeline('text-classification', model=model, tokenizer=AutoTokenizer.from_pretrained(model_path), device=-1)
+    device = 0 if torch.cuda.is_available() else -1
+    return pipeline('text-classification', model=model_path, device=device)
+
+
+def load_shared_backbone(model_path, backend='torch', artifact_dir=None, device='cpu', quantization='none'):
+    """
+    파인튜닝된 분류 모델 하나로 임베딩과 분류를 함께 처리하는 SharedBackboneModel을 로드합니다.
+    공유 본체는 PyTorch로만 실행되며, int8 양자화 모드는 CPU에서만 적용됩니다. (적용 여부는 반환 객체의 quantization 속성)
+    """
+    from shared_backbone import SharedBackboneModel
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    if backend != 'torch':
+        print(f"경고: 공유 본체 모드는 '{backend}' 백엔드를 지원하지 않아 PyTorch로 실행합니다.")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    if quantization == 'int8' and device == 'cpu':
+        def build_quantized():
+            return quantize_linear_int8(AutoModelForSequenceClassification.from_pretrained(model_path))
+        model = _load_or_build_torch_artifact(build_quantized, model_path, os.path.join(artifact_dir, 'shared-int8'))
+        return _record_settings(SharedBackboneModel(model, tokenizer, device='cpu'), 'torch', 'int8')
+    return _record_settings(SharedBackboneModel(AutoModelForSequenceClassification.from_pretrained(model_path), tokenizer, device=device),
+                            'torch', 'none')
+
+
+# ===================================================================
+# int8 동적 양자화
+# ===================================================================
+TORCH_ARTIFACT_FILE = 'model.pt'
+ONNX_INT8_MODEL_FILE = 'model.int8.onnx'
+
+
+def quantize_linear_int8(model):
+    """모델의 모든 nn.Linear 계층을 int8 동적 양자화합니다. (가중치 int8, 활성값은 실행 시 양자화)"""
+    import torch
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_or_build_torch_artifact(build_fn, source, output_dir):
+    """
+    양자화된 PyTorch 모델을 디스크 캐시에서 불러옵니다. 원본 가중치나 torch 버전이 바뀌었으면
+    build_fn으로 다시 만들어 저장합니다. (매 실행마다 양자화를 반복하지 않기 위함)
+    """
+    import torch
+
+    artifact_path = os.path.join(output_dir, TORCH_ARTIFACT_FILE)
+    if _is_artifact_current(output_dir, source, TORCH_ARTIFACT_FILE, torch_version=torch.__version__):
+        try:
+            return torch.load(artifact_path, map_location='cpu', weights_only=False)
+        except Exception as e:
+            print(f"경고: 양자화 모델 캐시 '{artifact_path}' 로드 실패, 다시 생성합니다: {e}")
+
+    print(f"--- '{source}' 모델을 int8 동적 양자화합니다 ---")
+    model = build_fn()
+    os.makedirs(output_dir, exist_ok=True)
+    torch.save(model, artifact_path)
+    _write_meta(output_dir, {'source': source, 'source_signature': _source_signature(source),
+                             'torch_version': torch.__version__})
+    print(f"--- 양자화 모델 저장 완료: '{artifact_path}' ---")
+    return model
+
+
+def quantize_onnx_int8(model_dir):
+    """내보낸 ONNX 모델을 ONNX Runtime 동적 양자화(int8 가중치)로 변환해 같은 폴더에 저장합니다."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    int8_path = os.path.join(model_dir, ONNX_INT8_MODEL_FILE)
+    if os.path.exists(int8_path): return int8_path
+    print(f"--- ONNX 모델 int8 동적 양자화: '{model_dir}' ---")
+    quantize_dynamic(os.path.join(model_dir, ONNX_MODEL_FILE), int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+# ===================================================================
+# ONNX 내보내기
+# ===================================================================
+ONNX_OPSET = 17
+ONNX_MODEL_FILE = 'model.onnx'
+ONNX_META_FILE = 'export_meta.json'
+
+
+def _source_signature(model_path):
+    """로컬 모델 폴더는 가중치 파일의 크기/수정시각으로, 허브 모델은 이름으로 원본을 식별합니다."""
+    if not os.path.isdir(model_path): return model_path
+    entries = []
+    for name in sorted(os.listdir(model_path)):
+        if name.endswith(('.safetensors', '.bin', '.json')):
+            stat = os.stat(os.path.join(model_path, name))
+            entries.append(f"{name}:{stat.st_size}:{int(stat.st_mtime)}")
+    return '|'.join(entries)
+
+
+def _read_meta(output_dir):
+    meta_file = os.path.join(output_dir, ONNX_META_FILE)
+    if not os.path.exists(meta_file): return None
+    with open(meta_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_meta(output_dir, meta):
+    with open(os.path.join(output_dir, ONNX_META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def _is_artifact_current(output_dir, source, artifact_file, **expected):
+    """저장된 변환본이 현재 원본(및 expected로 준 버전 정보)과 일치하는지 확인합니다."""
+    meta = _read_meta(output_dir)
+    if not meta or meta.get('source_signature') != _source_signature(source): return False
+    if any(meta.get(key) != value for key, value in expected.items()): return False
+    return os.path.exists(os.path.join(output_dir, artifact_file))
+
+
+def _prepare_export_dir(output_dir):
+    """다시 내보내기 전에 이전 양자화 결과를 지워, 새 원본과 어긋난 int8 모델이 남지 않게 합니다."""
+    os.makedirs(output_dir, exist_ok=True)
+    stale_int8 = os.path.join(output_dir, ONNX_INT8_MODEL_FILE)
+    if os.path.exists(stale_int8): os.remove(stale_int8)
+
+
+def _export_transformer(model, tokenizer, onnx_path, output_name, per_token_output):
+    """input_ids/attention_mask 두 입력만 받는 형태로 트랜스포머 모델을 ONNX로 내보냅니다."""
+    import torch
+
+    class _Wrapper(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, input_ids, attention_mask):
+            return self.inner(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+    model.eval()
+    sample = tokenizer(["ONNX 변환용 샘플 문장입니다."], return_tensors='pt')
+    output_axes = {0: 'batch', 1: 'sequence'} if per_token_output else {0: 'batch'}
+    with torch.no_grad():
+        torch.onnx.export(
+            _Wrapper(model), (sample['input_ids'], sample['attention_mask']), onnx_path,
+            input_names=['input_ids', 'attention_mask'], output_names=[output_name],
+            dynamic_axes={'input_ids': {0: 'batch', 1: 'sequence'}, 'attention_mask': {0: 'batch', 1: 'sequence'},
+                          output_name: output_axes},
+            opset_version=ONNX_OPSET)
+
+
+def export_sentence_encoder(model_name, output_dir):
+    """SentenceTransformer의 트랜스포머 본체를 ONNX로 내보내고, 토크나이저와 풀링 설정을 함께 저장합니다."""
+    from sentence_transformers import SentenceTransformer
+
+    print(f"--- SBERT 모델 '{model_name}'을 ONNX로 변환합니다 ---")
+    _prepare_export_dir(output_dir)
+    st_model = SentenceTransformer(model_name, device='cpu')
+    transformer, pooling = st_model[0], st_model[1] if len(st_model) > 1 else None
+    pooling_mode = 'cls' if getattr(pooling, 'pooling_mode_cls_token', False) else 'mean'
+    _export_transformer(transformer.auto_model, transformer.tokenizer, os.path.join(output_dir, ONNX_MODEL_FILE),
+                        'last_hidden_state', per_token_output=True)
+    transformer.tokenizer.save_pretrained(output_dir)
+    _write_meta(output_dir, {'source': model_name, 'source_signature': _source_signature(model_name),
+                             'pooling': pooling_mode, 'max_seq_length': st_model.max_seq_length})
+    print(f"--- ONNX 변환 완료: '{output_dir}' ---")
+
+
+def export_text_classifier(model_path, output_dir):
+    """파인튜닝된 시퀀스 분류 모델을 ONNX로 내보내고, 라벨 정보가 담긴 config를 함께 저장합니다."""
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    print(f"--- 리뷰 분류 모델 '{model_path}'을 ONNX로 변환합니다 ---")
+    _prepare_export_dir(output_dir)
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    _export_transformer(model, tokenizer, os.path.join(output_dir, ONNX_MODEL_FILE), 'logits', per_token_output=False)
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    _write_meta(output_dir, {'source': model_path, 'source_signature': _source_signature(model_path)})
+    print(f"--- ONNX 변환 완료: '{output_dir}' ---")
+
+
+def _create_session(onnx_path):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(onnx_path, options, providers=['CPUExecutionProvider'])
+
+
+# ===================================================================
+# ONNX Runtime 추론 래퍼
+# ===================================================================
+class OnnxSentenceEncoder:
+    """
+    ONNX Runtime으로 실행되는 SBERT 인코더입니다.
+    SentenceTransformer.encode와 같은 인자(convert_to_tensor, normalize_embeddings 등)를 지원합니다.
+    """
+
+    def __init__(self, model_dir, onnx_file=ONNX_MODEL_FILE):
+        import onnxruntime  # noqa: F401  (설치 여부를 먼저 확인합니다)
+        from transformers import AutoTokenizer
+
+        meta = _read_meta(model_dir) or {}
+        self.model_dir = model_dir
+        self.pooling = meta.get('pooling', 'mean')
+        self.max_seq_length = int(meta.get('max_seq_length', 128))
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = _create_session(os.path.join(model_dir, onnx_file))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load_or_export(cls, model_name, model_dir, quantization='none'):
+        import onnxruntime  # noqa: F401
+        if not _is_artifact_current(model_dir, model_name, ONNX_MODEL_FILE):
+            export_sentence_encoder(model_name, model_dir)
+        if quantization == 'int8':
+            return cls(model_dir, os.path.basename(quantize_onnx_int8(model_dir)))
+        return cls(model_dir)
+
+    def _run(self, texts):
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors='np')
+        feeds = {'input_ids': encoded['input_ids'].astype(np.int64),
+                 'attention_mask': encoded['attention_mask'].astype(np.int64)}
+        with self._lock:
+            hidden = self.session.run(None, feeds)[0]
+        if self.pooling == 'cls': return hidden[:, 0]
+        mask = encoded['attention_mask'][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, convert_to_tensor=False,
+               normalize_embeddings=False, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batches = [self._run(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+        embeddings = np.vstack(batches).astype(np.float32) if batches else np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        if single: embeddings = embeddings[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+
+class OnnxTextClassifier:
+    """ONNX Runtime으로 실행되는 리뷰 분류기입니다. transformers 파이프라인과 같은 출력 형식을 돌려줍니다."""
+
+    def __init__(self, model_dir, onnx_file=ONNX_MODEL_FILE):
+        import onnxruntime  # noqa: F401
+        from transformers import AutoTokenizer, AutoConfig
+
+        self.model_dir = model_dir
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.id2label = {int(k): v for k, v in AutoConfig.from_pretrained(model_dir).id2label.items()}
+        self.session = _create_session(os.path.join(model_dir, onnx_file))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load_or_export(cls, model_path, model_dir, quantization='none'):
+        import onnxruntime  # noqa: F401
+        if not _is_artifact_current(model_dir, model_path, ONNX_MODEL_FILE):
+            export_text_classifier(model_path, model_dir)
+        if quantization == 'int8':
+            return cls(model_dir, os.path.basename(quantize_onnx_int8(model_dir)))
+        return cls(model_dir)
+
+    def predict_logits(self, texts, batch_size=16, max_length=256):
+        outputs = []
+        for i in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(texts[i:i + batch_size], padding=True, truncation=True, max_length=max_length,
+                                     return_tensors='np')
+            feeds = {'input_ids': encoded['input_ids'].astype(np.int64),
+                     'attention_mask': encoded['attention_mask'].astype(np.int64)}
+            with self._lock:
+                outputs.append(self.session.run(None, feeds)[0])
+        return np.vstack(outputs) if outputs else np.zeros((0, len(self.id2label)), dtype=np.float32)
+
+    def __call__(self, texts, batch_size=16, truncation=True, max_length=256, **kwargs):
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        logits = self.predict_logits(texts, batch_size=batch_size, max_length=max_length)
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        return [{'label': self.id2label[int(i)], 'score': float(probs[row, i])} for row, i in enumerate(best)]
@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import subprocess
+
+
+def _import_profile(module_name):
+    """python -X importtime 으로 모듈을 import 하고 (모듈 이름, 자체 us, 누적 us, 깊이) 목록과 전체 시간을 반환합니다."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                            capture_output=True, text=True, encoding='utf-8', errors='replace', cwd=os.path.dirname(os.path.abspath(__file__)))
+    elapsed = time.perf_counter() - start
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line: continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows, elapsed, result.returncode, result.stderr
+
+
+def _time_to_first_window(script, timeout):
+    """앱을 STARTUP_PROBE 모드로 실행해 프로세스 시작부터 첫 창이 표시될 때까지의 시간(초)을 잽니다. 측정할 수 없으면 None."""
+    env = dict(os.environ, STARTUP_PROBE='1')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, script], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                               encoding='utf-8', errors='replace', env=env, cwd=os.path.dirname(os.path.abspath(script)))
+    try:
+        for line in process.stdout:
+            if line.strip() == 'FIRST_WINDOW': return time.perf_counter() - start
+            if time.perf_counter() - start > timeout: break
+        return None
+    finally:
+        process.kill()
+        process.wait()
+
+
+def profile_startup():
+    """
+    첫 창이 뜨기까지의 시작 시간을 점검합니다.
+    1. 앱 모듈 import 시간을 -X importtime 으로 측정해 앱이 직접 import한 모듈을 누적 시간이 큰 순으로 보여줍니다.
+    2. 시작 시 불러오면 안 되는 무거운 라이브러리(DEFERRED_MODULES)가 import 단계에서 로드되면 실패로 처리합니다.
+    3. 화면(디스플레이)이 있으면 첫 창 표시까지의 시간을 재고, FIRST_WINDOW_BUDGET(초)을 넘으면 실패로 처리합니다.
+    실패가 하나라도 있으면 종료 코드 1을 반환합니다.
+    """
+    MODULE_NAME = sys.argv[1] if len(sys.argv) > 1 else 'main_app'
+    SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), f'{MODULE_NAME}.py')
+    DEFERRED_MODULES = ['pandas', 'gspread', 'oauth2client', 'serpapi', 'matplotlib', 'requests', 'torch', 'transformers', 'sentence_transformers']
+    FIRST_WINDOW_BUDGET = 1.0
+    FIRST_WINDOW_TIMEOUT = 60
+    TOP_N = 15
+
+    failures = []
+    rows, elapsed, returncode, stderr = _import_profile(MODULE_NAME)
+    print(f"--- 1. '{MODULE_NAME}' import 시간: {elapsed:.2f} 초 (인터프리터 시작 포함) ---")
+    if returncode != 0:
+        print(stderr.strip().splitlines()[-1] if stderr.strip() else "알 수 없는 오류")
+        print(f"\n실패: '{MODULE_NAME}' 모듈을 import 하지 못했습니다.")
+        return 1
+    # importtime은 하위 모듈을 부모보다 먼저 출력하므로, 앱 모듈 바로 앞의 깊이 1 항목들이 앱이 직접 import한 모듈입니다.
+    end = max(i for i, row in enumerate(rows) if row[3] == 0 and row[0] == MODULE_NAME)
+    start = max([i for i, row in enumerate(rows[:end]) if row[3] == 0], default=-1) + 1
+    direct = sorted((row for row in rows[start:end] if row[3] == 1), key=lambda row: -row[2])
+    for name, self_us, cumulative_us, _ in direct[:TOP_N]:
+        print(f"  {name:<32} 누적 {cumulative_us / 1000:8.1f} ms | 자체 {self_us / 1000:7.1f} ms")
+    print(f"  ('{MODULE_NAME}'이 직접 import한 모듈 {len(direct)}개, 전체 모듈 {len(rows)}개)")
+
+    print("\n--- 2. 시작 시 지연 로드해야 하는 라이브러리 ---")
+    loaded = {row[0].split('.')[0] for row in rows}
+    eager = [name for name in DEFERRED_MODULES if name in loaded]
+    for name in DEFERRED_MODULES:
+        print(f"  {name:<24} {'시작 시 로드됨' if name in eager else '지연 로드'}")
+    if eager: failures.append(f"시작 시 무거운 라이브러리가 로드됩니다: {', '.join(eager)}")
+
+    print(f"\n--- 3. 첫 창 표시 시간 (예산 {FIRST_WINDOW_BUDGET:.1f} 초) ---")
+    if sys.platform.startswith('linux') and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        print("  디스플레이가 없어 측정을 건너뜁니다.")
+    else:
+        first_window = _time_to_first_window(SCRIPT, FIRST_WINDOW_TIMEOUT)
+        if first_window is None:
+            failures.append(f"{FIRST_WINDOW_TIMEOUT}초 안에 첫 창이 표시되지 않았습니다.")
+        else:
+            print(f"  첫 창 표시까지 {first_window:.2f} 초")
+            if first_window > FIRST_WINDOW_BUDGET:
+                failures.append(f"첫 창 표시 시간 {first_window:.2f}초가 예산 {FIRST_WINDOW_BUDGET:.1f}초를 넘었습니다.")
+
+    if failures:
+        for failure in failures: print(f"\n실패: {failure}")
+        return 1
+    print("\n통과: 시작 시간 점검을 모두 통과했습니다.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(profile_startup())
@@ -0,0 +1,75 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+
+
+def definition_hash(definition):
+    """카테고리 정의({카테고리: [프로토타입 문장, ...]})의 내용 해시입니다. 순서까지 반영합니다."""
+    payload = json.dumps(list(definition.items()), ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class PrototypeStore:
+    """
+    카테고리 프로토타입 임베딩(카테고리 이름, 키워드 목록)을 모델 해시와 카테고리 정의 해시를 키로
+    디스크에 보관합니다. 모델이 바뀌면 전체를, 정의가 바뀐 그룹은 해당 그룹만 한 번의 배치 인코딩으로 다시 만듭니다.
+    """
+
+    def __init__(self, cache_file, model_hash):
+        self.cache_file = cache_file
+        self.model_hash = model_hash
+
+    def _load_groups(self):
+        if not os.path.exists(self.cache_file): return {}
+        try:
+            with np.load(self.cache_file, allow_pickle=False) as data:
+                if str(data['model_hash']) != self.model_hash: return {}
+                groups = {}
+                for group in data['groups'].tolist():
+                    groups[group] = {'hash': str(data[f'{group}__hash']), 'names': data[f'{group}__names'].tolist(),
+                                     'offsets': data[f'{group}__offsets'], 'vectors': data[f'{group}__vectors']}
+                return groups
+        except Exception as e:
+            print(f"경고: 카테고리 임베딩 캐시 '{self.cache_file}' 로드 실패, 새로 생성합니다: {e}")
+            return {}
+
+    def _save_groups(self, groups):
+        arrays = {'model_hash': np.array(self.model_hash), 'groups': np.array(list(groups), dtype=str)}
+        for group, entry in groups.items():
+            arrays.update({f'{group}__hash': np.array(entry['hash']), f'{group}__names': np.array(entry['names'], dtype=str),
+                           f'{group}__offsets': entry['offsets'], f'{group}__vectors': entry['vectors']})
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp.npz"
+            np.savez(tmp_file, **arrays)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"경고: 카테고리 임베딩 캐시 '{self.cache_file}' 저장 실패: {e}")
+
+    def get(self, definitions, encode_fn):
+        """
+        definitions: {그룹 이름: {카테고리: [프로토타입 문장, ...]}}
+        encode_fn: 문장 리스트를 (N, D) 행렬로 인코딩하는 함수
+        반환값: {그룹 이름: {카테고리: (프로토타입 수, D) 행렬}}
+        """
+        groups = self._load_groups()
+        stale = {group: definition for group, definition in definitions.items()
+                 if groups.get(group, {}).get('hash') != definition_hash(definition)}
+        if stale:
+            texts = [text for definition in stale.values() for prototypes in definition.values() for text in prototypes]
+            vectors = np.asarray(encode_fn(texts), dtype=np.float32)
+            start = 0
+            for group, definition in stale.items():
+                counts = [len(prototypes) for prototypes in definition.values()]
+                offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+                groups[group] = {'hash': definition_hash(definition), 'names': list(definition),
+                                 'offsets': offsets, 'vectors': vectors[start:start + offsets[-1]]}
+                start += offsets[-1]
+            self._save_groups(groups)
+            print(f"--- 카테고리 임베딩 생성 및 저장: {', '.join(stale)} ({len(texts)}개 문장) ---")
+
+        return {group: {name: groups[group]['vectors'][groups[group]['offsets'][i]:groups[group]['offsets'][i + 1]]
+                        for i, name in enumerate(groups[group]['names'])}
+                for group in definitions}
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class QueryEmbeddingCache:
+    """
+    검색어 임베딩을 최근 사용 순(LRU)으로 최대 max_size개까지 메모리에 보관하는 캐시입니다.
+    여러 작업 스레드가 같은 검색어를 동시에 요청하면 모델은 한 번만 실행하고 나머지는 그 결과를 기다립니다.
+    """
+
+    def __init__(self, encode_fn, max_size=512):
+        self.encode_fn = encode_fn
+        self.max_size = int(max_size)
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def _store(self, text, vector):
+        vector.setflags(write=False)  # 여러 호출자가 같은 배열을 공유하므로 수정되지 않도록 합니다.
+        self._entries[text] = vector
+        self._entries.move_to_end(text)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, text):
+        """검색어의 정규화된 임베딩 벡터를 반환합니다. 캐시에 없으면 인코딩 후 보관합니다."""
+        with self._lock:
+            if text in self._entries:
+                self._entries.move_to_end(text)
+                self._stats['hits'] += 1
+                return self._entries[text]
+            future = self._inflight.get(text)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[text] = Future()
+                self._stats['misses'] += 1
+            else:
+                self._stats['coalesced'] += 1
+        if not is_owner: return future.result()
+
+        try:
+            vector = np.array(self.encode_fn([text])[0], dtype=np.float32)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[text]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._store(text, vector)
+            del self._inflight[text]
+        future.set_result(vector)
+        return vector
+
+    def seed(self, texts):
+        """자주 쓰이는 검색어(카테고리 이름 등)를 한 번의 배치 인코딩으로 미리 채워 둡니다."""
+        with self._lock:
+            missing = list(dict.fromkeys(t for t in texts if t not in self._entries))
+        if not missing: return 0
+        vectors = np.asarray(self.encode_fn(missing), dtype=np.float32)
+        with self._lock:
+            for text, vector in zip(missing, vectors):
+                self._store(text, np.array(vector))
+        return len(missing)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries)}
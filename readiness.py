@@ -0,0 +1,174 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ReadinessManager:
+    """
+    시작 시 필요한 리소스(관광지 목록, AI 모델, 시트 데이터, 검색 인덱스 등)를 스레드 풀에서 동시에 로드하고,
+    리소스별 상태(대기/로딩/완료/실패)와 소요 시간을 추적합니다. 화면은 필요한 리소스가 준비되는 대로 기능별로 활성화됩니다.
+    선행 리소스(requires)가 있는 작업은 선행 작업이 모두 완료된 뒤 자동으로 시작되며,
+    한 작업의 실패는 그 작업과 이에 의존하는 작업에만 영향을 줍니다.
+    로딩 중인 작업에 다시 로드가 요청되면(reload) 그 작업은 '오래됨'으로 표시되고, 끝났을 때 결과를 버린 뒤 다시 실행됩니다.
+    """
+
+    PENDING, LOADING, READY, FAILED = '대기', '로딩 중', '완료', '실패'
+
+    def __init__(self, dispatch=None, max_workers=4):
+        # dispatch(fn, *args): 콜백을 실행할 방법 (Tk에서는 메인 스레드로 넘기기 위해 after(0, ...)를 사용)
+        self._dispatch = dispatch or (lambda fn, *args: fn(*args))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bootstrap')
+        self._tasks = {}
+        self._listeners = []
+        self._ready_callbacks = []
+        self._lock = threading.RLock()
+        self._settled = threading.Event()
+        self._round_started = None
+
+    def register(self, name, loader, requires=()):
+        """리소스 이름과 로더 함수, 선행 리소스 목록을 등록합니다. 로더의 반환값은 result(name)으로 조회합니다."""
+        with self._lock:
+            self._tasks[name] = {'loader': loader, 'requires': tuple(requires), 'state': self.PENDING,
+                                 'result': None, 'error': None, 'started': None, 'elapsed': None, 'stale': False}
+
+    def add_listener(self, callback):
+        """상태가 바뀔 때마다 callback(name, state, error)를 호출합니다."""
+        self._listeners.append(callback)
+
+    def when_ready(self, names, callback):
+        """names의 리소스가 모두 준비될 때마다(새로고침 포함) callback()을 호출합니다. 이미 준비되었으면 바로 호출합니다."""
+        names = tuple(names)
+        self._ready_callbacks.append((names, callback))
+        if self.is_ready(*names): self._dispatch(callback)
+
+    def state(self, name):
+        with self._lock:
+            return self._tasks[name]['state']
+
+    def result(self, name):
+        with self._lock:
+            return self._tasks[name]['result']
+
+    def error(self, name):
+        with self._lock:
+            return self._tasks[name]['error']
+
+    def is_ready(self, *names):
+        with self._lock:
+            return all(self._tasks[n]['state'] == self.READY for n in names)
+
+    def start(self):
+        """선행 조건이 없는 작업을 모두 동시에 시작합니다. 나머지는 선행 작업 완료 시 시작됩니다."""
+        with self._lock:
+            runnable = [name for name, task in self._tasks.items()
+                        if task['state'] == self.PENDING and self._requirements_met(task)]
+        for name in runnable: self._launch(name)
+
+    def reload(self, name):
+        """
+        리소스와 그에 의존하는 리소스들을 다시 로드합니다. (예: 시트 새로고침 후 검색 인덱스 재생성)
+        이미 로딩 중인 작업은 이전 데이터로 만든 결과가 완료로 표시되지 않도록 오래됨으로 표시해 두고, 끝나면 다시 실행합니다.
+        """
+        with self._lock:
+            for target in [name] + self._dependents(name):
+                if self._tasks[target]['state'] == self.LOADING: self._tasks[target]['stale'] = True
+                elif target != name: self._set_state(target, self.PENDING)
+        self._launch(name)
+
+    def _requirements_met(self, task):
+        return all(self._tasks[r]['state'] == self.READY for r in task['requires'])
+
+    def _dependents(self, name):
+        found, queue = [], [name]
+        while queue:
+            current = queue.pop()
+            for other, task in self._tasks.items():
+                if current in task['requires'] and other not in found:
+                    found.append(other)
+                    queue.append(other)
+        return found
+
+    def _requeue(self, name):
+        """오래됨으로 표시된 작업의 결과를 버리고 대기 상태로 돌립니다. 바로 다시 시작할 수 있으면 True를 반환합니다."""
+        task = self._tasks[name]
+        task['stale'] = False
+        failed = next((r for r in task['requires'] if self._tasks[r]['state'] == self.FAILED), None)
+        if failed is not None:
+            self._set_state(name, self.FAILED, RuntimeError(f"선행 리소스 '{failed}' 로딩 실패"))
+            return False
+        self._set_state(name, self.PENDING)
+        return self._requirements_met(task)
+
+    def _set_state(self, name, state, error=None):
+        with self._lock:
+            self._tasks[name]['state'] = state
+            self._tasks[name]['error'] = error
+        for listener in self._listeners:
+            self._dispatch(listener, name, state, error)
+
+    def _launch(self, name):
+        with self._lock:
+            if self._tasks[name]['state'] == self.LOADING: return
+            if self._settled.is_set() or self._round_started is None:
+                self._round_started = time.perf_counter()
+            self._settled.clear()
+            self._tasks[name]['started'] = time.perf_counter()
+            self._tasks[name]['elapsed'] = None
+            self._set_state(name, self.LOADING)
+        self._executor.submit(self._run, name)
+
+    def _run(self, name):
+        task = self._tasks[name]
+        try:
+            result, error = task['loader'](), None
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            result, error = None, e
+
+        runnable, callbacks = [], []
+        with self._lock:
+            task['elapsed'] = time.perf_counter() - task['started']
+            if task['stale']:
+                # 로딩 중에 다시 로드가 요청되었으므로, 이전 데이터로 만든 이번 결과(성공이든 실패든)는 버리고 다시 실행합니다.
+                if self._requeue(name): runnable.append(name)
+            elif error is not None:
+                self._set_state(name, self.FAILED, error)
+                for dependent in self._dependents(name):
+                    # 이미 로딩 중인 의존 작업은 끝날 때 선행 작업의 실패를 반영합니다.
+                    if self._tasks[dependent]['state'] == self.LOADING: self._tasks[dependent]['stale'] = True
+                    else: self._set_state(dependent, self.FAILED, RuntimeError(f"선행 리소스 '{name}' 로딩 실패"))
+            else:
+                task['result'] = result
+                self._set_state(name, self.READY)
+                runnable = [other for other, t in self._tasks.items()
+                            if name in t['requires'] and t['state'] == self.PENDING and self._requirements_met(t)]
+                callbacks = [cb for names, cb in self._ready_callbacks if name in names and self.is_ready(*names)]
+        for callback in callbacks: self._dispatch(callback)
+        for other in runnable: self._launch(other)
+        self._check_settled()
+
+    def _check_settled(self):
+        """진행 중이거나 시작 대기 중인 작업이 없으면 이번 로딩의 단계별 소요 시간을 출력합니다."""
+        with self._lock:
+            if self._settled.is_set(): return
+            if any(t['state'] in (self.LOADING, self.PENDING) and t['started'] is not None and t['elapsed'] is None
+                   for t in self._tasks.values()): return
+            if any(t['state'] == self.PENDING and self._requirements_met(t) for t in self._tasks.values()): return
+            self._settled.set()
+        print(self.timing_report())
+
+    def wait(self, timeout=None):
+        """현재 로딩이 모두 끝날 때까지 기다립니다. (UI 없이 실행할 때 사용) 완료 여부를 반환합니다."""
+        return self._settled.wait(timeout)
+
+    def timing_report(self):
+        """작업별 소요 시간과, 동시 실행 전체 시간 / 순차 실행 시 합계를 비교한 요약 문자열을 반환합니다."""
+        with self._lock:
+            rows = [(name, t['state'], t['elapsed']) for name, t in self._tasks.items() if t['elapsed'] is not None]
+            finished = [t['started'] + t['elapsed'] for t in self._tasks.values() if t['elapsed'] is not None]
+            wall = (max(finished) - self._round_started) if finished and self._round_started else 0.0
+        lines = ["--- 리소스 로딩 단계별 소요 시간 ---"]
+        lines += [f"  - {name:<14} {state:<4} {elapsed:7.2f}초" for name, state, elapsed in rows]
+        lines.append(f"  전체 {wall:.2f}초 (순차 실행 시 합계 {sum(e for _, _, e in rows):.2f}초)")
+        return "\n".join(lines)
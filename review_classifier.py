@@ -0,0 +1,75 @@
+import os
+import threading
+
+
+class ReviewClassifier:
+    """
+    파인튜닝된 리뷰 분류 모델(my_review_classifier)을 한 번만 로드하여 메모리에 상주시키고,
+    여러 분석 스레드가 잠금(lock)을 통해 안전하게 공유하도록 하는 래퍼입니다.
+    """
+
+    WARMUP_TEXT = "바다가 보이는 카페에서 휴식을 취했습니다."
+
+    def __init__(self, model_path, batch_size=16, max_length=256, backend='torch', quantization='none', artifact_dir=None,
+                 batcher=None):
+        self.model_path = model_path
+        self.backend = backend
+        self.quantization = quantization
+        self.artifact_dir = artifact_dir
+        self.batcher = batcher
+        self.batch_size = int(batch_size)
+        self.max_length = int(max_length)
+        self._pipeline = None
+        self._load_lock = threading.Lock()
+        self._predict_lock = threading.Lock()
+
+    def is_available(self):
+        """모델 폴더가 존재하는지 확인합니다."""
+        return os.path.exists(self.model_path)
+
+    def is_loaded(self):
+        return self._pipeline is not None
+
+    def load(self, warmup=True):
+        """파이프라인을 한 번만 생성하고, 필요하면 짧은 문장으로 워밍업 추론을 실행합니다."""
+        if self._pipeline is not None: return self._pipeline
+        with self._load_lock:
+            if self._pipeline is not None: return self._pipeline
+            from model_backend import load_text_classifier
+
+            classifier = load_text_classifier(self.model_path, backend=self.backend, artifact_dir=self.artifact_dir,
+                                              quantization=self.quantization)
+            if warmup:
+                classifier([self.WARMUP_TEXT], batch_size=1, truncation=True, max_length=self.max_length)
+            self._pipeline = classifier
+            print(f"--- 리뷰 분류 모델 로딩 및 워밍업 완료 (backend={self.backend}, quantization={self.quantization}, batch_size={self.batch_size}, max_length={self.max_length}) ---")
+        return self._pipeline
+
+    def attach(self, classifier):
+        """이미 로드된 분류기(예: 공유 본체 모델)를 별도 로딩 없이 그대로 사용하도록 등록합니다."""
+        with self._load_lock:
+            self._pipeline = classifier
+
+    def predict(self, texts):
+        """텍스트 리스트를 분류하여 [{'label': ..., 'score': ...}, ...] 형태로 반환합니다."""
+        if not texts: return []
+        classifier = self.load()
+        with self._predict_lock:
+            if self.batcher is None:
+                return classifier(list(texts), batch_size=self.batch_size, truncation=True, max_length=self.max_length)
+            # 길이가 비슷한 리뷰끼리 토큰 예산 안에서 묶어 패딩 낭비를 줄이고, 결과는 원래 순서로 되돌립니다.
+            run_batch = lambda batch: classifier(batch, batch_size=len(batch), truncation=True, max_length=self.max_length)
+            return self.batcher.run(texts, run_batch, tokenizer=getattr(classifier, 'tokenizer', None),
+                                    max_length=self.max_length, label='classify')
+
+    def predict_with_embeddings(self, texts):
+        """
+        공유 본체 모델이 등록되어 있으면 한 번의 순전파로 (임베딩 행렬, 분류 결과)를 반환합니다.
+        일반 분류기라면 임베딩 자리에 None을 돌려줍니다.
+        """
+        if not texts: return None, []
+        classifier = self.load()
+        with self._predict_lock:
+            if hasattr(classifier, 'embed_and_classify'):
+                return classifier.embed_and_classify(list(texts), batch_size=self.batch_size, max_length=self.max_length)
+            return None, classifier(list(texts), batch_size=self.batch_size, truncation=True, max_length=self.max_length)
@@ -0,0 +1,71 @@
+import numpy as np
+
+from lazy_import import LazyModule
+from review_schema import numeric_ratings
+
+pd = LazyModule('pandas')
+
+
+# 상세 리뷰 목록(Treeview)의 열 순서입니다. build_display_rows는 이 순서의 튜플을 반환합니다.
+DISPLAY_COLUMNS = ('year', 'source', 'rating', 'sentiment', 'review')
+
+
+def sentiment_labels(ratings, missing='N/A'):
+    """평점 배열을 감성 라벨 배열로 바꿉니다. (4점 이상 긍정, 3점 이상 중립, 그 외 부정, 평점이 없으면 missing)"""
+    ratings = np.asarray(ratings, dtype=np.float64)
+    return np.select([ratings >= 4, ratings >= 3, ratings < 3], ["😊 긍정", "😐 중립", "😠 부정"], default=missing)
+
+
+def source_labels(evaluators, peer_names, external_prefix='외부: ', missing='정보 없음'):
+    """
+    평가기관 열을 출처 라벨 배열로 바꿉니다.
+    동료기업(peer_names에 있는 평가기관)은 처음 나온 순서대로 '동료기업 1', '동료기업 2' ... 로 익명화하고,
+    나머지는 external_prefix + 기관 이름입니다. 평가기관이 비어 있으면 missing을 기관 이름으로 씁니다.
+    반환: (출처 라벨 배열, 동료기업 여부 배열)
+    """
+    names = pd.Series(evaluators, dtype=object).reset_index(drop=True)
+    blank = names.isna() | names.astype(str).str.strip().eq('')
+    names = names.where(~blank, missing).astype(str)
+    is_peer = (names.isin(peer_names) & ~blank).to_numpy()
+    labels = (external_prefix + names).to_numpy(dtype=object)
+    if is_peer.any():
+        codes, _ = pd.factorize(names[is_peer])
+        labels[is_peer] = [f"동료기업 {code + 1}" for code in codes]
+    return labels, is_peer
+
+
+def build_display_rows(reviews, peer_names, external_prefix='외부: ', missing='정보 없음', missing_rating='N/A',
+                       missing_review='', newest_first=False, peers_last=False):
+    """
+    기업 리뷰 DataFrame을 상세 목록에 바로 넣을 수 있는 (year, source, rating, sentiment, review) 튜플 목록으로 만듭니다.
+    행마다 파이썬 함수를 호출하지 않고 열 단위 연산으로 연도/출처/평점 문자열/감성 라벨을 한 번에 만듭니다.
+    - newest_first: 연도 내림차순 (같은 연도는 원래 순서 유지)
+    - peers_last: 외부기관 리뷰 뒤에 동료기업 리뷰 (각각 원래 순서 유지)
+    """
+    if reviews is None or reviews.empty: return []
+    count = len(reviews)
+
+    if 'year' in reviews.columns:
+        years = pd.to_numeric(reviews['year'], errors='coerce').to_numpy(dtype=np.float64)
+        year_text = np.where(np.isnan(years), '미상', np.nan_to_num(years).astype(np.int64).astype(str)).astype(object)
+    else:
+        years, year_text = np.full(count, np.nan), np.full(count, '미상', dtype=object)
+
+    evaluators = reviews['평가기관'] if '평가기관' in reviews.columns else np.full(count, None, dtype=object)
+    sources, is_peer = source_labels(evaluators, peer_names, external_prefix, missing)
+
+    ratings = numeric_ratings(reviews['평점']).to_numpy(dtype=np.float64) if '평점' in reviews.columns else np.full(count, np.nan)
+    rated = ~np.isnan(ratings)
+    rating_text = np.full(count, missing_rating, dtype=object)
+    rating_text[rated] = np.char.mod('%.1f', ratings[rated])
+    sentiments = sentiment_labels(ratings, missing_rating).astype(object)
+
+    if '평가내용' in reviews.columns: texts = reviews['평가내용'].astype(object).where(reviews['평가내용'].notna(), missing_review).to_numpy()
+    else: texts = np.full(count, missing_review, dtype=object)
+
+    order = None
+    if newest_first: order = np.argsort(-np.nan_to_num(years, nan=-np.inf), kind='stable')
+    elif peers_last: order = np.argsort(is_peer, kind='stable')
+    columns = (year_text, sources, rating_text, sentiments, texts)
+    if order is not None: columns = tuple(column[order] for column in columns)
+    return list(zip(*(column.tolist() for column in columns)))
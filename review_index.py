@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class ReviewRowIndex:
+    """
+    company_review_df의 대상기업별, (대상기업, 연도)별 행 위치(iloc) 색인입니다.
+    로딩 시 groupby 한 번으로 만들어 두므로, 기업별 조회 비용이 전체 리뷰 수가 아니라 해당 기업의 리뷰 수에 비례합니다.
+    증분 동기화로 덧붙인 행은 extend로 새 행만 색인에 추가합니다.
+    """
+
+    EMPTY = np.empty(0, dtype=np.int64)
+
+    def __init__(self):
+        self._by_company, self._by_company_year = {}, {}
+        self.row_count = 0
+
+    @classmethod
+    def build(cls, reviews_df):
+        index = cls()
+        index.extend(reviews_df, 0)
+        return index
+
+    @staticmethod
+    def _merge(groups, new_rows, keys, start):
+        if not set(keys) <= set(new_rows.columns): return
+        for key, positions in new_rows.groupby(list(keys) if len(keys) > 1 else keys[0], observed=True, sort=False).indices.items():
+            positions = positions.astype(np.int64) + start
+            groups[key] = np.concatenate([groups[key], positions]) if key in groups else positions
+
+    def extend(self, new_rows, start):
+        """start 위치부터 이어지는 행들(new_rows)을 색인에 추가합니다. 대상기업이 비어 있는 행은 색인하지 않습니다."""
+        if len(new_rows):
+            self._merge(self._by_company, new_rows, ('대상기업',), start)
+            self._merge(self._by_company_year, new_rows, ('대상기업', 'year'), start)
+        self.row_count = start + len(new_rows)
+
+    def rows(self, company_name, year=None):
+        """해당 기업(year가 주어지면 그 연도)의 리뷰 행 위치를 오름차순 배열로 반환합니다."""
+        if year is None: return self._by_company.get(company_name, self.EMPTY)
+        return self._by_company_year.get((company_name, year), self.EMPTY)
+
+    def matches(self, reviews_df):
+        """색인이 주어진 DataFrame의 현재 행 수와 맞는지 확인합니다."""
+        return reviews_df is not None and self.row_count == len(reviews_df)
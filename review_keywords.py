@@ -0,0 +1,88 @@
+import re
+import math
+from collections import Counter
+
+from lazy_import import LazyModule
+
+pd = LazyModule('pandas')
+
+
+TOKEN_PATTERN = r'[0-9A-Za-z가-힣]+'
+# 어절 끝에서 떼어낼 조사 (긴 것부터 비교합니다)
+PARTICLES = tuple(sorted({'에서는', '에게서', '으로는', '으로서', '으로써', '이라고', '에서', '에게', '한테', '으로', '로서', '로써', '로는',
+                          '까지', '부터', '처럼', '보다', '하고', '이랑', '과는', '와는', '에는', '이나', '라고', '이며', '이고',
+                          '은', '는', '이', '가', '을', '를', '의', '에', '도', '만', '로', '과', '와', '랑', '나'}, key=len, reverse=True))
+# 어느 기업 리뷰에나 나오는 일반어 (IDF로도 낮아지지만, 기업 수가 적을 때를 위해 미리 제외합니다)
+STOPWORDS = frozenset({'그리고', '하지만', '그러나', '또한', '매우', '정말', '너무', '아주', '조금', '많이', '항상', '다소', '있는', '있고',
+                       '있습니다', '있었습니다', '없습니다', '합니다', '했습니다', '하였습니다', '입니다', '됩니다', '되었습니다', '같습니다',
+                       '대한', '대해', '위해', '통해', '관련', '경우', '부분', '생각', '정도', '기업', '회사', '업체', '평가', '리뷰'})
+MIN_TOKEN_LENGTH = 2
+
+
+def strip_particle(word):
+    """어절 끝의 조사를 떼어냅니다. 떼고 남은 말이 MIN_TOKEN_LENGTH보다 짧으면 (예: '결과', '효과') 그대로 둡니다."""
+    for particle in PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= MIN_TOKEN_LENGTH:
+            return word[:-len(particle)]
+    return word
+
+
+def _term(word):
+    """어절을 색인용 단어로 바꿉니다. 색인하지 않을 단어(짧은 단어, 일반어)는 None입니다."""
+    term = strip_particle(word.lower())
+    return term if len(term) >= MIN_TOKEN_LENGTH and term not in STOPWORDS else None
+
+
+def tokenize(text):
+    """리뷰 문장을 색인용 단어 목록으로 나눕니다. (한글/영문/숫자 어절 단위, 조사 제거)"""
+    return [term for term in map(_term, re.findall(TOKEN_PATTERN, str(text))) if term]
+
+
+class ReviewKeywordIndex:
+    """
+    전체 리뷰의 기업별 단어 빈도(희소 행: 기업 -> {단어: 횟수})와 단어별 기업 수(문서 빈도)를 보관하는 TF-IDF 키워드 색인입니다.
+    한 기업의 리뷰 전체를 한 문서로 보므로, 여러 기업 리뷰에 두루 나오는 단어일수록 점수가 낮아지고 그 기업만의 특징적인 단어가 위로 올라옵니다.
+    로딩 시 한 번 만들고, 증분 동기화로 덧붙인 리뷰는 extend로 새 행만 반영합니다.
+    """
+
+    def __init__(self):
+        self._counts, self._document_frequency = {}, Counter()
+        self.row_count = 0
+
+    @classmethod
+    def build(cls, reviews_df):
+        index = cls()
+        index.extend(reviews_df, 0)
+        return index
+
+    def extend(self, new_rows, start):
+        """start 위치부터 이어지는 리뷰 행들(new_rows)의 단어를 기업별 빈도와 문서 빈도에 더합니다."""
+        self.row_count = start + len(new_rows)
+        if new_rows is None or new_rows.empty or not {'대상기업', '평가내용'} <= set(new_rows.columns): return
+        texts = new_rows['평가내용'].astype(object)
+        words = pd.DataFrame({'company': new_rows['대상기업'].astype(object).to_numpy(),
+                              'word': texts.where(texts.notna(), '').astype(str).str.findall(TOKEN_PATTERN).to_numpy()})
+        words = words[words['company'].notna()].explode('word').dropna(subset=['word'])
+        if words.empty: return
+        # 같은 어절은 한 번만 정규화합니다.
+        unique_words = words['word'].unique()
+        words['term'] = words['word'].map(dict(zip(unique_words, map(_term, unique_words))))
+        for (company, term), count in words.dropna(subset=['term']).groupby(['company', 'term'], sort=False).size().items():
+            row = self._counts.setdefault(company, {})
+            if term not in row: self._document_frequency[term] += 1
+            row[term] = row.get(term, 0) + int(count)
+
+    def idf(self, term):
+        """평활화한 역문서 빈도: log((1 + 기업 수) / (1 + 단어가 나온 기업 수)) + 1"""
+        return math.log((1 + len(self._counts)) / (1 + self._document_frequency.get(term, 0))) + 1
+
+    def top_keywords(self, company_name, top_n=5):
+        """해당 기업의 특징 키워드 상위 top_n개를 [(단어, 나온 횟수), ...]로 반환합니다. (점수: (1 + log 횟수) * IDF)"""
+        row = self._counts.get(company_name)
+        if not row: return []
+        scored = sorted(row.items(), key=lambda item: (-(1 + math.log(item[1])) * self.idf(item[0]), -item[1], item[0]))
+        return scored[:top_n]
+
+    def matches(self, reviews_df):
+        """색인이 주어진 DataFrame의 현재 행 수와 맞는지 확인합니다."""
+        return reviews_df is not None and self.row_count == len(reviews_df)
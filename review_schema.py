@@ -0,0 +1,101 @@
+import numpy as np
+
+from lazy_import import LazyModule
+
+pd = LazyModule('pandas')
+
+
+# Google 설문 한국어 타임스탬프 형식 (예: '2025. 7. 17 오후 2:30:45')
+KOREAN_TIMESTAMP_PATTERN = r'^\s*(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})\.?\s*(오전|오후)?\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*$'
+REVIEW_CATEGORY_COLUMNS = ('대상기업', '평가기관')
+PREFERENCE_CATEGORY_COLUMNS = ('평가기업명', '평가대상기관')
+
+
+def parse_korean_timestamps(series):
+    """
+    '2025. 7. 17 오후 2:30:45' 형식의 문자열을 정규식 한 번으로 분해해 datetime64로 변환합니다.
+    (원소마다 형식을 추측하는 pd.to_datetime보다 빠릅니다) 형식이 다른 값만 pd.to_datetime으로 처리하며, 실패하면 NaT입니다.
+    """
+    text = series.astype(str)
+    parts = text.str.extract(KOREAN_TIMESTAMP_PATTERN)
+    numbers = parts[[0, 1, 2, 4, 5, 6]].apply(pd.to_numeric, errors='coerce')
+    hour = numbers[4] % 12 + np.where(parts[3] == '오후', 12, 0)
+    hour = hour.where(parts[3].notna(), numbers[4])
+    timestamps = pd.to_datetime(pd.DataFrame({'year': numbers[0], 'month': numbers[1], 'day': numbers[2], 'hour': hour,
+                                              'minute': numbers[5], 'second': numbers[6].fillna(0)}), errors='coerce')
+    unmatched = parts[0].isna() & text.str.strip().ne('') & ~series.isna().to_numpy()
+    if unmatched.any():
+        timestamps[unmatched] = pd.to_datetime(text[unmatched], errors='coerce', format='mixed')
+    return timestamps
+
+
+def numeric_ratings(series):
+    """평점 열을 숫자로 반환합니다. 정리 단계에서 이미 숫자형이면 다시 변환하지 않습니다."""
+    return series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors='coerce')
+
+
+def memory_usage(*frames):
+    """DataFrame들의 실제 메모리 사용량(바이트, 문자열 포함)을 합산합니다."""
+    return sum(int(df.memory_usage(deep=True, index=True).sum()) for df in frames if df is not None)
+
+
+def _to_category(df, columns):
+    for column in columns:
+        if column in df.columns: df[column] = df[column].astype('category')
+
+
+def normalize_reviews(df):
+    """
+    리뷰 DataFrame의 열을 분석용 형식으로 바꿉니다.
+    타임스탬프 -> datetime64 (변환할 수 없는 행은 제외), year -> int16, 평점 -> float32, 대상기업/평가기관 -> category
+    """
+    if df.empty: return df
+    if '타임스탬프' in df.columns:
+        df['타임스탬프'] = parse_korean_timestamps(df['타임스탬프'])
+        df = df[df['타임스탬프'].notna()].copy()
+        df['year'] = df['타임스탬프'].dt.year.astype(np.int16)
+    if '평점' in df.columns: df['평점'] = pd.to_numeric(df['평점'], errors='coerce').astype(np.float32)
+    _to_category(df, REVIEW_CATEGORY_COLUMNS)
+    return df
+
+
+def normalize_preferences(df):
+    """선호분야 DataFrame의 평점을 float32로, 평가기업명/평가대상기관을 category로 바꿉니다."""
+    if df is None or df.empty: return df
+    if '평점' in df.columns: df['평점'] = pd.to_numeric(df['평점'], errors='coerce').astype(np.float32)
+    _to_category(df, PREFERENCE_CATEGORY_COLUMNS)
+    return df
+
+
+def normalize_profiles(profiles):
+    """
+    연도별 프로필의 기업명 인덱스를 모든 연도가 공유하는 하나의 category 형식으로 바꿉니다.
+    (기업명 문자열을 연도마다 따로 보관하지 않고 정수 코드만 보관합니다)
+    """
+    if not profiles: return profiles
+    names = pd.Index(np.concatenate([df.index.to_numpy(dtype=object) for df in profiles.values()])).dropna().unique()
+    company_dtype = pd.CategoricalDtype(names)
+    for df in profiles.values():
+        df.index = pd.CategoricalIndex(df.index, dtype=company_dtype, name=df.index.name)
+    return profiles
+
+
+def _string_categories(series):
+    """
+    열을 범주가 문자열인 category로 바꿉니다.
+    (read_csv는 모두 빈 열을 float64로 읽으므로, 새 행의 범주 형식이 기존 열과 달라 합칠 수 없는 경우를 막습니다)
+    """
+    values = series.astype('category')
+    return values.cat.rename_categories(values.cat.categories.astype(str)).array
+
+
+def append_reviews(reviews_df, new_reviews):
+    """정리된 리뷰 DataFrame 뒤에 새로 정리한 리뷰를 덧붙입니다. category 열은 두 쪽의 범주를 합쳐 category로 유지합니다."""
+    if new_reviews.empty: return reviews_df
+    combined = pd.concat([reviews_df, new_reviews])
+    for column in REVIEW_CATEGORY_COLUMNS:
+        if column in reviews_df.columns and column in new_reviews.columns:
+            merged = pd.api.types.union_categoricals([_string_categories(reviews_df[column]), _string_categories(new_reviews[column])],
+                                                     ignore_order=True)
+            combined[column] = pd.Categorical(merged)
+    return combined
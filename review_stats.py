@@ -0,0 +1,88 @@
+import numpy as np
+
+from lazy_import import LazyModule
+from review_schema import numeric_ratings
+
+pd = LazyModule('pandas')
+
+
+STAT_COLUMNS = ['count', 'rated', 'positive', 'rating_sum']
+
+
+def _count_frame(ratings, **keys):
+    """행 단위 집계용 프레임: 전체 수, 평점이 있는 수, 긍정(4점 이상) 수, 평점 합계 (키는 이름순 정렬을 위해 문자열 배열로 받습니다)"""
+    frame = pd.DataFrame(keys)
+    frame['count'] = 1
+    frame['rated'] = ratings.notna().to_numpy()
+    frame['positive'] = (ratings >= 4).to_numpy()
+    frame['rating_sum'] = ratings.fillna(0).to_numpy(dtype=np.float64)
+    return frame
+
+
+class ReviewStatsTable:
+    """
+    모든 기업의 리뷰/협업 선호도 통계를 로딩 시 한 번의 벡터 연산으로 계산해 둔 조회용 표입니다.
+    - 평가기관별: (대상기업, 평가기관) -> 리뷰 수, 평점 있는 리뷰 수, 긍정(4점 이상) 수, 평점 합계, 동료기업 여부
+    - 출처별: (대상기업, 동료기업 여부) -> 같은 항목 (평가기관이 비어 있는 리뷰는 외부로 집계)
+    - 협업 선호도: (평가기업명, 평가대상기관) -> 같은 항목
+    페이지를 열 때는 해당 기업의 행만 조회하며, 데이터가 새로 로드될 때만 다시 만듭니다.
+    """
+
+    def __init__(self, by_evaluator, by_source, preferences, preference_rows, peer_names):
+        self.by_evaluator, self.by_source = by_evaluator, by_source
+        self.preferences, self.preference_rows = preferences, preference_rows
+        self.peer_names = peer_names
+
+    @classmethod
+    def build(cls, reviews_df, peer_names, preference_df=None):
+        """peer_names: 동료기업(내부 기업)으로 볼 평가기관 이름 목록"""
+        peer_names = pd.Index(peer_names).dropna().unique()
+        empty = pd.DataFrame(columns=STAT_COLUMNS)
+        by_evaluator, by_source, preferences = pd.DataFrame(columns=['평가기관', *STAT_COLUMNS, 'peer']), empty, empty
+        preference_rows = pd.Series(dtype=np.int64)
+
+        if reviews_df is not None and not reviews_df.empty and {'대상기업', '평가기관', '평점'} <= set(reviews_df.columns):
+            is_peer = reviews_df['평가기관'].isin(peer_names).to_numpy()
+            frame = _count_frame(numeric_ratings(reviews_df['평점']), 대상기업=reviews_df['대상기업'].to_numpy(),
+                                 평가기관=reviews_df['평가기관'].to_numpy(), peer=is_peer)
+            by_evaluator = frame.groupby(['대상기업', '평가기관'])[STAT_COLUMNS].sum().reset_index()
+            by_evaluator['peer'] = by_evaluator['평가기관'].isin(peer_names)
+            by_evaluator = by_evaluator.set_index('대상기업').sort_index(kind='stable')
+            by_source = frame.groupby(['대상기업', 'peer'])[STAT_COLUMNS].sum()
+
+        if preference_df is not None and not preference_df.empty and {'평가기업명', '평가대상기관', '평점'} <= set(preference_df.columns):
+            frame = _count_frame(numeric_ratings(preference_df['평점']), 평가기업명=preference_df['평가기업명'].to_numpy(),
+                                 평가대상기관=preference_df['평가대상기관'].to_numpy())
+            preferences = frame.groupby(['평가기업명', '평가대상기관'])[STAT_COLUMNS].sum().reset_index()
+            preferences = preferences.set_index('평가기업명').sort_index(kind='stable')
+            preference_rows = frame.groupby('평가기업명').size()
+
+        return cls(by_evaluator, by_source, preferences, preference_rows, peer_names)
+
+    @staticmethod
+    def _rows(table, key):
+        return table.loc[[key]] if key in table.index else table.iloc[0:0]
+
+    def evaluators(self, company_name, peer=False):
+        """해당 기업을 평가한 평가기관별 통계 (평가기관 이름순) DataFrame"""
+        rows = self._rows(self.by_evaluator, company_name)
+        return rows[rows['peer'] == peer]
+
+    def source(self, company_name, peer=False):
+        """해당 기업의 외부기관 또는 동료기업 리뷰 전체 통계 {count, rated, positive, rating_sum}"""
+        key = (company_name, bool(peer))
+        if key not in self.by_source.index: return dict.fromkeys(STAT_COLUMNS, 0)
+        return self.by_source.loc[key, STAT_COLUMNS].to_dict()
+
+    def preference_targets(self, company_name):
+        """해당 기업이 평가한 평가대상기관별 협업 선호도 통계 (기관 이름순) DataFrame"""
+        return self._rows(self.preferences, company_name)
+
+    def preference_count(self, company_name):
+        """해당 기업의 협업 선호도 평가 기록 수"""
+        return int(self.preference_rows.get(company_name, 0))
+
+
+def mean_rating(stats):
+    """평점 평균입니다. 평점이 있는 리뷰가 없으면 NaN입니다."""
+    return stats['rating_sum'] / stats['rated'] if stats['rated'] else float('nan')
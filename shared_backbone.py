@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+
+
+class SharedBackboneModel:
+    """
+    파인튜닝된 리뷰 분류 모델(my_review_classifier) 하나로 문장 임베딩과 분류 로짓을 함께 계산하는 래퍼입니다.
+    분류기는 SBERT와 같은 RoBERTa 본체에서 파인튜닝되었으므로, 본체를 한 번만 실행해
+    마지막 은닉층을 평균 풀링(mean pooling)하면 임베딩, 분류 헤드에 통과시키면 로짓을 얻습니다.
+    SentenceTransformer.encode와 transformers 파이프라인 호출 형식을 모두 지원하므로
+    sbert_model과 리뷰 분류기 자리에 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, model, tokenizer, device='cpu', max_seq_length=128):
+        self.model = model.eval().to(device)
+        self.tokenizer = tokenizer
+        self.device = device
+        self.max_seq_length = int(max_seq_length)
+        self.id2label = {int(k): v for k, v in model.config.id2label.items()}
+        self._lock = threading.Lock()
+        if not hasattr(model, 'classifier') or model.config.model_type not in ('roberta', 'xlm-roberta', 'camembert'):
+            raise ValueError(f"공유 본체는 RoBERTa 계열 분류 모델만 지원합니다. (model_type={model.config.model_type})")
+
+    @classmethod
+    def from_pretrained(cls, model_path, device='cpu', max_seq_length=128):
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        return cls(AutoModelForSequenceClassification.from_pretrained(model_path),
+                   AutoTokenizer.from_pretrained(model_path), device=device, max_seq_length=max_seq_length)
+
+    def _forward(self, texts, max_length, with_logits):
+        """본체를 한 번 실행해 (평균 풀링 임베딩, 로짓 또는 None)을 numpy로 반환합니다."""
+        import torch
+
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=max_length, return_tensors='pt')
+        encoded = {k: v.to(self.device) for k, v in encoded.items() if k in ('input_ids', 'attention_mask')}
+        with self._lock, torch.inference_mode():
+            hidden = self.model.base_model(**encoded)[0]
+            logits = self.model.classifier(hidden) if with_logits else None
+        mask = encoded['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        return pooled.float().cpu().numpy(), None if logits is None else logits.float().cpu().numpy()
+
+    def _to_predictions(self, logits):
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+        return [{'label': self.id2label[int(i)], 'score': float(probs[row, i])} for row, i in enumerate(best)]
+
+    def embed_and_classify(self, texts, batch_size=16, max_length=256, normalize_embeddings=True):
+        """
+        한 번의 순전파로 임베딩 행렬과 분류 결과를 함께 반환합니다.
+        반환값: ((N, D) float32 임베딩, [{'label': ..., 'score': ...}, ...])
+        """
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        embeddings, logits = [], []
+        for i in range(0, len(texts), batch_size):
+            emb, logit = self._forward(texts[i:i + batch_size], max_length, with_logits=True)
+            embeddings.append(emb)
+            logits.append(logit)
+        if not texts: return np.zeros((0, 0), dtype=np.float32), []
+        embeddings = np.vstack(embeddings).astype(np.float32)
+        if normalize_embeddings:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings, self._to_predictions(np.vstack(logits))
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, convert_to_tensor=False,
+               normalize_embeddings=False, **kwargs):
+        """SentenceTransformer.encode와 같은 형식으로 평균 풀링 임베딩을 반환합니다. (분류 헤드는 실행하지 않음)"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        batches = [self._forward(texts[i:i + batch_size], self.max_seq_length, with_logits=False)[0]
+                   for i in range(0, len(texts), batch_size)]
+        embeddings = np.vstack(batches).astype(np.float32) if batches else np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(embeddings):
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        if single: embeddings = embeddings[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+    def __call__(self, texts, batch_size=16, truncation=True, max_length=256, **kwargs):
+        """transformers 파이프라인과 같은 형식으로 분류 결과를 반환합니다."""
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        logits = [self._forward(texts[i:i + batch_size], max_length, with_logits=True)[1]
+                  for i in range(0, len(texts), batch_size)]
+        return self._to_predictions(np.vstack(logits)) if logits else []
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+
+from sheets_fetch import with_backoff
+
+
+# 추가 전용 시트는 새 행만 받아도, 마지막 전체 다운로드가 이 시간(초)보다 오래되면 전체를 다시 받습니다.
+# (증분 동기화는 겹쳐 받은 마지막 행만 확인하므로, 그 앞의 행이 수정/삭제된 것은 전체 다운로드 때 반영됩니다)
+FULL_RESYNC_SECONDS = 6 * 60 * 60
+
+
+def remote_revision(spreadsheet):
+    """
+    스프레드시트의 마지막 수정 시각(Drive modifiedTime)을 변경 감지용 리비전으로 반환합니다.
+    확인할 수 없으면 None을 반환하며, 이 경우 스냅샷을 신뢰하지 않고 항상 다시 내려받습니다.
+    """
+    try:
+        if hasattr(spreadsheet, 'get_lastUpdateTime'): return with_backoff(spreadsheet.get_lastUpdateTime)
+        return getattr(spreadsheet, 'lastUpdateTime', None)
+    except Exception as e:
+        print(f"경고: 스프레드시트 수정 시각을 확인할 수 없습니다: {e}")
+        return None
+
+
+def _pack(values):
+    return zlib.compress(json.dumps(values, ensure_ascii=False).encode('utf-8'))
+
+
+def _unpack(payload):
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+def _trim(row):
+    """행 끝의 빈 칸을 제거합니다. (조회 범위에 따라 빈 칸 채움이 달라도 같은 행으로 비교하기 위함)"""
+    row = list(row)
+    while row and row[-1] == '': row.pop()
+    return row
+
+
+class SheetSnapshotStore:
+    """
+    워크시트별 원본 값(get_all_values 결과)을 스프레드시트 리비전과 함께 로컬 SQLite 파일에 보관합니다.
+    시작 시에는 네트워크 없이 스냅샷을 바로 읽고, 원격 리비전이 바뀐 경우에만 다시 내려받도록 하는 데 사용합니다.
+    (없는 시트는 None으로 저장합니다)
+    한 시트는 여러 조각(part)으로 저장됩니다. 전체를 다시 받으면 조각 하나로 교체하고,
+    추가만 되는 시트에 새 행이 생기면 새 행만 다음 조각으로 덧붙이므로 저장 비용이 새 행 수에 비례합니다.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+
+    def _connect(self):
+        # SQLite 연결은 스레드 간에 공유하지 않으므로 호출마다 새로 엽니다.
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute("""CREATE TABLE IF NOT EXISTS sheet_snapshot_parts (
+                            spreadsheet TEXT NOT NULL, sheet TEXT NOT NULL, part INTEGER NOT NULL, revision TEXT NOT NULL,
+                            fetched_at REAL NOT NULL, row_count INTEGER, last_row TEXT, payload BLOB,
+                            PRIMARY KEY (spreadsheet, sheet, part))""")
+        return conn
+
+    def _query(self, sql, params):
+        try:
+            conn = self._connect()
+            try:
+                return conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"경고: 시트 스냅샷 '{self.db_file}' 읽기 실패: {e}")
+            return None
+
+    def _write(self, statements):
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    for sql, params in statements: conn.execute(sql, params)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"경고: 시트 스냅샷 '{self.db_file}' 저장 실패: {e}")
+
+    def revision(self, spreadsheet, sheet_names):
+        """모든 시트가 같은 리비전으로 저장되어 있으면 그 리비전을, 아니면 None을 반환합니다."""
+        placeholders = ','.join('?' * len(sheet_names))
+        rows = self._query(f"SELECT DISTINCT sheet, revision FROM sheet_snapshot_parts WHERE spreadsheet = ? AND sheet IN ({placeholders})",
+                           [spreadsheet, *sheet_names])
+        if not rows or len({sheet for sheet, _ in rows}) != len(set(sheet_names)): return None
+        revisions = {revision for _, revision in rows}
+        return revisions.pop() if len(revisions) == 1 else None
+
+    def tail(self, spreadsheet, sheet):
+        """
+        시트의 저장된 전체 행 수, 마지막 행, 마지막 전체 다운로드 시각(첫 조각의 저장 시각)을 반환합니다.
+        저장된 값이 없으면 (None, None, None)입니다.
+        """
+        rows = self._query("SELECT row_count, last_row, fetched_at FROM sheet_snapshot_parts WHERE spreadsheet = ? AND sheet = ? ORDER BY part",
+                           [spreadsheet, sheet])
+        if not rows or any(row_count is None for row_count, _, _ in rows): return None, None, None
+        last_row = next((last_row for row_count, last_row, _ in reversed(rows) if row_count), None)
+        return sum(row_count for row_count, _, _ in rows), json.loads(last_row) if last_row else None, rows[0][2]
+
+    def load(self, spreadsheet, sheet_names):
+        """저장된 {시트 이름: 값 목록} 과 리비전을 반환합니다. 하나라도 없으면 (None, None)입니다."""
+        revision = self.revision(spreadsheet, sheet_names)
+        if revision is None: return None, None
+        placeholders = ','.join('?' * len(sheet_names))
+        rows = self._query(f"SELECT sheet, payload FROM sheet_snapshot_parts WHERE spreadsheet = ? AND sheet IN ({placeholders}) ORDER BY sheet, part",
+                           [spreadsheet, *sheet_names])
+        if rows is None: return None, None
+        values = {}
+        for sheet, payload in rows:
+            part = _unpack(payload)
+            if part is None: values[sheet] = None
+            else: values.setdefault(sheet, []).extend(part)
+        return values, revision
+
+    def _replace(self, spreadsheet, revision, values_by_sheet, fetched_at):
+        statements = []
+        for sheet, values in values_by_sheet.items():
+            statements.append(("DELETE FROM sheet_snapshot_parts WHERE spreadsheet = ? AND sheet = ?", (spreadsheet, sheet)))
+            statements.append(("INSERT INTO sheet_snapshot_parts VALUES (?, ?, 0, ?, ?, ?, ?, ?)",
+                               (spreadsheet, sheet, revision, fetched_at, len(values) if values is not None else None,
+                                json.dumps(values[-1], ensure_ascii=False) if values else None, _pack(values))))
+        return statements
+
+    def save(self, spreadsheet, revision, values_by_sheet):
+        """한 트랜잭션으로 모든 시트의 값을 같은 리비전으로 교체합니다. (중간에 실패하면 이전 스냅샷이 유지됩니다)"""
+        self._write(self._replace(spreadsheet, revision, values_by_sheet, time.time()))
+
+    def append(self, spreadsheet, revision, new_rows_by_sheet, values_by_sheet):
+        """
+        추가 전용 시트의 새 행(new_rows_by_sheet)은 다음 조각으로 덧붙이고 나머지 시트(values_by_sheet)는 교체합니다.
+        모든 시트의 리비전을 한 트랜잭션으로 갱신합니다.
+        """
+        fetched_at = time.time()
+        statements = self._replace(spreadsheet, revision, values_by_sheet, fetched_at)
+        for sheet, rows in new_rows_by_sheet.items():
+            statements.append(("UPDATE sheet_snapshot_parts SET revision = ? WHERE spreadsheet = ? AND sheet = ?", (revision, spreadsheet, sheet)))
+            if not rows: continue
+            statements.append(("""INSERT INTO sheet_snapshot_parts
+                                  SELECT ?, ?, MAX(part) + 1, ?, ?, ?, ?, ? FROM sheet_snapshot_parts WHERE spreadsheet = ? AND sheet = ?""",
+                               (spreadsheet, sheet, revision, fetched_at, len(rows), json.dumps(rows[-1], ensure_ascii=False),
+                                _pack(rows), spreadsheet, sheet)))
+        self._write(statements)
+
+
+def load_sheet_values(store, spreadsheet_key, sheet_names, open_spreadsheet, download_values, snapshot_first=False, append_only=None,
+                      full_resync_after=FULL_RESYNC_SECONDS):
+    """
+    시트 값을 스냅샷 또는 원격에서 가져와 ({시트 이름: 값 목록 또는 None}, 리비전, 원격 확인 여부, 새 행만 받은 시트 집합)을 반환합니다.
+    - snapshot_first=True: 스냅샷이 있으면 원격 확인 없이 바로 사용합니다. (시작 직후 빠른 표시용)
+    - 그 외: 원격 수정 시각을 확인해 스냅샷과 같으면 스냅샷을, 다르면 다시 내려받아 스냅샷을 갱신합니다.
+      원격 접속에 실패하면 스냅샷이 있는 경우 그것을 사용합니다. (오프라인 실행)
+    - append_only={시트 이름: 호출자가 이미 반영한 행 수(머리글 포함)}: 행이 추가만 되는 시트입니다.
+      원격이 바뀌었고 스냅샷의 행 수가 호출자와 같으면 마지막으로 알려진 행부터 끝까지만 내려받습니다.
+      겹쳐 받은 첫 행이 스냅샷의 마지막 행과 같으면 values[시트]에는 새 행만 담기고 시트 이름이 반환 집합에 포함됩니다.
+      확인하는 것은 겹쳐 받은 그 한 행뿐입니다. 그 행이 다르면 전체를 다시 받지만, 그보다 앞의 행이 수정/삭제된 것은
+      알아차리지 못합니다. 이런 변경은 다음 전체 다운로드 때 반영되며, 마지막 전체 다운로드가
+      full_resync_after초보다 오래되었으면 새 행만 받지 않고 전체를 다시 받습니다.
+    open_spreadsheet(): 인증 후 스프레드시트 객체를 반환하는 함수
+    download_values(spreadsheet, sheet_names, tails=None): {시트 이름: get_all_values() 결과 또는 None}을 반환하는 함수.
+        tails={시트 이름: (시작 행 번호(1부터), 열 수)}가 주어지면 해당 시트는 그 행부터 끝까지만 반환합니다.
+    (두 함수만 바꾸면 실제 Google Sheets 없이 가짜 클라이언트로도 동작을 확인할 수 있습니다)
+    """
+    if snapshot_first:
+        values, revision = store.load(spreadsheet_key, sheet_names)
+        if values is not None:
+            print(f"--- 시트 스냅샷 사용 (리비전 {revision}, 원격 확인 전) ---")
+            return values, revision, False, set()
+
+    try:
+        spreadsheet = open_spreadsheet()
+        revision = remote_revision(spreadsheet)
+        stored_revision = store.revision(spreadsheet_key, sheet_names)
+        if revision is not None and stored_revision == revision:
+            values, _ = store.load(spreadsheet_key, sheet_names)
+            if values is not None:
+                print(f"--- 원격 시트 변경 없음, 스냅샷 사용 (리비전 {revision}) ---")
+                return values, revision, True, set()
+
+        tails, last_rows = {}, {}
+        if revision is not None and stored_revision is not None:
+            for sheet, known_rows in (append_only or {}).items():
+                row_count, last_row, full_fetched_at = store.tail(spreadsheet_key, sheet)
+                if known_rows and row_count == known_rows and last_row and time.time() - full_fetched_at < full_resync_after:
+                    # 마지막으로 알려진 행을 한 줄 겹쳐 받아 기존 행이 그대로인지 확인합니다.
+                    tails[sheet], last_rows[sheet] = (known_rows, len(last_row)), last_row
+        values = download_values(spreadsheet, sheet_names, tails=tails) if tails else download_values(spreadsheet, sheet_names)
+        appended = {sheet for sheet in tails if values.get(sheet) and _trim(values[sheet][0]) == _trim(last_rows[sheet])}
+        if len(appended) != len(tails):
+            print("--- 추가 전용 시트의 기존 행이 바뀌어 전체를 다시 내려받습니다. ---")
+            values, appended = download_values(spreadsheet, sheet_names), set()
+    except Exception as e:
+        values, revision = store.load(spreadsheet_key, sheet_names)
+        if values is None: raise
+        print(f"경고: 원격 시트 접속 실패, 저장된 스냅샷을 사용합니다 (리비전 {revision}): {e}")
+        return values, revision, False, set()
+
+    for sheet in appended:
+        values[sheet] = values[sheet][1:]
+        print(f"--- '{sheet}' 새 행 {len(values[sheet])}개만 동기화 (리비전 {revision}) ---")
+    if revision is not None:
+        if appended:
+            store.append(spreadsheet_key, revision, {sheet: values[sheet] for sheet in appended},
+                         {sheet: v for sheet, v in values.items() if sheet not in appended})
+        else:
+            store.save(spreadsheet_key, revision, values)
+    if not appended: print(f"--- 원격 시트 다운로드 및 스냅샷 저장 (리비전 {revision}) ---")
+    return values, revision, True, appended
@@ -0,0 +1,98 @@
+import json
+import time
+import random
+
+
+# 일시적인 오류로 보고 재시도하는 HTTP 상태 코드 (429: 할당량 초과, 500/503: 서버 일시 오류)
+RETRY_STATUS = (429, 500, 503)
+
+
+def _status_code(error):
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status if status is not None else getattr(error, 'code', None)
+
+
+def _is_retryable(error):
+    if _status_code(error) in RETRY_STATUS: return True
+    if isinstance(error, (ConnectionError, TimeoutError)): return True
+    try:
+        import requests
+    except ImportError:
+        return False
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+def with_backoff(fn, stats=None, max_retries=5, base_delay=1.0, max_delay=32.0):
+    """
+    fn()을 호출하고, 429/5xx 또는 연결 오류이면 지터를 준 지수 백오프로 재시도합니다.
+    (대기 시간은 0 ~ min(max_delay, base_delay * 2^시도) 사이에서 무작위로 정해 여러 요청이 동시에 몰리지 않게 합니다)
+    stats가 주어지면 요청 수와 재시도 수를 기록합니다.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            if stats is not None: stats['requests'] += 1
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e): raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if stats is not None: stats['retries'] += 1
+            print(f"경고: Sheets API 일시 오류 ({_status_code(e) or type(e).__name__}), {delay:.1f}초 후 재시도 ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+
+def _quote_sheet(name):
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _column_letter(number):
+    """1부터 시작하는 열 번호를 A1 표기의 열 문자로 바꿉니다. (예: 1 -> A, 27 -> AA)"""
+    letters = ''
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _sheet_range(name, tails):
+    """시트 전체 범위, 또는 tails에 있으면 지정한 행부터 끝까지의 범위를 만듭니다."""
+    if name not in tails: return _quote_sheet(name)
+    start_row, width = tails[name]
+    return f"{_quote_sheet(name)}!A{start_row}:{_column_letter(max(width, 1))}"
+
+
+def _fill_gaps(values, width=0):
+    """batchGet은 행 끝의 빈 칸을 생략하므로, get_all_values()와 같이 모든 행을 가장 긴 행(또는 width)의 길이로 맞춥니다."""
+    width = max([len(row) for row in values] + [width])
+    return [row + [''] * (width - len(row)) for row in values]
+
+
+def batch_get_sheet_values(spreadsheet, sheet_names, optional=(), max_retries=5, tails=None):
+    """
+    여러 워크시트의 전체 값을 values.batchGet 한 번의 요청으로 가져와 ({시트 이름: 값 목록 또는 None}, 통계)를 반환합니다.
+    없는 시트가 섞여 있으면 범위 해석 오류(400)가 나므로, 그때만 시트 목록을 확인해 있는 시트만 다시 요청합니다.
+    optional에 있는 시트는 없으면 None, 그 밖의 시트가 없으면 ValueError가 발생합니다.
+    tails={시트 이름: (시작 행 번호(1부터), 열 수)}가 주어지면 해당 시트는 그 행부터 끝까지만 가져옵니다. (증분 동기화용)
+    통계: 요청 수, 재시도 수, 응답 크기(JSON 바이트), 지연 시간(초)
+    """
+    stats = {'requests': 0, 'retries': 0, 'bytes': 0, 'latency': 0.0}
+    start = time.perf_counter()
+    names, tails = list(sheet_names), tails or {}
+    try:
+        payload = with_backoff(lambda: spreadsheet.values_batch_get([_sheet_range(n, tails) for n in names]), stats, max_retries)
+    except Exception as e:
+        if _status_code(e) != 400: raise
+        existing = {ws.title for ws in with_backoff(spreadsheet.worksheets, stats, max_retries)}
+        missing = [n for n in names if n not in existing and n not in optional]
+        if missing: raise ValueError(f"필수 시트를 찾을 수 없습니다: {', '.join(missing)}")
+        names = [n for n in names if n in existing]
+        payload = with_backoff(lambda: spreadsheet.values_batch_get([_sheet_range(n, tails) for n in names]), stats, max_retries) if names else {}
+
+    values = dict.fromkeys(sheet_names)
+    for name, value_range in zip(names, payload.get('valueRanges', [])):
+        values[name] = _fill_gaps(value_range.get('values', []), tails[name][1] if name in tails else 0)
+    stats['bytes'] = len(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+    stats['latency'] = time.perf_counter() - start
+    print(f"--- 시트 일괄 조회: {len(names)}개 시트, {stats['bytes'] / 1024:.1f} KB, {stats['latency']:.2f}초 "
+          f"(요청 {stats['requests']}회, 재시도 {stats['retries']}회) ---")
+    return values, stats
@@ -0,0 +1,26 @@
+import pytest
+
+from data_sources import DataSource, FileSource, SQLiteSource, create_data_source
+
+
+def test_incomplete_source_fails_on_creation():
+    class NoRevisionSource(DataSource):
+        def load(self, sheet_names, snapshot_first=False, append_only=None):
+            return {}, None, True, set()
+
+    with pytest.raises(TypeError):
+        NoRevisionSource()
+    with pytest.raises(TypeError):
+        DataSource()
+
+
+def test_file_and_sqlite_sources_are_created(tmp_path):
+    (tmp_path / '기업목록.csv').write_text("기업ID,기업명\n1,A\n", encoding='utf-8')
+    source = create_data_source({'data_source': 'csv', 'data_path': str(tmp_path)}, None, None, None, None)
+    assert isinstance(source, FileSource)
+    values, revision, verified, appended = source.load(['기업목록'])
+    assert values['기업목록'] == [['기업ID', '기업명'], ['1', 'A']]
+    assert source.changed(revision) is False
+
+    source = create_data_source({'data_source': 'sqlite', 'data_path': str(tmp_path / 'data.sqlite')}, None, None, None, None)
+    assert isinstance(source, SQLiteSource)
@@ -0,0 +1,78 @@
+import threading
+
+from readiness import ReadinessManager
+
+
+class Loader:
+    """호출될 때마다 호출 순번을 기록하고, release()될 때까지 기다렸다가 (이름, 순번)을 반환하는 로더입니다."""
+
+    def __init__(self, name):
+        self.name, self.calls = name, 0
+        self.started, self.gates = threading.Semaphore(0), []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            gate = threading.Event()
+            self.gates.append(gate)
+        self.started.release()
+        assert gate.wait(5)
+        return (self.name, call)
+
+    def wait_started(self):
+        assert self.started.acquire(timeout=5)
+
+    def release(self, call):
+        self.gates[call - 1].set()
+
+
+def _manager():
+    model, data, index = Loader('model'), Loader('data'), Loader('index')
+    readiness = ReadinessManager()
+    readiness.register('model', model)
+    readiness.register('data', data)
+    readiness.register('search_index', index, requires=('model', 'data'))
+    readiness.start()
+    model.wait_started(), data.wait_started()
+    model.release(1), data.release(1)
+    index.wait_started()
+    return readiness, data, index
+
+
+def test_reload_while_dependent_loading_rebuilds_after_new_data():
+    readiness, data, index = _manager()
+
+    readiness.reload('data')
+    data.wait_started()
+    # 이전 데이터로 만든 인덱스가 먼저 끝나도 완료로 표시되지 않습니다.
+    index.release(1)
+    assert not index.started.acquire(timeout=0.2)
+    assert readiness.state('search_index') == ReadinessManager.PENDING
+
+    data.release(2)
+    index.wait_started()
+    index.release(2)
+    assert readiness.wait(5)
+    assert readiness.result('data') == ('data', 2)
+    assert readiness.result('search_index') == ('index', 2)
+    assert index.calls == 2
+
+
+def test_reload_while_dependent_loading_new_data_first():
+    readiness, data, index = _manager()
+
+    readiness.reload('data')
+    data.wait_started()
+    data.release(2)
+    # 새 데이터가 먼저 준비되어도 이전 인덱스 작업과 겹쳐 한 번 더 시작되지 않고, 이전 작업이 끝난 뒤 다시 만듭니다.
+    assert not index.started.acquire(timeout=0.2)
+    assert readiness.state('search_index') == ReadinessManager.LOADING
+
+    index.release(1)
+    index.wait_started()
+    index.release(2)
+    assert readiness.wait(5)
+    assert readiness.result('search_index') == ('index', 2)
+    assert index.calls == 2
@@ -0,0 +1,37 @@
+import io
+
+import pandas as pd
+
+from review_schema import normalize_reviews, append_reviews
+
+
+HEADER = "타임스탬프,대상기업,평가기관,평점,평가내용\n"
+
+
+def _reviews_from_csv(rows):
+    # main_app2의 parse_reviews와 같이 read_csv로 읽습니다. (모두 빈 열은 float64가 됩니다)
+    return normalize_reviews(pd.read_csv(io.StringIO(HEADER + rows)))
+
+
+def test_append_reviews_with_all_blank_category_column():
+    old = _reviews_from_csv("2024. 3. 1 오후 2:00:00,A,B,4,좋음\n")
+    new = _reviews_from_csv("2025. 3. 1 오후 2:00:00,A,,3,보통\n2025. 3. 2 오전 9:00:00,C,,5,최고\n")
+    assert new['평가기관'].isna().all()
+
+    combined = append_reviews(old, new)
+
+    assert len(combined) == 3
+    for column in ('대상기업', '평가기관'):
+        assert isinstance(combined[column].dtype, pd.CategoricalDtype)
+    assert combined['평가기관'].iloc[0] == 'B'
+    assert combined['평가기관'].iloc[1:].isna().all()
+    assert combined['대상기업'].tolist() == ['A', 'A', 'C']
+
+
+def test_append_reviews_with_numeric_looking_category_values():
+    old = _reviews_from_csv("2024. 3. 1 오후 2:00:00,A,B,4,좋음\n")
+    new = _reviews_from_csv("2025. 3. 1 오후 2:00:00,A,123,3,보통\n")
+
+    combined = append_reviews(old, new)
+
+    assert combined['평가기관'].tolist() == ['B', '123']
@@ -0,0 +1,160 @@
+import os
+import hashlib
+
+import numpy as np
+
+from category_scorer import l2_normalize
+
+
+# 검색 인덱스 종류 (config.ini [MODEL] search_index = auto | flat | ivf)
+SUPPORTED_INDEXES = ('auto', 'flat', 'ivf')
+# 'auto'일 때 이 개수 이상의 기업이면 IVF 근사 인덱스를 사용합니다.
+AUTO_IVF_MIN_SIZE = 20000
+
+
+def normalize_index_type(index_type):
+    """설정값을 지원하는 인덱스 종류로 정리합니다. 알 수 없는 값이면 'auto'를 사용합니다."""
+    index_type = str(index_type or 'auto').strip().lower()
+    if index_type not in SUPPORTED_INDEXES:
+        print(f"경고: 알 수 없는 검색 인덱스 '{index_type}'. 'auto'를 사용합니다.")
+        return 'auto'
+    return index_type
+
+
+def embeddings_fingerprint(embeddings):
+    """임베딩 행렬 내용으로 인덱스 파일이 현재 데이터와 일치하는지 확인하기 위한 해시입니다."""
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    return hashlib.sha1(str(embeddings.shape).encode('utf-8') + embeddings.tobytes()).hexdigest()
+
+
+def _top_k(scores, k):
+    """점수 배열에서 상위 k개 위치를 점수 내림차순(동점은 앞선 위치 우선)으로 반환합니다."""
+    k = min(k, len(scores))
+    if k <= 0: return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+class FlatIndex:
+    """모든 벡터와 내적을 계산하는 정확한(brute-force) 기준 인덱스입니다."""
+
+    kind = 'flat'
+
+    def __init__(self, embeddings):
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.embeddings)
+
+    def search(self, query, k=10):
+        """정규화된 질의 벡터와 코사인 유사도가 높은 상위 k개의 (위치 배열, 점수 배열)을 반환합니다."""
+        scores = self.embeddings @ np.asarray(query, dtype=np.float32)
+        top = _top_k(scores, k)
+        return top, scores[top]
+
+    def scores_for(self, query, ids):
+        """지정한 위치들의 정확한 코사인 유사도를 반환합니다."""
+        return self.embeddings[ids] @ np.asarray(query, dtype=np.float32)
+
+    def arrays(self):
+        return {}
+
+    @classmethod
+    def from_arrays(cls, embeddings, arrays, **params):
+        return cls(embeddings)
+
+
+class IVFIndex(FlatIndex):
+    """
+    역파일(IVF) 근사 인덱스입니다. 구면 k-means로 벡터를 n_lists개 군집으로 나눠 두고,
+    질의와 가까운 n_probe개 군집 안의 벡터만 정확히 비교하므로 전체 탐색보다 훨씬 적은 연산으로 상위 k개를 찾습니다.
+    """
+
+    kind = 'ivf'
+
+    def __init__(self, embeddings, centroids, list_order, list_offsets, n_probe=8):
+        super().__init__(embeddings)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.list_order = np.asarray(list_order, dtype=np.int64)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+        self.n_probe = int(n_probe)
+
+    @classmethod
+    def build(cls, embeddings, n_lists=None, n_probe=8, iterations=12, train_size_per_list=64, seed=42):
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        n_lists = int(n_lists or max(1, int(np.sqrt(len(embeddings)))))
+        n_lists = min(n_lists, len(embeddings))
+        rng = np.random.default_rng(seed)
+
+        # 학습은 표본으로만 수행하고, 전체 벡터는 마지막에 가장 가까운 군집으로 배정합니다.
+        train_size = min(len(embeddings), n_lists * train_size_per_list)
+        train = embeddings[rng.choice(len(embeddings), train_size, replace=False)]
+        centroids = train[rng.choice(len(train), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assign = (train @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            counts = np.bincount(assign, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():  # 빈 군집은 임의의 학습 벡터로 다시 시작합니다.
+                sums[empty] = train[rng.choice(len(train), int(empty.sum()), replace=False)]
+            centroids = l2_normalize(sums)
+
+        assign = np.concatenate([(embeddings[i:i + 8192] @ centroids.T).argmax(axis=1)
+                                 for i in range(0, len(embeddings), 8192)]) if len(embeddings) else np.zeros(0, dtype=np.int64)
+        list_order = np.argsort(assign, kind='stable')
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        return cls(embeddings, centroids, list_order, list_offsets, n_probe=n_probe)
+
+    def search(self, query, k=10, n_probe=None):
+        query = np.asarray(query, dtype=np.float32)
+        n_probe = min(int(n_probe or self.n_probe), len(self.centroids))
+        probe_lists = _top_k(self.centroids @ query, n_probe)
+        candidates = np.concatenate([self.list_order[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probe_lists])
+        candidates.sort()
+        scores = self.embeddings[candidates] @ query
+        top = _top_k(scores, k)
+        return candidates[top], scores[top]
+
+    def arrays(self):
+        return {'centroids': self.centroids, 'list_order': self.list_order, 'list_offsets': self.list_offsets}
+
+    @classmethod
+    def from_arrays(cls, embeddings, arrays, n_probe=8, **params):
+        return cls(embeddings, arrays['centroids'], arrays['list_order'], arrays['list_offsets'], n_probe=n_probe)
+
+
+INDEX_CLASSES = {'flat': FlatIndex, 'ivf': IVFIndex}
+
+
+def resolve_index_type(index_type, size):
+    if index_type == 'auto': return 'ivf' if size >= AUTO_IVF_MIN_SIZE else 'flat'
+    return index_type
+
+
+def load_or_build_index(embeddings, index_file, index_type='auto', n_probe=8):
+    """
+    임베딩 행렬에 대한 검색 인덱스를 디스크에서 불러오고, 파일이 없거나 데이터가 바뀌었으면
+    새로 만들어 저장합니다. (벡터 자체는 임베딩 캐시에 있으므로 인덱스 파일에는 군집 구조만 저장합니다)
+    """
+    kind = resolve_index_type(index_type, len(embeddings))
+    if kind == 'flat': return FlatIndex(embeddings)
+
+    fingerprint = embeddings_fingerprint(embeddings)
+    if os.path.exists(index_file):
+        try:
+            with np.load(index_file, allow_pickle=False) as data:
+                if str(data['kind']) == kind and str(data['fingerprint']) == fingerprint:
+                    return INDEX_CLASSES[kind].from_arrays(embeddings, data, n_probe=n_probe)
+        except Exception as e:
+            print(f"경고: 검색 인덱스 '{index_file}' 로드 실패, 다시 생성합니다: {e}")
+
+    index = INDEX_CLASSES[kind].build(embeddings, n_probe=n_probe)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(index_file)), exist_ok=True)
+        tmp_file = f"{index_file}.tmp.npz"
+        np.savez(tmp_file, kind=np.array(kind), fingerprint=np.array(fingerprint), **index.arrays())
+        os.replace(tmp_file, index_file)
+    except Exception as e:
+        print(f"경고: 검색 인덱스 '{index_file}' 저장 실패: {e}")
+    return index